@@ -3,11 +3,24 @@ from discord.ext import commands
 from discord import app_commands
 import config
 from utils.helpers import get_admin_role, get_log_channel, get_archive_channel, export_applications_csv
+from utils.database import db
+from utils.db_backends import DatabaseError
+from utils.guild_resolver import resolver
+from typing import Optional
+import logging
+
+SLOT_LABELS = {"admin_role": "Admin-Rolle", "log_channel": "Log-Kanal", "archive_channel": "Archiv-Kanal"}
 
 class AdminCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
+    async def cog_load(self):
+        try:
+            resolver.load_pins(await db.get_guild_settings())
+        except DatabaseError as e:
+            logging.warning(f"Pinned guild settings could not be loaded, using configured names: {e}")
+
     @app_commands.command(name="setup", description="Setup für den Bewerbungs-Bot")
     @app_commands.describe(channel="Channel für das Bewerbungsmenü")
     async def setup(self, interaction: discord.Interaction, channel: discord.TextChannel):
@@ -83,5 +96,62 @@ class AdminCog(commands.Cog):
         config.APPLICATION_QUESTIONS[bewerbungsart][question_index-1] = new_question
         await interaction.response.send_message(f"✅ Frage {question_index} für {bewerbungsart} wurde aktualisiert: {new_question}", ephemeral=True)
 
+    @app_commands.command(name="rollup-backfill", description="Berechnet die täglichen Beitritts-/Austrittszahlen aus dem Verlauf neu (Admins only)")
+    async def rollup_backfill(self, interaction: discord.Interaction):
+        if not interaction.user.guild_permissions.administrator:
+            await interaction.response.send_message("❌ Nur Admins können diesen Befehl nutzen!", ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=True)
+        days, attributed, unattributed = await db.backfill_member_rollups(interaction.guild.id)
+        message = f"✅ Tagesstatistik für {days} Tage neu berechnet, {attributed} ältere Ereignisse diesem Server zugeordnet."
+        if unattributed:
+            # Ohne eindeutigen Server zählen diese Ereignisse in keiner Tagesstatistik mit
+            message += f"\nℹ️ {unattributed} ältere Ereignisse ohne eindeutigen Server werden nicht mitgezählt."
+        await interaction.followup.send(message, ephemeral=True)
+
+    @app_commands.command(name="zuordnung", description="Legt Admin-Rolle, Log- oder Archiv-Kanal fest (Admins only)")
+    @app_commands.describe(
+        typ="Was festgelegt wird",
+        rolle="Admin-Rolle (nur für Admin-Rolle)",
+        kanal="Kanal (für Log- und Archiv-Kanal)",
+        entfernen="Festlegung entfernen, danach gilt wieder der Name aus der Konfiguration"
+    )
+    @app_commands.choices(typ=[app_commands.Choice(name=label, value=slot) for slot, label in SLOT_LABELS.items()])
+    async def zuordnung(self, interaction: discord.Interaction, typ: app_commands.Choice[str], rolle: Optional[discord.Role] = None, kanal: Optional[discord.TextChannel] = None, entfernen: bool = False):
+        if not interaction.user.guild_permissions.administrator:
+            await interaction.response.send_message("❌ Nur Admins können diesen Befehl nutzen!", ephemeral=True)
+            return
+
+        target = rolle if typ.value == "admin_role" else kanal
+        # Entfernen nur ausdrücklich, ein vergessenes Argument darf die Festlegung nicht löschen
+        if target is None and not entfernen:
+            argument = "rolle" if typ.value == "admin_role" else "kanal"
+            await interaction.response.send_message(
+                f"⚠️ Bitte gib für {typ.name} `{argument}` an, oder setze `entfernen`, um die Festlegung zu löschen.",
+                ephemeral=True
+            )
+            return
+        if entfernen:
+            target = None
+
+        await interaction.response.defer(ephemeral=True)
+        try:
+            await db.set_guild_setting(interaction.guild.id, typ.value, target.id if target else None)
+        except DatabaseError as e:
+            logging.error(f"Guild setting {typ.value} for guild {interaction.guild.id} could not be saved: {e}")
+            await interaction.followup.send(embed=discord.Embed(
+                title="⚠️ Fehler",
+                description=f"{typ.name} konnte nicht gespeichert werden. Bitte versuche es gleich noch einmal.",
+                color=discord.Color.orange()
+            ), ephemeral=True)
+            return
+        if target:
+            resolver.pin(interaction.guild.id, typ.value, target.id)
+            await interaction.followup.send(f"✅ {typ.name} ist jetzt {target.mention}.", ephemeral=True)
+        else:
+            resolver.unpin(interaction.guild.id, typ.value)
+            await interaction.followup.send(f"✅ Festlegung für {typ.name} entfernt, es gilt wieder der Name aus der Konfiguration.", ephemeral=True)
+
 async def setup(bot):
     await bot.add_cog(AdminCog(bot))
\ No newline at end of file
@@ -1,17 +1,50 @@
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
 from discord import app_commands
 import config
+from utils.admission import AdmissionScheduler
+from utils.coc_api import ClashApiError, NotFound, coc_api
 from utils.helpers import get_admin_role, get_log_channel
 from utils.logging import logger, LogCollector
 from utils.database import db
+from utils.db_backends import DatabaseError
+from utils.metrics import metrics
+from utils.pipeline import failed_steps, fan_out
+from utils.rate_limits import cooldown_embed, rate_limits
+from utils.scheduler import DeadlineScheduler
+from utils.ticket_index import OPEN_STATES, applicant_from_topic, state_from_name, ticket_index
+from utils.transcripts import TranscriptTooLarge, archive_ticket
 from datetime import datetime, timedelta
 import asyncio
+from collections import deque
 import random
 import csv
+import functools
 import io
-
-TEAM_NOTIFY_COOLDOWNS = {}  # channel_id: datetime
+import time
+from typing import List, Optional
+
+ANSWER_TIMEOUT = 300  # Sekunden pro Frage
+MAX_TAG_ATTEMPTS = 2
+MODAL_MAX_INPUTS = 5  # Discord erlaubt höchstens 5 Eingabefelder pro Modal
+REMINDER_BATCH_WINDOW = 10  # Sekunden, in denen fällige Erinnerungen eines Servers gesammelt werden
+DECISION_PARALLELISM = 3  # gleichzeitige Discord- und Datenbankaufrufe beim Annehmen/Ablehnen
+
+# Kanal-Erstellung pro Server begrenzen, statt bei vielen gleichzeitigen Bewerbungen ins Rate-Limit zu laufen
+ticket_admission = AdmissionScheduler(config.TICKET_CREATE_CONCURRENCY)
+_tickets_created_at = deque()  # Zeitpunkte (monotonic) der Erstellungen für Tickets pro Minute
+TICKETS_CREATED = metrics.counter("oluja_tickets_created_total", "Ticket channels created")
+TICKET_QUEUE_WAIT_SECONDS = metrics.histogram(
+    "oluja_ticket_queue_wait_seconds", "Time an applicant waited for a ticket creation slot",
+    buckets=(0.1, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+)
+metrics.gauge("oluja_ticket_queue_length", "Applicants waiting for a ticket creation slot", lambda: ticket_admission.queued())
+metrics.gauge("oluja_tickets_created_last_minute", "Ticket channels created in the last 60 seconds", lambda: tickets_last_minute())
+
+DECISION_SECONDS = metrics.histogram(
+    "oluja_application_decision_seconds", "Time from clicking accept or submitting a denial until the ticket was processed", ("decision",),
+    buckets=(0.5, 1, 2.5, 5, 10, 20, 30, 60)
+)
 
 FUNFACTS = [
     "Immer alle Angriffe nutzen!!!",
@@ -26,6 +59,133 @@ def animated_progress_bar(percent):
 def validate_player_tag(tag: str) -> bool:
     return tag.startswith("#") and 8 <= len(tag[1:]) <= 10 and tag[1:].isalnum()
 
+async def check_player_tag(tag: str, log_collector: LogCollector) -> bool:
+    """
+    Format check, then whether the player exists according to the Clash of Clans API.
+    A well-formed tag is accepted if the API is not configured, fails or takes longer than COC_TAG_LOOKUP_TIMEOUT.
+    """
+    if not validate_player_tag(tag):
+        return False
+    if not coc_api.enabled:
+        return True
+    try:
+        player = await asyncio.wait_for(coc_api.get_player(tag), config.COC_TAG_LOOKUP_TIMEOUT)
+    except NotFound:
+        log_collector.add_event(f"Spieler-Tag {tag} existiert nicht", "WARNING")
+        return False
+    except (ClashApiError, asyncio.TimeoutError) as e:
+        log_collector.add_event(f"Spieler-Tag {tag} nicht geprüft: {str(e) or 'Zeitüberschreitung'}", "WARNING")
+        return True
+    log_collector.add_event(f"Spieler gefunden: {player.get('name')} (Rathaus {player.get('townHallLevel')})")
+    return True
+
+async def create_ticket_channel(guild: discord.Guild, user: discord.abc.User, on_queued=None):
+    """
+    Create the private ticket channel for an applicant and register it in the ticket index.
+    Creation goes through the guild's admission queue; `on_queued(position)` is awaited if the applicant has to wait.
+    Returns the channel and the admin role, or (None, None) if the applicant already has a ticket.
+    """
+    if not ticket_index.reserve(guild.id, user.id):
+        return None, None
+    admin_role = get_admin_role(guild)
+    overwrites = {
+        guild.default_role: discord.PermissionOverwrite(read_messages=False),
+        user: discord.PermissionOverwrite(read_messages=True, send_messages=True, mention_everyone=True),
+        admin_role: discord.PermissionOverwrite(read_messages=True, send_messages=True, mention_everyone=True) if admin_role else None
+    }
+    overwrites = {k: v for k, v in overwrites.items() if v is not None}
+
+    channel_name = f"bewerbung-{user.name[:20]}"
+    try:
+        TICKET_QUEUE_WAIT_SECONDS.observe(await ticket_admission.acquire(guild.id, on_queued))
+    except BaseException:
+        ticket_index.release(guild.id, user.id)
+        raise
+    try:
+        ticket_channel = await guild.create_text_channel(
+            channel_name,
+            overwrites=overwrites,
+            topic=f"Bewerbung von {user.name} | ID: {user.id}"
+        )
+    except Exception:
+        ticket_index.release(guild.id, user.id)
+        raise
+    finally:
+        ticket_admission.release(guild.id)
+    ticket_index.update(ticket_channel.id, guild.id, user.id, "questions", datetime.utcnow())
+    TICKETS_CREATED.inc()
+    _tickets_created_at.append(time.monotonic())
+    return ticket_channel, admin_role
+
+async def archive_and_delete(channel: discord.TextChannel, log_collector: LogCollector, reason: str, session: Optional[dict] = None) -> bool:
+    """
+    Archive the ticket's transcript and index it, and only then delete the channel.
+    If the archive fails the channel is kept with a warning and a close button for the team; returns whether it was deleted.
+    """
+    try:
+        with log_collector.span("Transkript archivieren"):
+            archived = await archive_ticket(channel, reason, session)
+        problem = None if archived else "Archiv-Kanal nicht gefunden"
+    except (discord.HTTPException, DatabaseError, TranscriptTooLarge, OSError) as e:
+        problem = str(e)
+    if problem:
+        log_collector.add_event(f"Transkript konnte nicht archiviert werden, Kanal bleibt bestehen: {problem}", "ERROR")
+        admin_role = get_admin_role(channel.guild)
+        await channel.send(
+            content=admin_role.mention if admin_role else None,
+            embed=discord.Embed(
+                title="⚠️ Archivierung fehlgeschlagen",
+                description=(
+                    f"Das Transkript konnte nicht archiviert werden ({problem}), daher wird der Kanal nicht gelöscht.\n"
+                    "Bitte prüft den Archiv-Kanal und schließt das Ticket danach erneut."
+                ),
+                color=discord.Color.orange()
+            ),
+            view=ticket_view(channel.id, "close")
+        )
+        return False
+    log_collector.add_event("Transkript archiviert")
+    with log_collector.span("Kanal löschen"):
+        await channel.delete()
+    return True
+
+def tickets_last_minute() -> int:
+    while _tickets_created_at and _tickets_created_at[0] < time.monotonic() - 60:
+        _tickets_created_at.popleft()
+    return len(_tickets_created_at)
+
+def queued_embed(position: int) -> discord.Embed:
+    return discord.Embed(
+        title="⏳ Warteschlange",
+        description=(
+            f"Gerade bewerben sich viele gleichzeitig. Du bist auf **Platz {position}** der Warteschlange.\n"
+            "Dein Bewerbungskanal wird gleich erstellt, bitte warte einen Moment."
+        ),
+        color=discord.Color.blue()
+    )
+
+def open_application_embed() -> discord.Embed:
+    return discord.Embed(
+        title="⚠️ Offene Bewerbung",
+        description="Du hast bereits eine offene Bewerbung. Bitte warte, bis sie bearbeitet wurde.",
+        color=discord.Color.red()
+    )
+
+def already_decided_embed() -> discord.Embed:
+    return discord.Embed(
+        title="⚠️ Bereits bearbeitet",
+        description="Über diese Bewerbung wurde bereits entschieden.",
+        color=discord.Color.orange()
+    )
+
+def form_field(question: str):
+    """Label (max. 45 characters) and placeholder for a modal input, taken from a question without its markdown."""
+    lines = [line.strip("🔹*_() ") for line in question.splitlines() if line.strip("🔹*_() ")]
+    return lines[0][:45], lines[1][:100] if len(lines) > 1 else None
+
+def is_tag_question(idx: int, question: str) -> bool:
+    return idx == 0 and "Spieler-Tag" in question
+
 class ApplicationDropdown(discord.ui.Select):
     def __init__(self):
         options = [
@@ -41,37 +201,31 @@ class ApplicationDropdown(discord.ui.Select):
         )
 
     async def callback(self, interaction: discord.Interaction):
-        await interaction.response.defer(ephemeral=True)
         guild = interaction.guild
         user = interaction.user
+        apply_type = self.values[0]
+        questions = config.APPLICATION_QUESTIONS[apply_type]
         log_collector = LogCollector(guild, "Bewerbungsprozess", user, interaction.channel)
         log_collector.add_event("Bewerbung gestartet")
 
-        existing_channel = next((ch for ch in guild.text_channels if ch.name.startswith((f"bewerbung-{user.name[:20]}", f"angenommen-{user.name[:20]}"))), None)
-        if existing_channel:
-            await interaction.followup.send(embed=discord.Embed(
-                title="⚠️ Offene Bewerbung",
-                description="Du hast bereits eine offene Bewerbung. Bitte warte, bis sie bearbeitet wurde.",
-                color=discord.Color.red()
-            ), ephemeral=True)
+        if ticket_index.has_ticket(guild.id, user.id):
+            await interaction.response.send_message(embed=open_application_embed(), ephemeral=True)
             log_collector.add_event("Abbruch: Offene Bewerbung erkannt", "WARNING")
             await log_collector.post_log(status="Abgebrochen", color=discord.Color.red())
             return
 
-        admin_role = get_admin_role(guild)
-        overwrites = {
-            guild.default_role: discord.PermissionOverwrite(read_messages=False),
-            user: discord.PermissionOverwrite(read_messages=True, send_messages=True, mention_everyone=True),
-            admin_role: discord.PermissionOverwrite(read_messages=True, send_messages=True, mention_everyone=True) if admin_role else None
-        }
-        overwrites = {k: v for k, v in overwrites.items() if v is not None}
+        # Formular in einem Schritt, solange alle Fragen in ein Modal passen; sonst Fragen einzeln im Kanal
+        if config.APPLICATION_USE_MODAL and len(questions) <= MODAL_MAX_INPUTS:
+            await interaction.response.send_modal(ApplicationModal(apply_type))
+            return
 
-        channel_name = f"bewerbung-{user.name[:20]}"
-        ticket_channel = await guild.create_text_channel(
-            channel_name,
-            overwrites=overwrites,
-            topic=f"Bewerbung von {user.name} | ID: {user.id}"
-        )
+        await interaction.response.defer(ephemeral=True)
+        ticket_channel, admin_role = await create_ticket_channel(guild, user, on_queued=lambda position: interaction.followup.send(embed=queued_embed(position), ephemeral=True))
+        if ticket_channel is None:
+            await interaction.followup.send(embed=open_application_embed(), ephemeral=True)
+            log_collector.add_event("Abbruch: Offene Bewerbung erkannt", "WARNING")
+            await log_collector.post_log(status="Abgebrochen", color=discord.Color.red())
+            return
         log_collector.channel = ticket_channel
         log_collector.add_event("Bewerbungskanal erstellt")
 
@@ -90,145 +244,88 @@ class ApplicationDropdown(discord.ui.Select):
         await ticket_channel.send(content=admin_role.mention if admin_role else "", embed=welcome_embed, view=FAQView())
         log_collector.add_event("Willkommensnachricht gesendet")
 
-        questions = config.APPLICATION_QUESTIONS[self.values[0]]
-        answers = []
-        def check(m): return m.author == user and m.channel == ticket_channel
+        await interaction.followup.send(embed=discord.Embed(
+            title="✅ Bewerbung erstellt",
+            description=f"Deine Bewerbung wurde in {ticket_channel.mention} erstellt. Bitte beantworte dort die Fragen.",
+            color=discord.Color.green()
+        ), ephemeral=True)
+        await interaction.client.get_cog("ApplicationCog").start_session(ticket_channel, user, apply_type, log_collector)
+
+class ApplicationModal(discord.ui.Modal):
+    """All questions of an application type in one form; `answers` pre-fills it after an invalid player tag."""
 
-        try:
-            for idx, question in enumerate(questions):
-                percent = int((idx+1)/len(questions)*100)
-                q_embed = discord.Embed(
-                    title=f"Frage {idx+1}/{len(questions)}",
+    def __init__(self, apply_type: str, answers: Optional[List[str]] = None):
+        super().__init__(title=apply_type[:45], timeout=900)
+        self.apply_type = apply_type
+        self.questions = config.APPLICATION_QUESTIONS[apply_type]
+        self.inputs = []
+        for idx, question in enumerate(self.questions):
+            label, placeholder = form_field(question)
+            tag = is_tag_question(idx, question)
+            text_input = discord.ui.TextInput(
+                label=label,
+                placeholder=placeholder,
+                style=discord.TextStyle.short if tag else discord.TextStyle.paragraph,
+                max_length=11 if tag else 300,
+                default=answers[idx] if answers else None
+            )
+            self.inputs.append(text_input)
+            self.add_item(text_input)
+
+    async def on_submit(self, interaction: discord.Interaction):
+        guild = interaction.guild
+        user = interaction.user
+        answers = [text_input.value.strip() for text_input in self.inputs]
+        log_collector = LogCollector(guild, "Bewerbungsprozess", user, interaction.channel)
+        log_collector.add_event("Bewerbungsformular abgeschickt")
+
+        if is_tag_question(0, self.questions[0]):
+            answers[0] = answers[0].upper()
+            if not await check_player_tag(answers[0], log_collector):
+                await interaction.response.send_message(embed=discord.Embed(
+                    title="⚠️ Ungültiger Spieler-Tag",
                     description=(
-                        f"{question}\n\n"
-                        f"**Fortschritt:** [{animated_progress_bar(percent)}] {percent}%\n"
-                        f"⏰ Du hast 5 Minuten, um zu antworten."
+                        f"`{answers[0]}` ist kein gültiger Spieler-Tag oder wurde nicht gefunden.\n"
+                        "Ein korrekter Spieler-Tag beginnt mit #, gefolgt von 8-10 alphanumerischen Zeichen (z.B. #LJC8V0GCJ)."
                     ),
-                    color=discord.Color.blue()
-                )
-                q_embed.set_footer(text="Antworte direkt hier im Kanal.")
-                q_msg = await ticket_channel.send(embed=q_embed)
-
-                if idx == 0 and "Spieler-Tag" in question:
-                    max_attempts = 2
-                    for attempt in range(max_attempts):
-                        msg = await interaction.client.wait_for('message', check=check, timeout=300)
-                        if validate_player_tag(msg.content):
-                            answers.append(msg.content)
-                            await q_msg.delete()
-                            await msg.delete()
-                            log_collector.add_event(f"Spieler-Tag akzeptiert: {msg.content}")
-                            break
-                        else:
-                            if attempt == max_attempts - 1:
-                                await self._handle_invalid_tag(ticket_channel, user, log_collector, max_attempts)
-                                return
-                            await self._handle_invalid_tag_attempt(ticket_channel, user, log_collector, attempt, max_attempts)
-                            await msg.delete()
-                            continue
-                else:
-                    msg = await interaction.client.wait_for('message', check=check, timeout=300)
-                    answers.append(msg.content)
-                    await q_msg.delete()
-                    await msg.delete()
-                    log_collector.add_event(f"Antwort auf Frage {idx+1}: {msg.content}")
-        except asyncio.TimeoutError:
-            await self._handle_timeout(ticket_channel, user, log_collector)
-            return
-        except Exception as e:
-            await self._handle_error(ticket_channel, user, log_collector, str(e))
-            return
-
-        summary_embed = discord.Embed(
-            title="📄 Deine Bewerbungszusammenfassung",
-            description=(
-                f"**{user.mention}, hier ist deine Bewerbung:**\n\n"
-                f"**Bewerbungsart:** {self.values[0]}\n"
-                "Das Team wird deine Bewerbung bald prüfen. Danke für deine Geduld! 🙏"
-            ),
-            color=discord.Color.green()
-        )
-        summary_embed.set_thumbnail(url=user.display_avatar.url)
-        for i, q in enumerate(questions):
-            summary_embed.add_field(name=f"Frage {i+1}", value=f"**Antwort:** {answers[i]}", inline=False)
-        summary_embed.set_footer(text="Operation-Oluja | Danke für deine Bewerbung!", icon_url="https://cdn.discordapp.com/attachments/1128712101349038160/1226579502036989992/oluja_logo.png")
+                    color=discord.Color.orange()
+                ), view=RetryFormView(self.apply_type, answers), ephemeral=True)
+                log_collector.add_event(f"Ungültiger Spieler-Tag im Formular: {answers[0]}", "WARNING")
+                await log_collector.post_log(status="Abgebrochen", color=discord.Color.orange())
+                return
+            log_collector.add_event(f"Spieler-Tag akzeptiert: {answers[0]}")
 
-        view = AcceptDenyView(ticket_channel, user, summary_embed, self.values[0], answers)
-        await ticket_channel.send(embed=summary_embed, view=view)
-        log_collector.add_event("Bewerbungszusammenfassung gesendet")
+        await interaction.response.defer(ephemeral=True)
+        # Das Formular kann lange offen gewesen sein, daher erneut prüfen
+        ticket_channel, admin_role = await create_ticket_channel(guild, user, on_queued=lambda position: interaction.followup.send(embed=queued_embed(position), ephemeral=True))
+        if ticket_channel is None:
+            await interaction.followup.send(embed=open_application_embed(), ephemeral=True)
+            log_collector.add_event("Abbruch: Offene Bewerbung erkannt", "WARNING")
+            await log_collector.post_log(status="Abgebrochen", color=discord.Color.red())
+            return
+        log_collector.channel = ticket_channel
+        log_collector.add_event("Bewerbungskanal erstellt")
 
+        cog = interaction.client.get_cog("ApplicationCog")
+        session = cog.new_session(ticket_channel, user, self.apply_type)
+        session["answers"] = answers
+        session["step"] = len(answers)
         await interaction.followup.send(embed=discord.Embed(
             title="✅ Bewerbung erstellt",
             description=f"Deine Bewerbung wurde in {ticket_channel.mention} erstellt.",
             color=discord.Color.green()
         ), ephemeral=True)
-        log_collector.add_event("Bewerbung erfolgreich erstellt")
-        await log_collector.post_log(status="Erstellt")
+        await cog.open_review(ticket_channel, user, session, log_collector, content=admin_role.mention if admin_role else "")
 
-    async def _handle_invalid_tag(self, channel, user, log_collector, max_attempts):
-        error_embed = discord.Embed(
-            title="⚠️ Ungültiger Spieler-Tag",
-            description=(
-                "Du hast keine weiteren Versuche.\n"
-                "Ein korrekter Spieler-Tag beginnt mit #, gefolgt von 8-10 alphanumerischen Zeichen (z.B. #LJC8V0GCJ).\n"
-                "Der Kanal wird geschlossen."
-            ),
-            color=discord.Color.red()
-        )
-        await channel.send(embed=error_embed)
-        log_collector.add_event(f"Ungültiger Spieler-Tag nach {max_attempts} Versuchen", "WARNING")
-        await self._send_dm_and_close(user, channel, log_collector, "Ungültiger Spieler-Tag")
-
-    async def _handle_invalid_tag_attempt(self, channel, user, log_collector, attempt, max_attempts):
-        error_embed = discord.Embed(
-            title="⚠️ Ungültiger Spieler-Tag",
-            description=(
-                f"Bitte gib einen korrekten Tag im Format `#LJC8V0GCJ` ein.\n"
-                f"**Versuch {attempt + 2}/{max_attempts}**\n"
-                "Ein korrekter Spieler-Tag beginnt mit #, gefolgt von 8-10 alphanumerischen Zeichen."
-            ),
-            color=discord.Color.orange()
-        )
-        await channel.send(embed=error_embed)
-        log_collector.add_event(f"Ungültiger Spieler-Tag, Versuch {attempt + 2}/{max_attempts}", "WARNING")
-
-    async def _handle_timeout(self, channel, user, log_collector):
-        timeout_embed = discord.Embed(
-            title="⏰ Zeit abgelaufen",
-            description="Du hast zu lange gebraucht, um die Fragen zu beantworten. Bitte starte die Bewerbung erneut.",
-            color=discord.Color.red()
-        )
-        await channel.send(embed=timeout_embed)
-        log_collector.add_event("Timeout bei der Antwort", "WARNING")
-        await self._send_dm_and_close(user, channel, log_collector, "Timeout")
+class RetryFormView(discord.ui.View):
+    def __init__(self, apply_type: str, answers: List[str]):
+        super().__init__(timeout=600)
+        self.apply_type = apply_type
+        self.answers = answers
 
-    async def _handle_error(self, channel, user, log_collector, error):
-        error_embed = discord.Embed(
-            title="❌ Ein Fehler ist aufgetreten",
-            description=f"Fehler: {error}\nBitte wende dich an das Team.",
-            color=discord.Color.red()
-        )
-        await channel.send(embed=error_embed)
-        log_collector.add_event(f"Fehler: {error}", "ERROR")
-        await self._send_dm_and_close(user, channel, log_collector, "Fehler")
-
-    async def _send_dm_and_close(self, user, channel, log_collector, reason):
-        dm_embed = discord.Embed(
-            title="❌ Dein Ticket wurde geschlossen",
-            description=(
-                f"Deine Bewerbung wurde abgebrochen, weil {reason.lower()} aufgetreten ist.\n"
-                "Bitte starte die Bewerbung erneut oder kontaktiere das Team für Unterstützung."
-            ),
-            color=discord.Color.red()
-        )
-        dm_embed.set_footer(text="Operation-Oluja")
-        try:
-            await user.send(embed=dm_embed)
-            log_collector.add_event(f"DM gesendet: {reason}")
-        except discord.Forbidden:
-            log_collector.add_event("DM konnte nicht gesendet werden", "WARNING")
-        await channel.delete()
-        await log_collector.post_log(status="Abgebrochen", color=discord.Color.red())
+    @discord.ui.button(label="✏️ Formular korrigieren", style=discord.ButtonStyle.primary)
+    async def retry(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await interaction.response.send_modal(ApplicationModal(self.apply_type, self.answers))
 
 class ApplicationDropdownView(discord.ui.View):
     def __init__(self):
@@ -241,6 +338,10 @@ class FAQView(discord.ui.View):
 
     @discord.ui.button(label="❓ FAQ anzeigen", style=discord.ButtonStyle.secondary, custom_id="faq_button")
     async def show_faq(self, interaction: discord.Interaction, button: discord.ui.Button):
+        retry_after = rate_limits.hit("faq", interaction)
+        if retry_after:
+            await interaction.response.send_message(embed=cooldown_embed(retry_after), ephemeral=True)
+            return
         embed = discord.Embed(
             title="❓ Häufige Fragen (FAQ)",
             description=config.FAQ_TEXT,
@@ -252,214 +353,400 @@ class FAQView(discord.ui.View):
         log_collector.add_event("FAQ angezeigt")
         await log_collector.post_log()
 
-class AcceptDenyView(discord.ui.View):
-    def __init__(self, channel, applicant, embed, apply_type, answers):
-        super().__init__(timeout=1800)
-        self.channel = channel
-        self.applicant = applicant
-        self.embed = embed
-        self.apply_type = apply_type
-        self.answers = answers
-        self.add_item(NotifyTeamButton())
-
-    def _is_admin(self, user: discord.Member):
-        admin_role = get_admin_role(user.guild)
-        return admin_role and admin_role in user.roles
-
-    @discord.ui.button(label="✅ Annehmen", style=discord.ButtonStyle.green, custom_id="accept_button")
-    async def accept(self, interaction: discord.Interaction, button: discord.ui.Button):
-        log_collector = LogCollector(interaction.guild, "Bewerbungsbearbeitung", interaction.user, self.channel)
-        log_collector.add_event("Bewerbungsbearbeitung gestartet")
-
-        if not self._is_admin(interaction.user):
-            await interaction.response.send_message(embed=discord.Embed(
-                title="❌ Keine Berechtigung",
-                description="Nur Teammitglieder dürfen das!",
-                color=discord.Color.red()
-            ), ephemeral=True)
-            log_collector.add_event("Unbefugter Zugriff", "WARNING")
-            await log_collector.post_log(status="Abgebrochen", color=discord.Color.red())
-            return
-
-        member_role = interaction.guild.get_role(config.MEMBER_ROLE_ID)
-        if not member_role:
-            await interaction.response.send_message(embed=discord.Embed(
-                title="⚠️ Fehler",
-                description="Member-Rolle nicht gefunden.",
-                color=discord.Color.orange()
-            ), ephemeral=True)
-            log_collector.add_event("Fehler: Member-Rolle nicht gefunden", "ERROR")
-            await log_collector.post_log(status="Abgebrochen", color=discord.Color.red())
-            return
-
-        await self.applicant.add_roles(member_role, reason="Bewerbung angenommen")
-        log_collector.add_event("Mitgliederrolle zugewiesen")
+def is_admin(user: discord.Member) -> bool:
+    admin_role = get_admin_role(user.guild)
+    return bool(admin_role and admin_role in user.roles)
 
-        clan_link = f"https://link.clashofclans.com/de?action=OpenClanProfile&tag={config.CLAN_TAG.replace('#','')}"
-        clan_logo = "https://cdn.discordapp.com/attachments/1128712101349038160/1226579502036989992/oluja_logo.png"
-        funfact = random.choice(FUNFACTS)
-        countdown = 5
+async def reply(interaction: discord.Interaction, embed: discord.Embed):
+    """Ephemeral answer to a button click or modal, whether or not it was deferred."""
+    if interaction.response.is_done():
+        await interaction.followup.send(embed=embed, ephemeral=True)
+    else:
+        await interaction.response.send_message(embed=embed, ephemeral=True)
 
-        clan_embed = discord.Embed(
-            title="☢️ Willkommen bei Operation-Oluja! ☢️",
-            description=(
-                f"**{self.applicant.mention}, du bist offiziell angenommen!**\n\n"
-                f"{'⏳ **Clanbeitritt in {i}...**\n' * countdown}\n"
-                f"\n**Fun Fact:** {funfact}\n\n"
-                "Klicke auf den Button, um direkt unserem Clan beizutreten! 🎉"
-            ),
-            color=discord.Color.gold()
-        )
-        clan_embed.set_thumbnail(url=clan_logo)
-        clan_embed.set_image(url="https://media.giphy.com/media/3o6Zt481isNVuQI1l6/giphy.gif")
-        clan_embed.add_field(name="Clan-Link", value=f"[🏰 Direkt beitreten]({clan_link})", inline=False)
-        clan_embed.set_footer(text="Wir freuen uns auf dich! 🎈🎉", icon_url=clan_logo)
+async def refuse_unauthorized(interaction: discord.Interaction, log_collector: LogCollector, description="Nur Teammitglieder dürfen das!"):
+    await reply(interaction, discord.Embed(title="❌ Keine Berechtigung", description=description, color=discord.Color.red()))
+    log_collector.add_event("Unbefugter Zugriff", "WARNING")
+    await log_collector.post_log(status="Abgebrochen", color=discord.Color.red())
+
+async def load_review(interaction: discord.Interaction, channel_id: int, log_collector: LogCollector):
+    """
+    Ticket channel, applicant and persisted session of an application awaiting a decision.
+    Answers the interaction and returns None if the application is gone, already decided or its applicant left.
+    """
+    try:
+        session = await db.get_application_session(channel_id)
+    except DatabaseError:
+        await reply(interaction, discord.Embed(
+            title="⚠️ Fehler",
+            description="Die Bewerbung konnte nicht geladen werden. Bitte versuche es gleich noch einmal.",
+            color=discord.Color.orange()
+        ))
+        log_collector.add_event("Fehler: Bewerbung konnte nicht geladen werden", "ERROR")
+        await log_collector.post_log(status="Abgebrochen", color=discord.Color.red())
+        return None
 
-        view = discord.ui.View(timeout=None)
-        view.add_item(discord.ui.Button(label="Clan beitreten", url=clan_link, style=discord.ButtonStyle.link, emoji="🏰"))
+    channel = interaction.guild.get_channel(channel_id)
+    if session is None or channel is None or session["state"] != "review":
+        await reply(interaction, already_decided_embed())
+        log_collector.add_event("Abbruch: Bewerbung nicht mehr offen", "WARNING")
+        await log_collector.post_log(status="Abgebrochen", color=discord.Color.orange())
+        return None
 
+    applicant = interaction.guild.get_member(session["applicant_id"])
+    if applicant is None:
         try:
-            await self.applicant.send(embed=clan_embed, view=view)
+            applicant = await interaction.guild.fetch_member(session["applicant_id"])
+        except discord.NotFound:
+            await reply(interaction, discord.Embed(
+                title="⚠️ Fehler",
+                description=f"{session['applicant_name']} ist nicht mehr auf dem Server.",
+                color=discord.Color.orange()
+            ))
+            log_collector.add_event("Fehler: Bewerber nicht mehr auf dem Server", "ERROR")
+            await log_collector.post_log(status="Abgebrochen", color=discord.Color.red())
+            return None
+    return channel, applicant, session
+
+async def claim_decision(interaction: discord.Interaction, channel_id: int, state: str, log_collector: LogCollector) -> bool:
+    """
+    Move the application from review to `state`; only one admin wins if several decide at the same time.
+    If the decision then does not take effect (member role not assigned, denial not delivered), the caller
+    puts it back with reopen_review; after that point a failure leaves a close button via offer_close.
+    """
+    try:
+        claimed = await db.transition_application_state(channel_id, "review", state)
+    except DatabaseError:
+        await reply(interaction, discord.Embed(
+            title="⚠️ Fehler",
+            description="Die Entscheidung konnte nicht gespeichert werden. Bitte versuche es gleich noch einmal.",
+            color=discord.Color.orange()
+        ))
+        log_collector.add_event("Fehler: Entscheidung konnte nicht gespeichert werden", "ERROR")
+        await log_collector.post_log(status="Abgebrochen", color=discord.Color.red())
+        return False
+    if not claimed:
+        await reply(interaction, already_decided_embed())
+        log_collector.add_event("Abbruch: Bewerbung wurde bereits bearbeitet", "WARNING")
+        await log_collector.post_log(status="Abgebrochen", color=discord.Color.orange())
+        return False
+    ticket_index.set_state(channel_id, state)
+    return True
+
+async def reopen_review(channel_id: int, state: str, log_collector: LogCollector) -> bool:
+    """
+    Undo a claimed decision whose processing failed, so the buttons can be used again.
+    Returns False if the database could not be reached; the application then stays in `state`.
+    """
+    try:
+        reopened = await db.transition_application_state(channel_id, state, "review")
+    except DatabaseError as e:
+        logger.error(f"Application in channel {channel_id} could not be reopened for review: {e}")
+        log_collector.add_event(f"Bewerbung konnte nicht wieder geöffnet werden: {e}", "ERROR")
+        return False
+    if reopened:
+        ticket_index.set_state(channel_id, "review")
+    return reopened
+
+def reopen_failed_text(reopened: bool) -> str:
+    if reopened:
+        return "Die Bewerbung ist wieder offen."
+    return "Die Bewerbung konnte nicht wieder geöffnet werden, bitte schließt das Ticket manuell."
+
+async def offer_close(channel: discord.TextChannel, log_collector: LogCollector, error: Exception):
+    """After a decision took effect but its remaining processing failed, leave the team a way to close the ticket."""
+    log_collector.add_event(f"Abschluss fehlgeschlagen: {error}", "ERROR")
+    try:
+        await channel.send(embed=discord.Embed(
+            title="⚠️ Abschluss fehlgeschlagen",
+            description="Die Entscheidung wurde gespeichert, aber das Ticket konnte nicht abgeschlossen werden. Bitte schließt es manuell.",
+            color=discord.Color.orange()
+        ), view=ticket_view(channel.id, "close"))
+    except discord.HTTPException as e:
+        logger.error(f"Close control for channel {channel.id} could not be posted: {e}")
+
+def decision_result_embed(description: str, failed: List[str]) -> discord.Embed:
+    if not failed:
+        return discord.Embed(title="✅ Erfolg", description=description, color=discord.Color.green())
+    return discord.Embed(
+        title="⚠️ Teilweise fehlgeschlagen",
+        description=f"{description}\n**Fehlgeschlagen:** {', '.join(failed)}",
+        color=discord.Color.orange()
+    )
+
+async def accept_application(interaction: discord.Interaction, channel_id: int):
+    log_collector = LogCollector(interaction.guild, "Bewerbungsbearbeitung", interaction.user, interaction.channel)
+    log_collector.add_event("Bewerbungsbearbeitung gestartet")
+
+    if not is_admin(interaction.user):
+        await refuse_unauthorized(interaction, log_collector)
+        return
+    # Sofort bestätigen, alle weiteren Antworten laufen über Followups
+    await interaction.response.defer(ephemeral=True, thinking=True)
+
+    member_role = interaction.guild.get_role(config.MEMBER_ROLE_ID)
+    if not member_role:
+        await reply(interaction, discord.Embed(
+            title="⚠️ Fehler",
+            description="Member-Rolle nicht gefunden.",
+            color=discord.Color.orange()
+        ))
+        log_collector.add_event("Fehler: Member-Rolle nicht gefunden", "ERROR")
+        await log_collector.post_log(status="Abgebrochen", color=discord.Color.red())
+        return
+
+    loaded = await load_review(interaction, channel_id, log_collector)
+    if loaded is None:
+        return
+    channel, applicant, session = loaded
+    if not await claim_decision(interaction, channel_id, "accepted", log_collector):
+        return
+    # Ohne Rolle ist niemand angenommen: schlägt sie fehl, wird die Entscheidung zurückgenommen
+    try:
+        with log_collector.span("Rolle zuweisen"):
+            await applicant.add_roles(member_role, reason="Bewerbung angenommen")
+    except Exception as e:
+        reopened = await reopen_review(channel_id, "accepted", log_collector)
+        await reply(interaction, discord.Embed(
+            title="⚠️ Fehler",
+            description=f"Die Mitgliederrolle konnte nicht vergeben werden ({e}). {reopen_failed_text(reopened)}",
+            color=discord.Color.orange()
+        ))
+        log_collector.add_event(f"Rolle konnte nicht zugewiesen werden: {e}", "ERROR")
+        if not reopened:
+            await offer_close(channel, log_collector, e)
+        await log_collector.post_log(status="Abgebrochen", color=discord.Color.red())
+        return
+    log_collector.add_event("Mitgliederrolle zugewiesen")
+    try:
+        await _accept(interaction, channel, applicant, session, log_collector)
+    except Exception as e:
+        await offer_close(channel, log_collector, e)
+        raise
+
+async def _accept(interaction, channel, applicant, session, log_collector):
+    answers = session["answers"]
+
+    clan_link = f"https://link.clashofclans.com/de?action=OpenClanProfile&tag={config.CLAN_TAG.replace('#','')}"
+    clan_logo = "https://cdn.discordapp.com/attachments/1128712101349038160/1226579502036989992/oluja_logo.png"
+    funfact = random.choice(FUNFACTS)
+    countdown = 5
+
+    clan_embed = discord.Embed(
+        title="☢️ Willkommen bei Operation-Oluja! ☢️",
+        description=(
+            f"**{applicant.mention}, du bist offiziell angenommen!**\n\n"
+            f"{'⏳ **Clanbeitritt in {i}...**\n' * countdown}\n"
+            f"\n**Fun Fact:** {funfact}\n\n"
+            "Klicke auf den Button, um direkt unserem Clan beizutreten! 🎉"
+        ),
+        color=discord.Color.gold()
+    )
+    clan_embed.set_thumbnail(url=clan_logo)
+    clan_embed.set_image(url="https://media.giphy.com/media/3o6Zt481isNVuQI1l6/giphy.gif")
+    clan_embed.add_field(name="Clan-Link", value=f"[🏰 Direkt beitreten]({clan_link})", inline=False)
+    clan_embed.set_footer(text="Wir freuen uns auf dich! 🎈🎉", icon_url=clan_logo)
+
+    view = discord.ui.View(timeout=None)
+    view.add_item(discord.ui.Button(label="Clan beitreten", url=clan_link, style=discord.ButtonStyle.link, emoji="🏰"))
+
+    success_embed = discord.Embed(
+        title="🎉 Bewerbung angenommen!",
+        description=f"Willkommen im Clan, {applicant.mention}!",
+        color=discord.Color.green()
+    )
+    success_embed.set_thumbnail(url=applicant.display_avatar.url)
+
+    async def send_clan_dm():
+        try:
+            await applicant.send(embed=clan_embed, view=view)
             log_collector.add_event("Clan-Link-DM gesendet")
         except discord.Forbidden:
             log_collector.add_event("Clan-Link-DM konnte nicht gesendet werden", "WARNING")
 
-        await self.channel.send(embed=clan_embed, view=view)
-
-        success_embed = discord.Embed(
-            title="🎉 Bewerbung angenommen!",
-            description=f"Willkommen im Clan, {self.applicant.mention}!",
-            color=discord.Color.green()
-        )
-        success_embed.set_thumbnail(url=self.applicant.display_avatar.url)
-        await self.channel.send(embed=success_embed, view=CloseTicketView())
-        await self.channel.send(view=FeedbackButtonView())
-
-        db.add_application(
-            applicant_name=self.applicant.name,
-            applicant_id=self.applicant.id,
-            apply_type=self.apply_type,
-            spieler_tag=self.answers[0],
-            strategien=self.answers[1] if len(self.answers) > 1 else "",
-            th_level=self.answers[2] if len(self.answers) > 2 else "",
+    async def send_channel_messages():
+        # Reihenfolge im Kanal bleibt erhalten, nur die anderen Schritte laufen parallel dazu
+        await channel.send(embed=clan_embed, view=view)
+        await channel.send(embed=success_embed, view=ticket_view(channel.id, "close"))
+        await channel.send(view=ticket_view(channel.id, "feedback"))
+
+    results = await fan_out(log_collector, {
+        "Clan-Link-DM": send_clan_dm(),
+        "Kanalnachrichten": send_channel_messages(),
+        "Datenbank": db.add_application(
+            applicant_name=applicant.name,
+            applicant_id=applicant.id,
+            apply_type=session["apply_type"],
+            spieler_tag=answers[0] if answers else "",
+            strategien=answers[1] if len(answers) > 1 else "",
+            th_level=answers[2] if len(answers) > 2 else "",
             status="Angenommen",
             reason="",
             handled_by=interaction.user.name
-        )
-
-        await interaction.response.send_message(embed=discord.Embed(
-            title="✅ Erfolg",
-            description="Bewerbung angenommen. Der Bewerber hat einen Clan-Link erhalten.",
-            color=discord.Color.green()
-        ), ephemeral=True)
-        await self.channel.edit(name=f"angenommen-{self.applicant.name[:20]}")
-
-        end_time = datetime.utcnow()
-        duration = (end_time - log_collector.start_time).seconds
-        embed = discord.Embed(
-            title="🎉 Bewerbungsprozess abgeschlossen",
-            description=(
-                f"**Bewerber:** {self.applicant.mention} ({self.applicant.name})\n"
-                f"**Moderatoren:** {interaction.user.mention} ({interaction.user.name})\n"
-                f"**Status:** Angenommen :white_check_mark:"
-            ),
-            color=discord.Color.green(),
-            timestamp=end_time
-        )
-        embed.add_field(name="Dauer", value=f"{duration} Sekunden", inline=False)
-        embed.set_thumbnail(url="https://cdn.discordapp.com/attachments/1128712101349038160/1226579502036989992/oluja_logo.png")
-        embed.set_footer(text="Operation-Oluja | Abschluss", icon_url=self.applicant.display_avatar.url)
-        await self.channel.send(embed=embed)
-
-        log_collector.add_event(f"Bewerbung an Accepted von {interaction.user.name}")
-        await log_collector.post_log(status="Angenommen")
-
-    @discord.ui.button(label="❌ Ablehnen", style=discord.ButtonStyle.red, custom_id="deny_button")
-    async def deny(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if not self._is_admin(interaction.user):
-            await interaction.response.send_message(embed=discord.Embed(
-                title="❌ Keine Berechtigung",
-                description="Nur Teammitglieder dürfen das!",
-                color=discord.Color.red()
-            ), ephemeral=True)
-            log_collector = LogCollector(interaction.guild, "Bewerbungsbearbeitung", interaction.user, self.channel)
-            log_collector.add_event("Unbefugter Zugriff", "WARNING")
-            await log_collector.post_log(status="Abgebrochen", color=discord.Color.red())
-            return
-        await interaction.response.send_modal(DenyReasonModal(self))
-
-    async def process_deny(self, interaction: discord.Interaction, reason: str):
-        log_collector = LogCollector(interaction.guild, "Bewerbungsbearbeitung", interaction.user, self.channel)
-        log_collector.add_event("Bewerbungsbearbeitung gestartet")
-
-        reason = reason.strip() or "Kein Grund angegeben."
-        deny_embed = discord.Embed(
-            title="❌ Bewerbung abgelehnt",
-            description=f"{self.applicant.mention}, leider konnten wir dich nicht aufnehmen.\n**Grund:** {reason}",
-            color=discord.Color.red()
-        )
-        deny_embed.set_thumbnail(url=self.applicant.display_avatar.url)
-        await self.channel.send(embed=deny_embed)
-        await asyncio.sleep(2)
-
-        dm_embed = discord.Embed(
-            title="❌ Deine Bewerbung wurde abgelehnt",
-            description="Leider wurde deine Bewerbung abgelehnt. Du kannst dich in 2 Wochen erneut bewerben.",
-            color=discord.Color.red()
-        )
-        dm_embed.add_field(name="Grund", value=reason, inline=False)
-        summary = "\n".join([f"**{field.name}:** {field.value}" for field in self.embed.fields])
-        dm_embed.add_field(name="Bewerbungszusammenfassung", value=summary, inline=False)
-        dm_embed.set_footer(text="Operation-Oluja")
+        ),
+        "Kanal umbenennen": channel.edit(name=f"angenommen-{applicant.name[:20]}")
+    }, limit=DECISION_PARALLELISM)
+    failed = failed_steps(results)
+
+    await interaction.followup.send(embed=decision_result_embed(
+        "Bewerbung angenommen. Der Bewerber hat einen Clan-Link erhalten.", failed
+    ), ephemeral=True)
+
+    end_time = datetime.utcnow()
+    duration = f"{log_collector.elapsed:.1f}"
+    embed = discord.Embed(
+        title="🎉 Bewerbungsprozess abgeschlossen",
+        description=(
+            f"**Bewerber:** {applicant.mention} ({applicant.name})\n"
+            f"**Moderatoren:** {interaction.user.mention} ({interaction.user.name})\n"
+            f"**Status:** Angenommen :white_check_mark:"
+        ),
+        color=discord.Color.green(),
+        timestamp=end_time
+    )
+    embed.add_field(name="Dauer", value=f"{duration} Sekunden", inline=False)
+    embed.set_thumbnail(url="https://cdn.discordapp.com/attachments/1128712101349038160/1226579502036989992/oluja_logo.png")
+    embed.set_footer(text="Operation-Oluja | Abschluss", icon_url=applicant.display_avatar.url)
+    await channel.send(embed=embed)
+    DECISION_SECONDS.observe((discord.utils.utcnow() - interaction.created_at).total_seconds(), "accepted")
+
+    log_collector.add_event(f"Bewerbung an Accepted von {interaction.user.name}")
+    await log_collector.post_log(status="Angenommen", color=discord.Color.orange() if failed else discord.Color.green())
+
+async def deny_application(interaction: discord.Interaction, channel_id: int):
+    log_collector = LogCollector(interaction.guild, "Bewerbungsbearbeitung", interaction.user, interaction.channel)
+    if not is_admin(interaction.user):
+        await refuse_unauthorized(interaction, log_collector)
+        return
+    # Das Modal muss die erste Antwort sein, daher nur der Ticket-Index statt der Datenbank;
+    # endgültig geprüft wird beim Absenden des Grundes
+    ticket = ticket_index.get(channel_id)
+    if ticket is None or ticket["state"] != "review":
+        await reply(interaction, already_decided_embed())
+        log_collector.add_event("Abbruch: Bewerbung nicht mehr offen", "WARNING")
+        await log_collector.post_log(status="Abgebrochen", color=discord.Color.orange())
+        return
+    await interaction.response.send_modal(DenyReasonModal(channel_id))
+
+async def process_deny(interaction: discord.Interaction, channel_id: int, reason: str):
+    log_collector = LogCollector(interaction.guild, "Bewerbungsbearbeitung", interaction.user, interaction.channel)
+    log_collector.add_event("Bewerbungsbearbeitung gestartet")
+
+    loaded = await load_review(interaction, channel_id, log_collector)
+    if loaded is None:
+        return
+    channel, applicant, session = loaded
+    if not await claim_decision(interaction, channel_id, "denied", log_collector):
+        return
+    try:
+        await _deny(interaction, channel, applicant, session, reason, log_collector)
+    except Exception as e:
+        await offer_close(channel, log_collector, e)
+        raise
+
+async def _deny(interaction, channel, applicant, session, reason, log_collector):
+    answers = session["answers"]
+
+    reason = reason.strip() or "Kein Grund angegeben."
+    deny_embed = discord.Embed(
+        title="❌ Bewerbung abgelehnt",
+        description=f"{applicant.mention}, leider konnten wir dich nicht aufnehmen.\n**Grund:** {reason}",
+        color=discord.Color.red()
+    )
+    deny_embed.set_thumbnail(url=applicant.display_avatar.url)
+
+    dm_embed = discord.Embed(
+        title="❌ Deine Bewerbung wurde abgelehnt",
+        description="Leider wurde deine Bewerbung abgelehnt. Du kannst dich in 2 Wochen erneut bewerben.",
+        color=discord.Color.red()
+    )
+    dm_embed.add_field(name="Grund", value=reason, inline=False)
+    summary = "\n".join(f"**Frage {i+1}:** **Antwort:** {answer}" for i, answer in enumerate(answers))
+    dm_embed.add_field(name="Bewerbungszusammenfassung", value=summary[:1024] or "-", inline=False)
+    dm_embed.set_footer(text="Operation-Oluja")
+
+    dm_delivered = False
+
+    async def send_deny_dm():
+        nonlocal dm_delivered
         try:
-            await self.applicant.send(embed=dm_embed)
+            await applicant.send(embed=dm_embed)
+            dm_delivered = True
             log_collector.add_event("Ablehnungs-DM gesendet")
         except discord.Forbidden:
             log_collector.add_event("Ablehnungs-DM konnte nicht gesendet werden", "WARNING")
 
-        db.add_application(
-            applicant_name=self.applicant.name,
-            applicant_id=self.applicant.id,
-            apply_type=self.apply_type,
-            spieler_tag=self.answers[0],
-            strategien=self.answers[1] if len(self.answers) > 1 else "",
-            th_level=self.answers[2] if len(self.answers) > 2 else "",
+    results = await fan_out(log_collector, {
+        "Kanalnachricht": channel.send(embed=deny_embed),
+        "Ablehnungs-DM": send_deny_dm()
+    }, limit=DECISION_PARALLELISM)
+    if results["Kanalnachricht"] is not None and not dm_delivered:
+        # Der Bewerber hat nichts von der Ablehnung erfahren, also zurück in die Prüfung statt den Kanal zu löschen
+        reopened = await reopen_review(channel.id, "denied", log_collector)
+        await interaction.followup.send(embed=discord.Embed(
+            title="⚠️ Fehler",
+            description=f"Die Ablehnung konnte weder im Kanal noch per DM zugestellt werden. {reopen_failed_text(reopened)}",
+            color=discord.Color.orange()
+        ), ephemeral=True)
+        log_collector.add_event("Ablehnung nicht zugestellt", "ERROR")
+        if not reopened:
+            await offer_close(channel, log_collector, RuntimeError("Ablehnung nicht zugestellt"))
+        await log_collector.post_log(status="Abgebrochen", color=discord.Color.red())
+        return
+    # Erst nach der Zustellung festhalten; das Einreihen in den Batch-Writer kostet kaum Zeit
+    results.update(await fan_out(log_collector, {
+        "Datenbank": db.add_application(
+            applicant_name=applicant.name,
+            applicant_id=applicant.id,
+            apply_type=session["apply_type"],
+            spieler_tag=answers[0] if answers else "",
+            strategien=answers[1] if len(answers) > 1 else "",
+            th_level=answers[2] if len(answers) > 2 else "",
             status="Abgelehnt",
             reason=reason,
             handled_by=interaction.user.name
         )
+    }))
+    failed = failed_steps(results)
 
-        await interaction.followup.send(embed=discord.Embed(
+    if failed:
+        result_embed = decision_result_embed("Bewerbung abgelehnt.", failed)
+    else:
+        result_embed = discord.Embed(
             title="✅ Erfolg",
             description="Bewerbung abgelehnt und DM gesendet." if not log_collector.has_errors else "Bewerbung abgelehnt, aber DM konnte nicht zugestellt werden.",
             color=discord.Color.green() if not log_collector.has_errors else discord.Color.orange()
-        ), ephemeral=True)
-
-        end_time = datetime.utcnow()
-        duration = (end_time - log_collector.start_time).seconds
-        embed = discord.Embed(
-            title="❌ Bewerbungsprozess abgeschlossen",
-            description=(
-                f"**Bewerber:** {self.applicant.mention} ({self.applicant.name})\n"
-                f"**Moderatoren:** {interaction.user.mention} ({interaction.user.name})\n"
-                f"**Status:** Abgelehnt :x:"
-            ),
-            color=discord.Color.red(),
-            timestamp=end_time
         )
-        embed.add_field(name="Dauer", value=f"{duration} Sekunden", inline=False)
-        embed.set_thumbnail(url="https://cdn.discordapp.com/attachments/1128712101349038160/1226579502036989992/oluja_logo.png")
-        embed.set_footer(text="Operation-Oluja | Abschluss", icon_url=self.applicant.display_avatar.url)
-        await self.channel.send(embed=embed)
-
-        await self.channel.delete()
-        log_collector.add_event(f"Bewerbung abgelehnt von {interaction.user.name}. Grund: {reason}")
-        await log_collector.post_log(status="Abgelehnt", color=discord.Color.red())
+    await interaction.followup.send(embed=result_embed, ephemeral=True)
+
+    end_time = datetime.utcnow()
+    duration = f"{log_collector.elapsed:.1f}"
+    embed = discord.Embed(
+        title="❌ Bewerbungsprozess abgeschlossen",
+        description=(
+            f"**Bewerber:** {applicant.mention} ({applicant.name})\n"
+            f"**Moderatoren:** {interaction.user.mention} ({interaction.user.name})\n"
+            f"**Status:** Abgelehnt :x:"
+        ),
+        color=discord.Color.red(),
+        timestamp=end_time
+    )
+    embed.add_field(name="Dauer", value=f"{duration} Sekunden", inline=False)
+    embed.set_thumbnail(url="https://cdn.discordapp.com/attachments/1128712101349038160/1226579502036989992/oluja_logo.png")
+    embed.set_footer(text="Operation-Oluja | Abschluss", icon_url=applicant.display_avatar.url)
+    await channel.send(embed=embed)
+
+    # Kurz stehen lassen, damit die Ablehnung im Kanal noch zu sehen ist
+    await asyncio.sleep(2)
+    deleted = await archive_and_delete(channel, log_collector, "Abgelehnt", session)
+    DECISION_SECONDS.observe((discord.utils.utcnow() - interaction.created_at).total_seconds(), "denied")
+    log_collector.add_event(f"Bewerbung abgelehnt von {interaction.user.name}. Grund: {reason}")
+    await log_collector.post_log(status="Abgelehnt", color=discord.Color.red() if deleted else discord.Color.orange())
 
 class DenyReasonModal(discord.ui.Modal):
-    def __init__(self, parent_view):
+    def __init__(self, channel_id: int):
         super().__init__(title="Bewerbung ablehnen")
-        self.parent_view = parent_view
+        self.channel_id = channel_id
         self.reason = discord.ui.TextInput(
             label="Grund für die Ablehnung (optional)",
             style=discord.TextStyle.paragraph,
@@ -471,87 +758,130 @@ class DenyReasonModal(discord.ui.Modal):
 
     async def on_submit(self, interaction: discord.Interaction):
         await interaction.response.defer(ephemeral=True)
-        await self.parent_view.process_deny(interaction, self.reason.value)
-
-class NotifyTeamButton(discord.ui.Button):
-    def __init__(self):
-        super().__init__(label="Team benachrichtigen", style=discord.ButtonStyle.primary, custom_id="notify_team", emoji="📢")
+        await process_deny(interaction, self.channel_id, self.reason.value)
 
-    async def callback(self, interaction: discord.Interaction):
-        log_collector = LogCollector(interaction.guild, "Team-Benachrichtigung", interaction.user, interaction.channel)
-        log_collector.add_event("Benachrichtigung gestartet")
-
-        now = datetime.utcnow()
-        channel_id = interaction.channel.id
-        cooldown = TEAM_NOTIFY_COOLDOWNS.get(channel_id)
-        if cooldown and now < cooldown:
-            minutes = int((cooldown - now).total_seconds() // 60) + 1
-            await interaction.response.send_message(embed=discord.Embed(
-                title="🚫 Cooldown",
-                description=f"Das Team kann erst in {minutes} Minute(n) erneut benachrichtigt werden.",
-                color=discord.Color.red()
-            ), ephemeral=True)
-            log_collector.add_event(f"Cooldown: {minutes} Minuten verbleibend", "WARNING")
-            await log_collector.post_log(status="Abgebrochen", color=discord.Color.red())
-            return
+async def notify_team(interaction: discord.Interaction, channel_id: int):
+    log_collector = LogCollector(interaction.guild, "Team-Benachrichtigung", interaction.user, interaction.channel)
+    log_collector.add_event("Benachrichtigung gestartet")
 
-        admin_role = get_admin_role(interaction.guild)
-        if not admin_role:
-            await interaction.response.send_message(embed=discord.Embed(
-                title="⚠️ Fehler",
-                description="Admin-Rolle nicht gefunden.",
-                color=discord.Color.orange()
-            ), ephemeral=True)
-            log_collector.add_event("Fehler: Admin-Rolle nicht gefunden", "ERROR")
-            await log_collector.post_log(status="Abgebrochen", color=discord.Color.red())
-            return
-
-        TEAM_NOTIFY_COOLDOWNS[channel_id] = now + timedelta(minutes=15)
+    admin_role = get_admin_role(interaction.guild)
+    if not admin_role:
         await interaction.response.send_message(embed=discord.Embed(
-            title="📢 Team benachrichtigt",
-            description=f"{admin_role.mention} - Bitte beachtet diese Bewerbung!",
-            color=discord.Color.blue()
-        ))
-        log_collector.add_event("Team benachrichtigt")
-        await log_collector.post_log()
-
-class CloseTicketView(discord.ui.View):
-    def __init__(self):
-        super().__init__(timeout=None)
-
-    @discord.ui.button(label="🔒 Ticket schließen", style=discord.ButtonStyle.red, custom_id="close_ticket")
-    async def close_ticket(self, interaction: discord.Interaction, button: discord.ui.Button):
-        log_collector = LogCollector(interaction.guild, "Ticket-Schließung", interaction.user, interaction.channel)
-        log_collector.add_event("Ticket-Schließung gestartet")
-
-        admin_role = get_admin_role(interaction.guild)
-        if not admin_role or admin_role not in interaction.user.roles:
-            await interaction.response.send_message(embed=discord.Embed(
-                title="❌ Keine Berechtigung",
-                description="Du hast keine Berechtigung.",
-                color=discord.Color.red()
-            ), ephemeral=True)
-            log_collector.add_event("Unbefugter Zugriff", "WARNING")
-            await log_collector.post_log(status="Abgebrochen", color=discord.Color.red())
-            return
+            title="⚠️ Fehler",
+            description="Admin-Rolle nicht gefunden.",
+            color=discord.Color.orange()
+        ), ephemeral=True)
+        log_collector.add_event("Fehler: Admin-Rolle nicht gefunden", "ERROR")
+        await log_collector.post_log(status="Abgebrochen", color=discord.Color.red())
+        return
 
+    retry_after = rate_limits.hit("team_notify", scope_id=channel_id)
+    if retry_after:
+        minutes = int(retry_after // 60) + 1
         await interaction.response.send_message(embed=discord.Embed(
-            title="🔒 Ticket wird geschlossen",
-            description="Der Kanal wird in Kürze gelöscht...",
-            color=discord.Color.blue()
+            title="🚫 Cooldown",
+            description=f"Das Team kann erst in {minutes} Minute(n) erneut benachrichtigt werden.",
+            color=discord.Color.red()
         ), ephemeral=True)
-        log_collector.add_event(f"Ticket für {interaction.channel.topic.split('|')[0].strip()} geschlossen")
-        await asyncio.sleep(2)
-        await interaction.channel.delete()
-        await log_collector.post_log()
+        log_collector.add_event(f"Cooldown: {minutes} Minuten verbleibend", "WARNING")
+        await log_collector.post_log(status="Abgebrochen", color=discord.Color.red())
+        return
+
+    await interaction.response.send_message(embed=discord.Embed(
+        title="📢 Team benachrichtigt",
+        description=f"{admin_role.mention} - Bitte beachtet diese Bewerbung!",
+        color=discord.Color.blue()
+    ))
+    log_collector.add_event("Team benachrichtigt")
+    await log_collector.post_log()
+
+async def close_ticket(interaction: discord.Interaction, channel_id: int):
+    log_collector = LogCollector(interaction.guild, "Ticket-Schließung", interaction.user, interaction.channel)
+    log_collector.add_event("Ticket-Schließung gestartet")
+
+    if not is_admin(interaction.user):
+        await refuse_unauthorized(interaction, log_collector, "Du hast keine Berechtigung.")
+        return
+
+    channel = interaction.guild.get_channel(channel_id) or interaction.channel
+    await interaction.response.send_message(embed=discord.Embed(
+        title="🔒 Ticket wird geschlossen",
+        description="Das Transkript wird archiviert, danach wird der Kanal gelöscht...",
+        color=discord.Color.blue()
+    ), ephemeral=True)
+    if not await archive_and_delete(channel, log_collector, "Geschlossen"):
+        await log_collector.post_log(status="Fehler", color=discord.Color.orange())
+        return
+    log_collector.add_event(f"Ticket für {(channel.topic or channel.name).split('|')[0].strip()} geschlossen")
+    await log_collector.post_log()
+
+async def open_feedback(interaction: discord.Interaction, channel_id: int):
+    retry_after = rate_limits.hit("feedback", interaction)
+    if retry_after:
+        await interaction.response.send_message(embed=cooldown_embed(retry_after), ephemeral=True)
+        return
+    await interaction.response.send_modal(FeedbackModal())
+
+TICKET_ACTIONS = {
+    "accept": (("✅ Annehmen", discord.ButtonStyle.green, None), accept_application),
+    "deny": (("❌ Ablehnen", discord.ButtonStyle.red, None), deny_application),
+    "notify": (("Team benachrichtigen", discord.ButtonStyle.primary, "📢"), notify_team),
+    "close": (("🔒 Ticket schließen", discord.ButtonStyle.red, None), close_ticket),
+    "feedback": (("📝 Feedback geben", discord.ButtonStyle.primary, None), open_feedback)
+}
+
+class TicketButton(discord.ui.DynamicItem[discord.ui.Button], template=r"ticket:(?P<action>accept|deny|notify|close|feedback):(?P<channel_id>\d+)"):
+    """
+    A button of an application ticket whose custom id carries the action and the ticket channel id.
+    One registration serves the buttons of every ticket, also after a restart; the application is loaded
+    from the database on click, so no view or state is held in memory per open ticket.
+    """
+
+    def __init__(self, action: str, channel_id: int):
+        (label, style, emoji), _ = TICKET_ACTIONS[action]
+        super().__init__(discord.ui.Button(label=label, style=style, emoji=emoji, custom_id=f"ticket:{action}:{channel_id}"))
+        self.action = action
+        self.channel_id = channel_id
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls(match["action"], int(match["channel_id"]))
+
+    async def callback(self, interaction: discord.Interaction):
+        _, handler = TICKET_ACTIONS[self.action]
+        await handler(interaction, self.channel_id)
+
+def ticket_view(channel_id: int, *actions: str) -> discord.ui.View:
+    view = discord.ui.View(timeout=None)
+    for action in actions:
+        view.add_item(TicketButton(action, channel_id))
+    return view
+
+class LegacyTicketView(discord.ui.View):
+    """
+    Static custom ids of ticket buttons posted before they carried the channel id.
+    They are only ever clicked in their ticket channel, so the channel of the interaction identifies the application.
+    """
+
+    LEGACY_IDS = {
+        "accept": "accept_button",
+        "deny": "deny_button",
+        "notify": "notify_team",
+        "close": "close_ticket",
+        "feedback": "feedback_button"
+    }
 
-class FeedbackButtonView(discord.ui.View):
     def __init__(self):
         super().__init__(timeout=None)
+        for action, custom_id in self.LEGACY_IDS.items():
+            (label, style, emoji), handler = TICKET_ACTIONS[action]
+            button = discord.ui.Button(label=label, style=style, emoji=emoji, custom_id=custom_id)
+            button.callback = functools.partial(self._dispatch, handler)
+            self.add_item(button)
 
-    @discord.ui.button(label="📝 Feedback geben", style=discord.ButtonStyle.primary, custom_id="feedback_button")
-    async def feedback_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        await interaction.response.send_modal(FeedbackModal())
+    @staticmethod
+    async def _dispatch(handler, interaction: discord.Interaction):
+        await handler(interaction, interaction.channel.id)
 
 class FeedbackModal(discord.ui.Modal):
     def __init__(self):
@@ -588,22 +918,416 @@ class FeedbackModal(discord.ui.Modal):
         await log_collector.post_log()
 
 class ApplicationCog(commands.Cog):
+    """
+    Runs the application questionnaire as a persisted state machine.
+    Each ticket channel has a session (step, answers, deadline) stored in application_sessions; a single
+    on_message listener advances it and one shared scheduler closes tickets whose answer deadline passed.
+    Sessions still in the questionnaire are resumed after a restart. Open tickets get reminder timers
+    every REMINDER_HOURS up to REMINDER_STEPS, with the step reached stored alongside the session.
+    """
+
     def __init__(self, bot):
         self.bot = bot
-        self.check_open_applications.start()
+        self.sessions = {}  # Laufende Fragebögen: {channel_id: session}
+        self._collectors = {}  # {channel_id: LogCollector}
+        self._locks = {}  # {channel_id: asyncio.Lock}
+        self.deadlines = DeadlineScheduler(self._on_deadline, name="oluja-application-deadlines")
+        self.reminders = DeadlineScheduler(self._on_reminder, name="oluja-application-reminders")
+        self._due_reminders = {}  # Fällige Erinnerungen bis zum gesammelten Posten: {guild_id: [channel_id]}
+        self._reminder_batches = {}  # {guild_id: asyncio.Task}
+        self._resumed = False
+        metrics.gauge("oluja_application_sessions", "Applications currently in the questionnaire", lambda: len(self.sessions))
+        metrics.gauge("oluja_reminder_timers", "Open tickets with a pending reminder", lambda: len(self.reminders))
+
+    async def cog_unload(self):
+        self.deadlines.stop()
+        self.reminders.stop()
+        for task in self._reminder_batches.values():
+            task.cancel()
+        await db.writer.flush()
+
+    async def _save(self, session):
+        ticket_index.update(session["channel_id"], session["guild_id"], session["applicant_id"], session["state"], session["created_at"], session["reminder_step"])
+        self._schedule_reminder(session["channel_id"])
+        # Ein Fehler kostet nur die Wiederaufnahme nach einem Neustart, nicht die laufende Bewerbung
+        try:
+            await db.save_application_session(session)
+        except DatabaseError as e:
+            logger.error(f"Application state for channel {session['channel_id']} could not be saved: {e}")
+
+    def _forget(self, channel_id):
+        self.deadlines.cancel(channel_id)
+        self.reminders.cancel(channel_id)
+        self.sessions.pop(channel_id, None)
+        self._locks.pop(channel_id, None)
+        return self._collectors.pop(channel_id, None)
+
+    async def _discard_session(self, channel_id):
+        self._forget(channel_id)
+        ticket_index.remove(channel_id)
+        try:
+            await db.delete_application_session(channel_id)
+        except DatabaseError as e:
+            logger.error(f"Application state for channel {channel_id} could not be deleted: {e}")
+
+    def _set_deadline(self, session):
+        session["deadline"] = datetime.utcnow() + timedelta(seconds=ANSWER_TIMEOUT)
+        self.deadlines.schedule(session["channel_id"], session["deadline"])
+
+    def new_session(self, channel, user, apply_type):
+        return {
+            "channel_id": channel.id,
+            "guild_id": channel.guild.id,
+            "applicant_id": user.id,
+            "applicant_name": user.name,
+            "apply_type": apply_type,
+            "state": "questions",
+            "step": 0,
+            "attempts": 0,
+            "answers": [],
+            "question_message_id": None,
+            "deadline": None,
+            "reminder_step": 0,
+            "created_at": datetime.utcnow()
+        }
+
+    async def start_session(self, channel, user, apply_type, log_collector):
+        """Start the questionnaire in a new ticket channel."""
+        session = self.new_session(channel, user, apply_type)
+        self.sessions[channel.id] = session
+        self._collectors[channel.id] = log_collector
+        await self._ask(channel, session)
+
+    async def _ask(self, channel, session):
+        questions = config.APPLICATION_QUESTIONS[session["apply_type"]]
+        idx = session["step"]
+        percent = int((idx+1)/len(questions)*100)
+        q_embed = discord.Embed(
+            title=f"Frage {idx+1}/{len(questions)}",
+            description=(
+                f"{questions[idx]}\n\n"
+                f"**Fortschritt:** [{animated_progress_bar(percent)}] {percent}%\n"
+                f"⏰ Du hast 5 Minuten, um zu antworten."
+            ),
+            color=discord.Color.blue()
+        )
+        q_embed.set_footer(text="Antworte direkt hier im Kanal.")
+        q_msg = await channel.send(embed=q_embed)
+        session["question_message_id"] = q_msg.id
+        self._set_deadline(session)
+        await self._save(session)
+
+    async def _delete_question(self, channel, session):
+        if session["question_message_id"]:
+            try:
+                await channel.get_partial_message(session["question_message_id"]).delete()
+            except discord.NotFound:
+                pass
+            session["question_message_id"] = None
+
+    @commands.Cog.listener()
+    async def on_message(self, message):
+        session = self.sessions.get(message.channel.id)
+        if session is None or message.author.id != session["applicant_id"]:
+            return
+        async with self._locks.setdefault(message.channel.id, asyncio.Lock()):
+            # Die Sitzung kann beendet worden sein, während auf die vorige Antwort gewartet wurde
+            if self.sessions.get(message.channel.id) is not session:
+                return
+            try:
+                await self._handle_answer(message, session)
+            except Exception as e:
+                log_collector = self._collectors.get(message.channel.id) or LogCollector(message.guild, "Bewerbungsprozess", message.author, message.channel)
+                await self._handle_error(message.channel, message.author, log_collector, str(e))
+
+    async def _handle_answer(self, message, session):
+        channel = message.channel
+        log_collector = self._collectors[channel.id]
+        questions = config.APPLICATION_QUESTIONS[session["apply_type"]]
+        idx = session["step"]
+
+        if idx == 0 and "Spieler-Tag" in questions[idx]:
+            if not await check_player_tag(message.content, log_collector):
+                session["attempts"] += 1
+                if session["attempts"] >= MAX_TAG_ATTEMPTS:
+                    await self._handle_invalid_tag(channel, message.author, log_collector, MAX_TAG_ATTEMPTS)
+                    return
+                await self._handle_invalid_tag_attempt(channel, message.author, log_collector, session["attempts"] - 1, MAX_TAG_ATTEMPTS)
+                await message.delete()
+                self._set_deadline(session)
+                await self._save(session)
+                return
+            log_collector.add_event(f"Spieler-Tag akzeptiert: {message.content}")
+        else:
+            log_collector.add_event(f"Antwort auf Frage {idx+1}: {message.content}")
+
+        session["answers"].append(message.content)
+        session["step"] += 1
+        await self._delete_question(channel, session)
+        await message.delete()
+        if session["step"] < len(questions):
+            await self._ask(channel, session)
+        else:
+            await self._finish(channel, message.author, session)
+
+    async def _finish(self, channel, user, session):
+        await self.open_review(channel, user, session, self._forget(channel.id))
+
+    async def open_review(self, channel, user, session, log_collector, content=""):
+        """Post the summary with the accept/deny buttons and hand the application to the team."""
+        session["state"] = "review"
+        session["deadline"] = None
+        await self._save(session)
+
+        questions = config.APPLICATION_QUESTIONS[session["apply_type"]]
+        answers = session["answers"]
+        summary_embed = discord.Embed(
+            title="📄 Deine Bewerbungszusammenfassung",
+            description=(
+                f"**{user.mention}, hier ist deine Bewerbung:**\n\n"
+                f"**Bewerbungsart:** {session['apply_type']}\n"
+                "Das Team wird deine Bewerbung bald prüfen. Danke für deine Geduld! 🙏"
+            ),
+            color=discord.Color.green()
+        )
+        summary_embed.set_thumbnail(url=user.display_avatar.url)
+        for i, q in enumerate(questions):
+            summary_embed.add_field(name=f"Frage {i+1}", value=f"**Antwort:** {answers[i]}", inline=False)
+        summary_embed.set_footer(text="Operation-Oluja | Danke für deine Bewerbung!", icon_url="https://cdn.discordapp.com/attachments/1128712101349038160/1226579502036989992/oluja_logo.png")
+
+        await channel.send(content=content, embed=summary_embed, view=ticket_view(channel.id, "accept", "deny", "notify"))
+        log_collector.add_event("Bewerbungszusammenfassung gesendet")
+        log_collector.add_event("Bewerbung erfolgreich erstellt")
+        await log_collector.post_log(status="Erstellt")
 
-    def cog_unload(self):
-        self.check_open_applications.cancel()
+    async def _on_deadline(self, channel_id):
+        session = self.sessions.get(channel_id)
+        if session is None:
+            return
+        async with self._locks.setdefault(channel_id, asyncio.Lock()):
+            # Eine Antwort kann die Frist verlängert haben, während auf das Lock gewartet wurde
+            if self.sessions.get(channel_id) is not session or session["deadline"] > datetime.utcnow():
+                return
+            channel = self.bot.get_channel(channel_id)
+            if channel is None:
+                await self._discard_session(channel_id)
+                return
+            user = channel.guild.get_member(session["applicant_id"])
+            await self._handle_timeout(channel, user, self._collectors[channel_id])
+
+    async def _handle_invalid_tag(self, channel, user, log_collector, max_attempts):
+        error_embed = discord.Embed(
+            title="⚠️ Ungültiger Spieler-Tag",
+            description=(
+                "Du hast keine weiteren Versuche.\n"
+                "Ein korrekter Spieler-Tag beginnt mit #, gefolgt von 8-10 alphanumerischen Zeichen (z.B. #LJC8V0GCJ).\n"
+                "Der Kanal wird geschlossen."
+            ),
+            color=discord.Color.red()
+        )
+        await channel.send(embed=error_embed)
+        log_collector.add_event(f"Ungültiger Spieler-Tag nach {max_attempts} Versuchen", "WARNING")
+        await self._send_dm_and_close(user, channel, log_collector, "Ungültiger Spieler-Tag")
+
+    async def _handle_invalid_tag_attempt(self, channel, user, log_collector, attempt, max_attempts):
+        error_embed = discord.Embed(
+            title="⚠️ Ungültiger Spieler-Tag",
+            description=(
+                f"Bitte gib einen korrekten Tag im Format `#LJC8V0GCJ` ein.\n"
+                f"**Versuch {attempt + 2}/{max_attempts}**\n"
+                "Ein korrekter Spieler-Tag beginnt mit #, gefolgt von 8-10 alphanumerischen Zeichen."
+            ),
+            color=discord.Color.orange()
+        )
+        await channel.send(embed=error_embed)
+        log_collector.add_event(f"Ungültiger Spieler-Tag, Versuch {attempt + 2}/{max_attempts}", "WARNING")
+
+    async def _handle_timeout(self, channel, user, log_collector):
+        timeout_embed = discord.Embed(
+            title="⏰ Zeit abgelaufen",
+            description="Du hast zu lange gebraucht, um die Fragen zu beantworten. Bitte starte die Bewerbung erneut.",
+            color=discord.Color.red()
+        )
+        await channel.send(embed=timeout_embed)
+        log_collector.add_event("Timeout bei der Antwort", "WARNING")
+        await self._send_dm_and_close(user, channel, log_collector, "Timeout")
+
+    async def _handle_error(self, channel, user, log_collector, error):
+        error_embed = discord.Embed(
+            title="❌ Ein Fehler ist aufgetreten",
+            description=f"Fehler: {error}\nBitte wende dich an das Team.",
+            color=discord.Color.red()
+        )
+        await channel.send(embed=error_embed)
+        log_collector.add_event(f"Fehler: {error}", "ERROR")
+        await self._send_dm_and_close(user, channel, log_collector, "Fehler")
+
+    async def _send_dm_and_close(self, user, channel, log_collector, reason):
+        dm_embed = discord.Embed(
+            title="❌ Dein Ticket wurde geschlossen",
+            description=(
+                f"Deine Bewerbung wurde abgebrochen, weil {reason.lower()} aufgetreten ist.\n"
+                "Bitte starte die Bewerbung erneut oder kontaktiere das Team für Unterstützung."
+            ),
+            color=discord.Color.red()
+        )
+        dm_embed.set_footer(text="Operation-Oluja")
+        if user is None:
+            log_collector.add_event("DM nicht gesendet: Bewerber nicht mehr auf dem Server", "WARNING")
+        else:
+            try:
+                await user.send(embed=dm_embed)
+                log_collector.add_event(f"DM gesendet: {reason}")
+            except discord.Forbidden:
+                log_collector.add_event("DM konnte nicht gesendet werden", "WARNING")
+        # Mit den bisherigen Antworten archivieren, damit sie im Transkript landen
+        if await archive_and_delete(channel, log_collector, reason, self.sessions.get(channel.id)):
+            await self._discard_session(channel.id)
+        else:
+            # Kanal bleibt zum manuellen Schließen bestehen, das Ticket bleibt bis dahin im Index;
+            # aufgeräumt wird dann in on_guild_channel_delete
+            self._forget(channel.id)
+        await log_collector.post_log(status="Abgebrochen", color=discord.Color.red())
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        # on_ready kommt nach jedem Reconnect erneut, fortgesetzt wird nur einmal
+        if self._resumed:
+            return
+        self._resumed = True
+        try:
+            sessions = await self.rebuild_ticket_index()
+        except DatabaseError as e:
+            logger.error(f"Application sessions could not be loaded: {e}")
+            return
+        await self.resume_sessions([session for session in sessions if session["state"] == "questions"])
+
+    async def rebuild_ticket_index(self):
+        """
+        Load the persisted tickets into the ticket index, drop those whose channel is gone and adopt
+        ticket channels without a stored session by the applicant id in their topic. Returns the live sessions.
+        Tickets of guilds that are unavailable (outage, not yet loaded) stay indexed and stored, but are not resumed.
+        """
+        ticket_index.clear()
+        live = []
+        for session in await db.get_application_sessions():
+            guild = self.bot.get_guild(session["guild_id"])
+            if guild is None or guild.unavailable:
+                # Ob der Kanal noch existiert, lässt sich erst sagen, wenn der Server wieder verfügbar ist
+                ticket_index.update(session["channel_id"], session["guild_id"], session["applicant_id"], session["state"], session["created_at"], session["reminder_step"])
+                continue
+            if guild.get_channel(session["channel_id"]) is None:
+                await self._discard_session(session["channel_id"])
+                continue
+            ticket_index.update(session["channel_id"], session["guild_id"], session["applicant_id"], session["state"], session["created_at"], session["reminder_step"])
+            self._schedule_reminder(session["channel_id"])
+            live.append(session)
+
+        adopted = 0
+        for guild in self.bot.guilds:
+            for channel in guild.text_channels:
+                if channel.id in ticket_index:
+                    continue
+                applicant_id = applicant_from_topic(channel)
+                if applicant_id is None:
+                    continue
+                session = {
+                    "channel_id": channel.id,
+                    "guild_id": guild.id,
+                    "applicant_id": applicant_id,
+                    "applicant_name": channel.topic.split("|")[0].replace("Bewerbung von", "").strip(),
+                    "apply_type": "Unbekannt",
+                    "state": state_from_name(channel),
+                    "step": 0,
+                    "attempts": 0,
+                    "answers": [],
+                    "question_message_id": None,
+                    "deadline": None,
+                    "reminder_step": 0,
+                    "created_at": channel.created_at.replace(tzinfo=None)
+                }
+                await self._save(session)
+                adopted += 1
+        logger.info(f"Ticket index rebuilt: {len(ticket_index)} tickets, {adopted} adopted from channel topics")
+        return live
+
+    async def resume_sessions(self, sessions):
+        """Continue persisted questionnaires by asking their current question again with a fresh deadline."""
+        for session in sessions:
+            channel = self.bot.get_channel(session["channel_id"])
+            if channel is None:
+                continue
+            applicant = channel.guild.get_member(session["applicant_id"])
+            log_collector = LogCollector(channel.guild, "Bewerbungsprozess", applicant, channel)
+            self.sessions[channel.id] = session
+            self._collectors[channel.id] = log_collector
+            if applicant is None:
+                log_collector.add_event("Bewerber hat den Server verlassen", "WARNING")
+                try:
+                    await self._send_dm_and_close(None, channel, log_collector, "Bewerber nicht mehr auf dem Server")
+                except discord.HTTPException as e:
+                    logger.error(f"Application in channel {channel.id} could not be closed: {e}")
+                continue
+            log_collector.add_event(f"Bewerbung nach Neustart bei Frage {session['step'] + 1} fortgesetzt")
+            # Frist zuerst setzen, damit das Ticket auch dann per Timeout geschlossen wird, wenn das Senden fehlschlägt
+            self._set_deadline(session)
+            try:
+                await self._delete_question(channel, session)
+                await channel.send(embed=discord.Embed(
+                    title="🔄 Bewerbung fortgesetzt",
+                    description="Der Bot wurde neu gestartet. Bitte beantworte die folgende Frage (erneut).",
+                    color=discord.Color.blue()
+                ))
+                await self._ask(channel, session)
+            except discord.HTTPException as e:
+                log_collector.add_event(f"Fortsetzen fehlgeschlagen, Ticket schließt mit Ablauf der Frist: {e}", "ERROR")
+                logger.error(f"Application in channel {channel.id} could not be resumed: {e}")
+        logger.info(f"{len(sessions)} application(s) resumed")
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel):
+        if channel.id in ticket_index:
+            await self._discard_session(channel.id)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before, after):
+        ticket = ticket_index.get(after.id)
+        if ticket is None or before.name == after.name:
+            return
+        state = state_from_name(after)
+        if state == "accepted" and ticket["state"] != "accepted":
+            ticket_index.set_state(after.id, state)
+            try:
+                await db.set_application_state(after.id, state)
+            except DatabaseError as e:
+                logger.error(f"Ticket state for channel {after.id} could not be saved: {e}")
 
     @app_commands.command(name="bewerberexport", description="Exportiere angenommene Bewerber als CSV")
     @app_commands.checks.has_permissions(administrator=True)
     async def bewerberexport(self, interaction: discord.Interaction):
         log_collector = LogCollector(interaction.guild, "Bewerber-Export", interaction.user, interaction.channel)
         log_collector.add_event("Export angefordert")
+        await interaction.response.defer(ephemeral=True)
+
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerow(["Applicant Name", "Applicant ID", "Apply Type", "Spieler Tag", "Strategien", "TH Level", "Status", "Handled By"])
+        count = 0
+        async for app in db.iter_applications(status="Angenommen"):
+            writer.writerow([
+                app["applicant_name"],
+                app["applicant_id"],
+                app["apply_type"],
+                app["spieler_tag"],
+                app["strategien"],
+                app["th_level"],
+                app["status"],
+                app["handled_by"]
+            ])
+            count += 1
 
-        applications = db.get_applications(status="Angenommen")
-        if not applications:
-            await interaction.response.send_message(embed=discord.Embed(
+        if not count:
+            await interaction.followup.send(embed=discord.Embed(
                 title="⚠️ Keine Daten",
                 description="Keine angenommenen Bewerbungen gefunden.",
                 color=discord.Color.orange()
@@ -612,63 +1336,126 @@ class ApplicationCog(commands.Cog):
             await log_collector.post_log(status="Abgebrochen", color=discord.Color.orange())
             return
 
-        output = io.StringIO()
-        writer = csv.writer(output)
-        writer.writerow(["Applicant Name", "Applicant ID", "Apply Type", "Spieler Tag", "Strategien", "TH Level", "Status", "Handled By"])
-        for app in applications:
-            writer.writerow([
-                app.applicant_name,
-                app.applicant_id,
-                app.apply_type,
-                app.spieler_tag,
-                app.strategien,
-                app.th_level,
-                app.status,
-                app.handled_by
-            ])
-
-        await interaction.response.send_message(
+        await interaction.followup.send(
             embed=discord.Embed(
                 title="✅ Export erfolgreich",
                 description="Angenommene Bewerbungen wurden als CSV exportiert.",
                 color=discord.Color.green()
             ),
-            file=discord.File(fp=io.StringIO(output.getvalue()), filename="bewerbungen.csv"),
+            file=discord.File(fp=io.BytesIO(output.getvalue().encode("utf-8")), filename="bewerbungen.csv"),
             ephemeral=True
         )
-        log_collector.add_event("Export erfolgreich")
+        log_collector.add_event(f"Export erfolgreich: {count} Bewerbungen")
         await log_collector.post_log(status="Erfolgreich")
 
-    @tasks.loop(hours=6)
-    async def check_open_applications(self):
-        for guild in self.bot.guilds:
-            log_collector = LogCollector(guild, "Bewerbungserinnerung")
-            log_collector.add_event("Erinnerung gestartet")
-
-            admin_role = get_admin_role(guild)
-            log_channel = get_log_channel(guild)
-            if not admin_role or not log_channel:
-                log_collector.add_event("Fehler: Admin-Rolle oder Log-Kanal nicht gefunden", "ERROR")
-                await log_collector.post_log(status="Fehler", color=discord.Color.red())
+    @app_commands.command(name="transkripte", description="Zeigt die archivierten Tickets eines Bewerbers")
+    @app_commands.describe(bewerber="Bewerber, dessen Tickets angezeigt werden")
+    @app_commands.checks.has_permissions(administrator=True)
+    async def transkripte(self, interaction: discord.Interaction, bewerber: discord.User):
+        log_collector = LogCollector(interaction.guild, "Transkript-Abfrage", interaction.user, interaction.channel)
+        log_collector.add_event(f"Transkripte von {bewerber.name} angefordert")
+        await interaction.response.defer(ephemeral=True)
+
+        transcripts = await db.get_transcripts(interaction.guild.id, bewerber.id)
+        if not transcripts:
+            await interaction.followup.send(embed=discord.Embed(
+                title="⚠️ Keine Daten",
+                description=f"Für {bewerber.mention} wurden keine archivierten Tickets gefunden.",
+                color=discord.Color.orange()
+            ), ephemeral=True)
+            log_collector.add_event("Keine Transkripte gefunden")
+            await log_collector.post_log(status="Abgebrochen", color=discord.Color.orange())
+            return
+
+        embed = discord.Embed(
+            title=f"🗄️ Archivierte Tickets von {bewerber.name}",
+            description="\n".join(
+                f"[{t['created_at'].strftime('%d.%m.%Y %H:%M')}]({t['archive_url']}) – {t['reason']}, {t['message_count']} Nachrichten"
+                for t in transcripts
+            ),
+            color=discord.Color.dark_grey()
+        )
+        embed.set_footer(text="Operation-Oluja")
+        await interaction.followup.send(embed=embed, ephemeral=True)
+        log_collector.add_event(f"{len(transcripts)} Transkripte angezeigt")
+        await log_collector.post_log(status="Erfolgreich")
+
+    def _schedule_reminder(self, channel_id):
+        """Set the timer for the next reminder step of an open ticket, if it has one left."""
+        ticket = ticket_index.get(channel_id)
+        if ticket is None or ticket["state"] not in OPEN_STATES or ticket["reminder_step"] >= config.REMINDER_STEPS:
+            self.reminders.cancel(channel_id)
+            return
+        due = ticket["created_at"] + timedelta(hours=config.REMINDER_HOURS * (ticket["reminder_step"] + 1))
+        self.reminders.schedule(channel_id, due)
+
+    async def _on_reminder(self, channel_id):
+        ticket = ticket_index.get(channel_id)
+        if ticket is None or ticket["state"] not in OPEN_STATES:
+            return
+        # Nach einem längeren Ausfall nur die höchste fällige Stufe melden, nicht alle verpassten nacheinander
+        hours_open = (datetime.utcnow() - ticket["created_at"]).total_seconds() / 3600
+        step = min(config.REMINDER_STEPS, int(hours_open // config.REMINDER_HOURS))
+        if step > ticket["reminder_step"]:
+            ticket_index.set_reminder_step(channel_id, step)
+            try:
+                await db.set_reminder_step(channel_id, step)
+            except DatabaseError as e:
+                logger.error(f"Reminder step for channel {channel_id} could not be saved: {e}")
+            guild_id = ticket["guild_id"]
+            self._due_reminders.setdefault(guild_id, []).append(channel_id)
+            if guild_id not in self._reminder_batches:
+                self._reminder_batches[guild_id] = asyncio.create_task(self._post_reminders(guild_id), name=f"oluja-reminders-{guild_id}")
+        self._schedule_reminder(channel_id)
+
+    async def _post_reminders(self, guild_id):
+        """Post all reminders that became due in a guild within REMINDER_BATCH_WINDOW as one embed."""
+        await asyncio.sleep(REMINDER_BATCH_WINDOW)
+        self._reminder_batches.pop(guild_id, None)
+        channel_ids = self._due_reminders.pop(guild_id, [])
+        guild = self.bot.get_guild(guild_id)
+        if guild is None:
+            return
+        log_collector = LogCollector(guild, "Bewerbungserinnerung")
+        log_collector.add_event("Erinnerung gestartet")
+
+        admin_role = get_admin_role(guild)
+        log_channel = get_log_channel(guild)
+        if not admin_role or not log_channel:
+            log_collector.add_event("Fehler: Admin-Rolle oder Log-Kanal nicht gefunden", "ERROR")
+            await log_collector.post_log(status="Fehler", color=discord.Color.red())
+            return
+
+        lines = []
+        highest = 0
+        for channel_id in channel_ids:
+            ticket = ticket_index.get(channel_id)
+            channel = guild.get_channel(channel_id)
+            if ticket is None or channel is None or ticket["state"] not in OPEN_STATES:
                 continue
+            hours_open = int((datetime.utcnow() - ticket["created_at"]).total_seconds() // 3600)
+            lines.append(f"🔸 {channel.mention} – seit {hours_open} Stunden offen (Stufe {ticket['reminder_step']}/{config.REMINDER_STEPS})")
+            highest = max(highest, ticket["reminder_step"])
+            log_collector.add_event(f"Erinnerung für {channel.name} (Stufe {ticket['reminder_step']})")
+        if not lines:
+            return
 
-            for channel in guild.text_channels:
-                if channel.name.startswith("bewerbung-"):
-                    created_at = channel.created_at.replace(tzinfo=None)
-                    if (datetime.utcnow() - created_at).total_seconds() > config.REMINDER_HOURS * 3600:
-                        await log_channel.send(embed=discord.Embed(
-                            title="⏰ Offene Bewerbung",
-                            description=f"{admin_role.mention} ⚠️ Die Bewerbung in {channel.mention} ist seit über {config.REMINDER_HOURS} Stunden offen!",
-                            color=discord.Color.orange()
-                        ))
-                        log_collector.add_event(f"Erinnerung für {channel.name} gesendet")
-            await log_collector.post_log()
-
-    @check_open_applications.before_loop
-    async def before_check(self):
-        await self.bot.wait_until_ready()
+        description = f"{admin_role.mention} ⚠️ {'Diese Bewerbung wartet' if len(lines) == 1 else 'Diese Bewerbungen warten'} auf eine Entscheidung:\n" + "\n".join(lines)
+        if len(description) > 4096:
+            description = description[:4090] + "\n…"
+        final = highest >= config.REMINDER_STEPS
+        embed = discord.Embed(
+            title="⏰ Offene Bewerbung" if len(lines) == 1 else f"⏰ {len(lines)} offene Bewerbungen",
+            description=description,
+            color=discord.Color.red() if final else discord.Color.orange()
+        )
+        # Erst die letzte Stufe pingt das Team, die Erwähnung im Embed benachrichtigt nicht
+        await log_channel.send(content=admin_role.mention if final else None, embed=embed)
+        await log_collector.post_log()
 
 async def setup(bot):
     bot.add_view(ApplicationDropdownView())
     bot.add_view(FAQView())
+    bot.add_view(LegacyTicketView())
+    bot.add_dynamic_items(TicketButton)
     await bot.add_cog(ApplicationCog(bot))
\ No newline at end of file
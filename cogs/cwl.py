@@ -2,17 +2,19 @@ import discord
 from discord.ext import commands, tasks
 from discord import app_commands
 from utils.logging import LogCollector
-from utils.database import db  # MySQL database integration
+from utils.database import db
+from utils.metrics import metrics
+from utils.rate_limits import cooldown_embed, rate_limits
 from datetime import datetime
 import asyncio
 import logging
-import mysql.connector
 
 class CWLCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.active_polls = {}  # Speichert aktive Umfragen: {message_id: {'channel': channel, 'duration': duration, 'responses': {}, 'start_time': datetime, 'poll_id': message_id}}
         self.had_active_polls = False  # Zustandsvariable zur Verfolgung vorheriger Aktivität
+        metrics.gauge("oluja_cwl_active_polls", "Active CWL polls held in memory", lambda: len(self.active_polls))
         logging.info("CWLCog initialisiert")
         self.save_poll_progress.start()  # Starte die Zwischenspeicherung
 
@@ -35,55 +37,25 @@ class CWLCog(commands.Cog):
 
         if has_active_polls:
             logging.info(f"Aktive Umfragen: {list(self.active_polls.keys())}")
+            snapshots = []
             for message_id, poll_data in list(self.active_polls.items()):
                 responses = poll_data.get('responses', {})
-                yes_count = sum(1 for r in responses.values() if r == "✅")
-                no_count = sum(1 for r in responses.values() if r == "❌")
-                logging.info(f"Verarbeitung Umfrage {message_id}: Ja={yes_count}, Nein={no_count}")
-                try:
-                    db.add_cwl_poll(
-                        poll_id=poll_data['poll_id'],
-                        channel_id=poll_data['channel'].id,
-                        channel_name=poll_data['channel'].name,
-                        duration=poll_data['duration'],
-                        yes_count=yes_count,
-                        no_count=no_count
-                    )
-                    logging.info(f"Zwischenspeicherung für Umfrage {message_id} erfolgreich: Ja={yes_count}, Nein={no_count}")
-                except Exception as e:
-                    logging.error(f"Fehler beim Zwischenspeichern der Umfrage {message_id}: {e}")
-                    # Versuche, die Verbindung neu zu starten, falls sie fehlschlägt
-                    try:
-                        self._reconnect_database()
-                        db.add_cwl_poll(
-                            poll_id=poll_data['poll_id'],
-                            channel_id=poll_data['channel'].id,
-                            channel_name=poll_data['channel'].name,
-                            duration=poll_data['duration'],
-                            yes_count=yes_count,
-                            no_count=no_count
-                        )
-                        logging.info(f"Erneute Zwischenspeicherung für Umfrage {message_id} erfolgreich nach Reconnect")
-                    except Exception as e2:
-                        logging.error(f"Reconnect und erneutes Speichern fehlgeschlagen für Umfrage {message_id}: {e2}")
+                snapshots.append({
+                    'poll_id': poll_data['poll_id'],
+                    'channel_id': poll_data['channel'].id,
+                    'channel_name': poll_data['channel'].name,
+                    'duration': poll_data['duration'],
+                    'yes_count': sum(1 for r in responses.values() if r == "✅"),
+                    'no_count': sum(1 for r in responses.values() if r == "❌")
+                })
+            try:
+                # Reconnect, retry und Zwischenspeicherung bei Ausfällen übernimmt die Datenbank selbst
+                await db.save_cwl_polls(snapshots)
+                logging.info(f"Zwischenspeicherung für {len(snapshots)} Umfrage(n) erfolgreich")
+            except Exception as e:
+                logging.error(f"Fehler beim Zwischenspeichern der Umfragen: {e}")
         self.had_active_polls = has_active_polls
 
-    def _reconnect_database(self):
-        """Versuche, die Datenbankverbindung neu herzustellen."""
-        try:
-            db.conn.close()
-            db.conn = mysql.connector.connect(
-                host="db2.sillydevelopment.co.uk",
-                port=3306,
-                user="u52481_uuC019WM8H",
-                password="YOUR_PASSWORD_HERE",  # Ersetze mit deinem Passwort
-                database="s52481_Oluja_DATA"
-            )
-            db.cursor = db.conn.cursor()
-            logging.info("Datenbankverbindung erfolgreich neu hergestellt")
-        except Exception as e:
-            logging.error(f"Fehler beim erneuten Verbinden zur Datenbank: {e}")
-
     @save_poll_progress.before_loop
     async def before_save_poll_progress(self):
         """Warte, bis der Bot bereit ist, bevor die Zwischenspeicherung startet."""
@@ -105,6 +77,12 @@ class CWLCog(commands.Cog):
             log_collector.add_event("Ungültige Dauer", "WARNING")
             await log_collector.post_log(status="Abgebrochen", color=discord.Color.red())
             return
+        retry_after = rate_limits.hit("cwl_req", interaction)
+        if retry_after:
+            await interaction.followup.send(embed=cooldown_embed(retry_after), ephemeral=True)
+            log_collector.add_event("Zu viele Umfragen gestartet", "WARNING")
+            await log_collector.post_log(status="Abgebrochen", color=discord.Color.red())
+            return
 
         target_channel = channel or interaction.channel
         poll_embed = discord.Embed(
@@ -191,7 +169,7 @@ class CWLCog(commands.Cog):
                 await log_collector.post_log()
 
         try:
-            db.add_cwl_poll(
+            await db.add_cwl_poll(
                 poll_id=poll_id,
                 channel_id=channel.id,
                 channel_name=channel.name,
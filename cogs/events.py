@@ -1,6 +1,7 @@
 import discord
 from discord.ext import commands
 from utils.helpers import get_log_channel
+from utils.guild_resolver import resolver
 from utils.logging import LogCollector
 from utils.database import db  # Import der Datenbank
 from datetime import datetime
@@ -9,6 +10,9 @@ class EventsCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
+    async def cog_unload(self):
+        await db.writer.flush()
+
     @commands.Cog.listener()
     async def on_ready(self):
         print(f"Eingeloggt als {self.bot.user} (ID: {self.bot.user.id})")
@@ -16,6 +20,34 @@ class EventsCog(commands.Cog):
         log_collector.add_event("Bot gestartet")
         await log_collector.post_log()
 
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel):
+        resolver.channel_created(channel)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before, after):
+        resolver.channel_updated(after)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel):
+        resolver.channel_deleted(channel)
+
+    @commands.Cog.listener()
+    async def on_guild_role_create(self, role):
+        resolver.role_created(role)
+
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before, after):
+        resolver.role_updated(after)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role):
+        resolver.role_deleted(role)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild):
+        resolver.forget_guild(guild.id)
+
     @commands.Cog.listener()
     async def on_member_join(self, member):
         guild = member.guild
@@ -34,10 +66,11 @@ class EventsCog(commands.Cog):
             await log_channel.send(embed=welcome_embed)
             log_collector.add_event("Willkommensnachricht gesendet")
 
-        db.add_member_event(
+        await db.add_member_event(
             user_id=member.id,
             user_name=member.name,
-            event_type="Join"
+            event_type="Join",
+            guild_id=guild.id
         )
 
         await log_collector.post_log()
@@ -48,10 +81,11 @@ class EventsCog(commands.Cog):
         log_collector = LogCollector(guild, "Mitglied Austritt", member)
         log_collector.add_event("Mitglied verlassen")
 
-        db.add_member_event(
+        await db.add_member_event(
             user_id=member.id,
             user_name=member.name,
-            event_type="Leave"
+            event_type="Leave",
+            guild_id=guild.id
         )
 
         await log_collector.post_log()
@@ -2,6 +2,7 @@ import discord
 from discord.ext import commands
 import config
 import asyncio
+from utils.rate_limits import rate_limits
 
 class FeedbackCog(commands.Cog):
     def __init__(self, bot):
@@ -12,6 +13,9 @@ class FeedbackCog(commands.Cog):
         if message.author.bot:
             return
         if "wie lange dauert" in message.content.lower():
+            # Höchstens eine automatische Antwort pro Kanal und Zeitraum, statt bei jeder Nachricht zu antworten
+            if rate_limits.hit("auto_reply", message):
+                return
             await message.channel.send("⏳ Die Bearbeitung dauert in der Regel 1-3 Tage. Danke für deine Geduld!")
 
 async def setup(bot):
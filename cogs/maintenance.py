@@ -0,0 +1,27 @@
+from discord.ext import commands, tasks
+from utils.database import db
+import logging
+
+class MaintenanceCog(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        self.apply_retention.start()
+
+    def cog_unload(self):
+        self.apply_retention.cancel()
+
+    @tasks.loop(hours=24)
+    async def apply_retention(self):
+        """Archiviere und entferne alte Monate der Ereignistabellen und lege kommende Partitionen an."""
+        try:
+            archived = await db.run_retention()
+            logging.info(f"Aufbewahrungsrichtlinie angewendet, archivierte Zeilen: {archived}")
+        except Exception as e:
+            logging.error(f"Fehler beim Anwenden der Aufbewahrungsrichtlinie: {e}")
+
+    @apply_retention.before_loop
+    async def before_apply_retention(self):
+        await self.bot.wait_until_ready()
+
+async def setup(bot):
+    await bot.add_cog(MaintenanceCog(bot))
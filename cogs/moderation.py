@@ -11,6 +11,9 @@ class ModerationCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
+    async def cog_unload(self):
+        await db.writer.flush()
+
     def _is_admin(self, user: discord.Member):
         admin_role = get_admin_role(user.guild)
         return admin_role and admin_role in user.roles
@@ -46,7 +49,7 @@ class ModerationCog(commands.Cog):
         ), ephemeral=True)
         log_collector.add_event(f"{member.name} stumm geschaltet für {duration} Minuten. Grund: {reason}")
 
-        db.add_moderation_log(
+        await db.add_moderation_log(
             user_id=member.id,
             user_name=member.name,
             action_type="Mute",
@@ -59,7 +62,7 @@ class ModerationCog(commands.Cog):
         await member.remove_roles(mute_role, reason=f"Mute expired by {interaction.user.name}")
         log_collector.add_event("Mute aufgehoben")
 
-        db.add_moderation_log(
+        await db.add_moderation_log(
             user_id=member.id,
             user_name=member.name,
             action_type="Unmute (Auto)",
@@ -95,7 +98,7 @@ class ModerationCog(commands.Cog):
             ), ephemeral=True)
             log_collector.add_event(f"{member.name} entstummt")
 
-            db.add_moderation_log(
+            await db.add_moderation_log(
                 user_id=member.id,
                 user_name=member.name,
                 action_type="Unmute",
@@ -141,7 +144,7 @@ class ModerationCog(commands.Cog):
         ), ephemeral=True)
         log_collector.add_event(f"{member.name} gewarnt. Grund: {reason}")
 
-        db.add_moderation_log(
+        await db.add_moderation_log(
             user_id=member.id,
             user_name=member.name,
             action_type="Warn",
@@ -152,5 +155,50 @@ class ModerationCog(commands.Cog):
 
         await log_collector.post_log()
 
+    @app_commands.command(name="history", description="Zeige Verwarnungen, Mutes und Bewerbungen eines Mitglieds")
+    async def history(self, interaction: discord.Interaction, member: discord.Member):
+        log_collector = LogCollector(interaction.guild, "Verlauf-Abfrage", interaction.user, interaction.channel)
+        log_collector.add_event(f"Verlauf für {member.name} angefordert")
+
+        if not self._is_admin(interaction.user):
+            await interaction.response.send_message(embed=discord.Embed(
+                title="❌ Keine Berechtigung",
+                description="Nur Teammitglieder dürfen das!",
+                color=discord.Color.red()
+            ), ephemeral=True)
+            log_collector.add_event("Unbefugter Zugriff", "WARNING")
+            await log_collector.post_log(status="Abgebrochen", color=discord.Color.red())
+            return
+
+        await interaction.response.defer(ephemeral=True)
+        history = await db.get_user_history(member.id)
+
+        moderation = "\n".join(
+            f"`{entry['date']:%d.%m.%Y}` **{entry['action_type']}**"
+            + (f" ({entry['duration']} Min.)" if entry['duration'] else "")
+            + f" von {entry['handled_by'] or 'Unbekannt'}: {entry['reason'] or 'Kein Grund angegeben'}"
+            for entry in history["moderation"]
+        )
+        applications = "\n".join(
+            f"`{entry['date']:%d.%m.%Y}` **{entry['apply_type']}** – {entry['status']}"
+            + (f" ({entry['spieler_tag']})" if entry['spieler_tag'] else "")
+            + (f": {entry['reason']}" if entry['reason'] else "")
+            for entry in history["applications"]
+        )
+        history_embed = discord.Embed(
+            title=f"📜 Verlauf von {member.name}",
+            color=discord.Color.blue()
+        )
+        history_embed.add_field(name="🔨 Moderation", value=moderation[:1024] or "Keine Einträge", inline=False)
+        history_embed.add_field(name="📝 Bewerbungen", value=applications[:1024] or "Keine Einträge", inline=False)
+        history_embed.set_thumbnail(url=member.display_avatar.url)
+        history_embed.set_footer(text="Operation-Oluja | Verlauf")
+        await interaction.followup.send(embed=history_embed, ephemeral=True)
+
+        log_collector.add_event(
+            f"Verlauf gesendet: {len(history['moderation'])} Moderationseinträge, {len(history['applications'])} Bewerbungen"
+        )
+        await log_collector.post_log()
+
 async def setup(bot):
     await bot.add_cog(ModerationCog(bot))
\ No newline at end of file
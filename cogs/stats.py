@@ -3,7 +3,8 @@ from discord.ext import commands
 from discord import app_commands
 from utils.helpers import get_log_channel
 from utils.logging import LogCollector
-from datetime import datetime
+from utils.database import db
+from datetime import datetime, timedelta
 
 class StatsCog(commands.Cog):
     def __init__(self, bot):
@@ -63,5 +64,35 @@ class StatsCog(commands.Cog):
         log_collector.add_event("Statistiken gesendet")
         await log_collector.post_log()
 
+    @app_commands.command(name="wachstum", description="Zeige Beitritte, Austritte und Netto-Wachstum des Servers")
+    @app_commands.describe(tage="Zeitraum in Tagen (Standard: 30)")
+    async def wachstum(self, interaction: discord.Interaction, tage: int = 30):
+        guild = interaction.guild
+        log_collector = LogCollector(guild, "Wachstums-Statistik", interaction.user, interaction.channel)
+        log_collector.add_event(f"Wachstum für {tage} Tage angefordert")
+
+        await interaction.response.defer(ephemeral=True)
+        days = await db.get_member_growth(guild.id, datetime.utcnow() - timedelta(days=max(tage, 1) - 1))
+        joins = sum(day["joins"] for day in days)
+        leaves = sum(day["leaves"] for day in days)
+        recent = "\n".join(
+            f"`{day['day']:%d.%m.}` +{day['joins']} / -{day['leaves']} (Netto {day['net']:+d})"
+            for day in days[-7:]
+        )
+        growth_embed = discord.Embed(
+            title=f"📈 Mitgliederwachstum ({tage} Tage)",
+            description=(
+                f"**Beitritte:** {joins}\n"
+                f"**Austritte:** {leaves}\n"
+                f"**Netto:** {joins - leaves:+d}"
+            ),
+            color=discord.Color.purple()
+        )
+        growth_embed.add_field(name="Letzte Tage", value=recent or "Keine Daten", inline=False)
+        growth_embed.set_footer(text="Operation-Oluja | Wachstums-Info", icon_url=interaction.user.display_avatar.url)
+        await interaction.followup.send(embed=growth_embed)
+        log_collector.add_event(f"Wachstum gesendet: {len(days)} Tage")
+        await log_collector.post_log()
+
 async def setup(bot):
     await bot.add_cog(StatsCog(bot))
\ No newline at end of file
@@ -2,10 +2,42 @@ import discord
 from discord.ext import commands, tasks
 from discord import app_commands
 import config
+from utils.coc_api import ClashApiError, coc_api, parse_time
 from utils.helpers import get_admin_role, get_log_channel
 from utils.logging import LogCollector
 from datetime import datetime, timedelta
 
+WAR_STATES = {
+    "notInWar": "Kein Krieg",
+    "preparation": "Vorbereitungstag",
+    "inWar": "Kampftag",
+    "warEnded": "Beendet"
+}
+
+def format_remaining(until: datetime) -> str:
+    minutes = max(0, int((until - datetime.utcnow()).total_seconds() // 60))
+    return f"{minutes // 60} Std. {minutes % 60} Min."
+
+def war_status_lines(war: dict) -> list:
+    """Beschreibung des aktuellen Kriegs aus der Antwort von /clans/{tag}/currentwar."""
+    state = war.get("state", "notInWar")
+    lines = [f"**Status:** {WAR_STATES.get(state, state)}"]
+    if state == "notInWar":
+        return lines
+    clan, opponent = war["clan"], war["opponent"]
+    lines.append(f"**Gegner:** {opponent['name']} ({opponent['tag']})")
+    lines.append(f"**Größe:** {war['teamSize']} gegen {war['teamSize']}")
+    if state == "preparation":
+        lines.append(f"**Kampftag beginnt in:** {format_remaining(parse_time(war['startTime']))}")
+        return lines
+    lines.append(f"**Sterne:** {clan['stars']} : {opponent['stars']}")
+    lines.append(f"**Zerstörung:** {clan['destructionPercentage']:.1f}% : {opponent['destructionPercentage']:.1f}%")
+    possible = war["teamSize"] * war.get("attacksPerMember", 2)
+    lines.append(f"**Teilnahme:** {clan['attacks']}/{possible} Angriffe ({clan['attacks'] / possible:.0%})")
+    if state == "inWar":
+        lines.append(f"**Endet in:** {format_remaining(parse_time(war['endTime']))}")
+    return lines
+
 class WarCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
@@ -48,19 +80,33 @@ class WarCog(commands.Cog):
         log_collector.add_event("Status angefordert")
 
         await interaction.response.defer(ephemeral=True)
-        # Simuliert Kriegsstatus
-        war_status = {
-            "Status": "Aktiv",
-            "Teilnahme": "80%",
-            "Nächster Krieg": "Morgen, 18:00 Uhr"
-        }
+        if not coc_api.enabled or not config.CLAN_TAG:
+            await interaction.followup.send(embed=discord.Embed(
+                title="⚠️ Fehler",
+                description="Die Clash-of-Clans-API ist nicht konfiguriert.",
+                color=discord.Color.orange()
+            ), ephemeral=True)
+            log_collector.add_event("Fehler: API-Token oder Clan-Tag fehlt", "ERROR")
+            await log_collector.post_log(status="Fehler", color=discord.Color.red())
+            return
+        try:
+            war = await coc_api.get_current_war(config.CLAN_TAG)
+        except ClashApiError as e:
+            # Die API antwortet mit 403 sowohl bei privatem Kriegsprotokoll als auch bei ungültigem Token
+            description = "Das Kriegsprotokoll des Clans ist privat oder der API-Token ist ungültig." if e.status == 403 \
+                else "Der Kriegsstatus konnte nicht abgerufen werden. Bitte versuche es später erneut."
+            await interaction.followup.send(embed=discord.Embed(
+                title="⚠️ Fehler",
+                description=description,
+                color=discord.Color.orange()
+            ), ephemeral=True)
+            log_collector.add_event(f"Clash-of-Clans-API: {e}", "ERROR")
+            await log_collector.post_log(status="Fehler", color=discord.Color.red())
+            return
+
         status_embed = discord.Embed(
             title="🏹 Kriegsstatus",
-            description=(
-                f"**Status:** {war_status['Status']}\n"
-                f"**Teilnahme:** {war_status['Teilnahme']}\n"
-                f"**Nächster Krieg:** {war_status['Nächster Krieg']}"
-            ),
+            description="\n".join(war_status_lines(war)),
             color=discord.Color.blue()
         )
         status_embed.set_thumbnail(url="https://cdn.discordapp.com/attachments/1128712101349038160/1226579502036989992/oluja_logo.png")
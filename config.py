@@ -7,6 +7,82 @@ ARCHIVE_CHANNEL_NAME = ""
 MEMBER_ROLE_ID = ""
 CLAN_TAG = ""
 REMINDER_HOURS = 24
+REMINDER_STEPS = 3  # Erinnerungen nach 1×, 2× und 3× REMINDER_HOURS, die letzte pingt das Team
+APPLICATION_USE_MODAL = True  # Formular statt einzelner Fragen im Kanal
+TICKET_CREATE_CONCURRENCY = 2  # gleichzeitige Ticket-Erstellungen pro Server, weitere warten in einer Schlange
+
+DB_BACKEND = "mysql"  # "mysql" oder "sqlite"
+DB_SQLITE_PATH = "oluja_data.db"
+DB_HOST = "localhost"
+DB_PORT = 3306
+DB_USER = ""
+DB_PASSWORD = ""
+DB_NAME = "oluja_data"
+DB_POOL_SIZE = 5
+DB_POOL_TIMEOUT = 10
+DB_BATCH_SIZE = 50
+DB_BATCH_INTERVAL_MS = 500
+DB_BATCH_QUEUE_SIZE = 1000
+DB_RETRY_ATTEMPTS = 3
+DB_BACKOFF_BASE = 0.5
+DB_BACKOFF_MAX = 30
+DB_SPOOL_SIZE = 5000
+DB_RETENTION_MONTHS = 12
+DB_PARTITION_MONTHS_AHEAD = 2
+DB_ARCHIVE_DIR = "archive"
+
+HISTORY_LIMIT = 10
+HISTORY_CACHE_SIZE = 256
+HISTORY_CACHE_TTL = 300
+
+# Rate-Limits pro Name: (Bereich "guild"/"channel"/"user", erlaubte Aufrufe, Zeitraum in Sekunden).
+# Ein erlaubter Aufruf ist ein einfacher Cooldown, mehrere ein Token-Bucket, der gleichmäßig nachfüllt.
+RATE_LIMITS = {
+    "team_notify": ("channel", 1, 900),
+    "faq": ("user", 3, 60),
+    "feedback": ("user", 1, 300),
+    "cwl_req": ("guild", 2, 3600),
+    "auto_reply": ("channel", 1, 120)
+}
+RATE_LIMIT_PERSIST = ("team_notify", "cwl_req")  # überstehen einen Neustart
+RATE_LIMIT_FLUSH_INTERVAL = 30
+
+COC_API_URL = "https://api.clashofclans.com/v1"  # für Tests: http://127.0.0.1:8086/v1 (python -m utils.coc_standin)
+COC_API_TOKEN = ""  # leer = API nicht genutzt
+COC_API_RATE = 10  # Anfragen pro Sekunde, Token-Bucket
+COC_API_BURST = 10
+COC_API_TIMEOUT = 10
+COC_API_CONNECTIONS = 10
+COC_API_CACHE_SIZE = 512
+COC_API_CACHE_TTL = 60  # falls die Antwort kein Cache-Control: max-age enthält
+COC_TAG_LOOKUP_TIMEOUT = 2  # Sekunden für die Tag-Prüfung, danach wird der Tag ohne Prüfung akzeptiert
+
+LOG_FLUSH_INTERVAL = 2
+LOG_QUEUE_SIZE = 200
+# Weiterleitung pro Prozessname: "immediate" (Standard), "sampled" oder "digest"
+LOG_ROUTES = {
+    "FAQ-Anzeige": "digest",
+    "Clan-Statistiken": "digest",
+    "Mitglieds-Statistiken": "digest",
+    "Wachstums-Statistik": "digest",
+    "Mitglied Beitritt": "digest",
+    "Mitglied Austritt": "digest",
+    "CWL-Umfrage": "digest",
+    "Kriegsstatus-Anfrage": "sampled"
+}
+LOG_SAMPLE_RATE = 0.1
+LOG_DIGEST_INTERVAL = 900
+LOG_FILE = "bot.log"
+LOG_ROTATION = "size"  # "size" oder "time"
+LOG_MAX_BYTES = 10 * 1024 * 1024
+LOG_ROTATE_WHEN = "midnight"
+LOG_BACKUP_COUNT = 7
+LOG_JSON = False
+TRACE_FILE = "trace.jsonl"
+
+METRICS_ENABLED = False  # lokaler Prometheus-Endpunkt unter /metrics
+METRICS_HOST = "127.0.0.1"
+METRICS_PORT = 9464
 
 ACCEPT_TEMPLATES = [
     "Herzlichen Glückwunsch! Du bist jetzt Teil unseres Clans. Willkommen bei Operation-Oluja!",
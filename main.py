@@ -2,17 +2,38 @@ import discord
 from discord.ext import commands
 import config
 import asyncio
+from utils.coc_api import coc_api
+from utils.database import db
+from utils.db_backends import DatabaseError
+from utils.logging import log_digest, log_dispatcher, setup_logging, setup_trace_logging
+from utils.metrics import http_trace_config, metrics_server, observe_app_command
+from utils.rate_limits import rate_limits
 
 intents = discord.Intents.default()
 intents.message_content = True
 intents.guilds = True
 intents.members = True
 
-bot = commands.Bot(command_prefix="!", intents=intents, application_id=config.APPLICATION_ID)
+class OlujaBot(commands.Bot):
+    async def close(self):
+        # Noch gepufferte Log-Nachrichten senden, solange die Verbindung besteht
+        log_digest.flush()
+        await log_dispatcher.flush()
+        await rate_limits.flush()
+        await coc_api.close()
+        await metrics_server.stop()
+        await super().close()
+
+bot = OlujaBot(
+    command_prefix="!",
+    intents=intents,
+    application_id=config.APPLICATION_ID,
+    http_trace=http_trace_config() if config.METRICS_ENABLED else None
+)
 
 async def load_cogs():
     print("Starting to load cogs...")
-    for cog in ["cogs.application", "cogs.admin", "cogs.feedback", "cogs.events", "cogs.war", "cogs.moderation", "cogs.stats", "cogs.cwl"]:
+    for cog in ["cogs.application", "cogs.admin", "cogs.feedback", "cogs.events", "cogs.war", "cogs.moderation", "cogs.stats", "cogs.cwl", "cogs.maintenance"]:
         try:
             print(f"Loading {cog}...")
             await bot.load_extension(cog)
@@ -25,10 +46,31 @@ async def on_ready():
     print(f"Eingeloggt als {bot.user} (ID: {bot.user.id})")
     await bot.change_presence(activity=discord.Activity(type=discord.ActivityType.watching, name="Clan Bewerbungen"))
 
+@bot.event
+async def on_app_command_completion(interaction: discord.Interaction, command):
+    observe_app_command(interaction, command)
+
 @bot.event
 async def setup_hook():
+    if config.METRICS_ENABLED:
+        await metrics_server.start(config.METRICS_HOST, config.METRICS_PORT)
+    try:
+        await rate_limits.load()
+    except DatabaseError as e:
+        # Ohne gespeicherte Cooldowns starten, statt den Bot nicht hochzufahren
+        print(f"Rate-Limits konnten nicht geladen werden: {e}")
     await load_cogs()
     await bot.tree.sync()
 
+async def main():
+    # Log-Dateien erst beim Start des Bots anlegen, nicht schon beim Import
+    setup_logging()
+    setup_trace_logging()
+    async with bot:
+        try:
+            await bot.start(config.BOT_TOKEN)
+        finally:
+            await db.close()
+
 if __name__ == "__main__":
-    asyncio.run(bot.start(config.BOT_TOKEN))
\ No newline at end of file
+    asyncio.run(main())
@@ -0,0 +1,39 @@
+import asyncio
+import os
+import sys
+import tempfile
+import pytest
+
+# The bot is run from the repository root, so its packages are imported from there.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+
+# Before utils.database creates its singleton: tests never touch a MySQL server or the bot's own database file.
+config.DB_BACKEND = "sqlite"
+config.DB_SQLITE_PATH = os.path.join(tempfile.mkdtemp(prefix="oluja-tests-"), "oluja.db")
+
+@pytest.fixture
+def run_db(tmp_path, monkeypatch):
+    """
+    Run `scenario(database)` against a fresh Database on its own SQLite file and close it afterwards.
+    Backoffs are shortened, so outage tests do not wait for the configured delays.
+    """
+    from utils.database import Database
+
+    monkeypatch.setattr(config, "DB_SQLITE_PATH", str(tmp_path / "oluja.db"))
+    monkeypatch.setattr(config, "DB_BACKOFF_BASE", 0.01)
+    monkeypatch.setattr(config, "DB_BACKOFF_MAX", 0.05)
+    monkeypatch.setattr(config, "DB_BATCH_INTERVAL_MS", 20)
+    # Database is a singleton; set it aside for the test and restore it afterwards
+    monkeypatch.setattr(Database, "_instance", None)
+
+    def run(scenario):
+        async def main():
+            database = Database()
+            try:
+                return await scenario(database)
+            finally:
+                await database.close()
+        return asyncio.run(main())
+    return run
@@ -0,0 +1,94 @@
+"""BatchWriter: batching by size and interval, backpressure, flush on close and write failures."""
+import asyncio
+from utils.batch_writer import BatchWriter
+
+INSERT_A = "INSERT INTO a (x) VALUES (%s)"
+INSERT_B = "INSERT INTO b (x) VALUES (%s)"
+
+class Recorder:
+    """Write callback that records every batch and can be slowed down, fail or defer rows."""
+
+    def __init__(self, delay=0, fail=False, defer=0):
+        self.batches = []
+        self.delay = delay
+        self.fail = fail
+        self.defer = defer
+
+    async def __call__(self, batches):
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("write failed")
+        self.batches.append({sql: list(rows) for sql, rows in batches.items()})
+        return self.defer
+
+def test_rows_are_written_in_batches_of_max_batch():
+    async def main():
+        recorder = Recorder()
+        writer = BatchWriter(recorder, max_batch=3, flush_interval=10)
+        for i in range(7):
+            await writer.enqueue(INSERT_A, (i,))
+        await asyncio.sleep(0.05)
+        # Two full batches went out right away, the last row waits for the interval
+        written = [batch[INSERT_A] for batch in recorder.batches]
+        await writer.close()
+        return written, recorder.batches[-1], writer.stats
+    written, last, stats = asyncio.run(main())
+    assert written == [[(0,), (1,), (2,)], [(3,), (4,), (5,)]]
+    assert last == {INSERT_A: [(6,)]}
+    assert (stats["queued"], stats["flushed"], stats["backlog"]) == (7, 7, 0)
+
+def test_pending_rows_are_written_after_the_interval_grouped_by_statement():
+    async def main():
+        recorder = Recorder()
+        writer = BatchWriter(recorder, max_batch=50, flush_interval=0.05)
+        await writer.enqueue(INSERT_A, (1,))
+        await writer.enqueue(INSERT_B, (2,))
+        await writer.enqueue(INSERT_A, (3,))
+        await asyncio.sleep(0.15)
+        await writer.close()
+        return recorder.batches
+    assert asyncio.run(main()) == [{INSERT_A: [(1,), (3,)], INSERT_B: [(2,)]}]
+
+def test_enqueue_waits_while_the_queue_is_full():
+    async def main():
+        recorder = Recorder(delay=0.2)
+        writer = BatchWriter(recorder, max_batch=1, flush_interval=0, max_queue=2)
+        await writer.enqueue(INSERT_A, (0,))
+        # Let the flusher take the first row, its write is now in flight
+        await asyncio.sleep(0.01)
+        await writer.enqueue(INSERT_A, (1,))
+        await writer.enqueue(INSERT_A, (2,))
+        blocked = asyncio.create_task(writer.enqueue(INSERT_A, (3,)))
+        await asyncio.sleep(0.05)
+        waited = not blocked.done()
+        await blocked
+        await writer.close()
+        return waited, [row for batch in recorder.batches for row in batch[INSERT_A]]
+    waited, written = asyncio.run(main())
+    assert waited
+    assert written == [(0,), (1,), (2,), (3,)]
+
+def test_close_writes_what_is_still_queued():
+    async def main():
+        recorder = Recorder()
+        writer = BatchWriter(recorder, max_batch=50, flush_interval=10)
+        for i in range(3):
+            await writer.enqueue(INSERT_A, (i,))
+        await writer.close()
+        return recorder.batches, writer.stats
+    batches, stats = asyncio.run(main())
+    assert batches == [{INSERT_A: [(0,), (1,), (2,)]}]
+    assert stats["backlog"] == 0
+
+def test_deferred_and_failed_rows_are_counted():
+    async def main():
+        deferring = BatchWriter(Recorder(defer=2), max_batch=50, flush_interval=10)
+        failing = BatchWriter(Recorder(fail=True), max_batch=50, flush_interval=10)
+        for writer in (deferring, failing):
+            for i in range(3):
+                await writer.enqueue(INSERT_A, (i,))
+            await writer.close()
+        return deferring.stats, failing.stats
+    deferring, failing = asyncio.run(main())
+    assert (deferring["flushed"], deferring["deferred"], deferring["failed"]) == (1, 2, 0)
+    assert (failing["flushed"], failing["failed"]) == (0, 3)
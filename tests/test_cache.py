@@ -0,0 +1,33 @@
+"""TTLCache: expiry, least-recently-used eviction and per-entry lifetimes."""
+import time
+from utils.cache import TTLCache
+
+def test_entries_expire_after_their_ttl():
+    cache = TTLCache(maxsize=10, ttl=0.05)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=10)
+    assert cache.get("a") == 1
+    time.sleep(0.06)
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    assert (cache.hits, cache.misses, len(cache)) == (2, 1, 1)
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(maxsize=2, ttl=10)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    # A lookup makes "a" the most recently used entry
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+
+def test_invalidate_and_clear():
+    cache = TTLCache(maxsize=10, ttl=10)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.invalidate("a")
+    cache.invalidate("missing")
+    assert cache.get("a") is None and len(cache) == 1
+    cache.clear()
+    assert len(cache) == 0
@@ -0,0 +1,121 @@
+"""The Clash of Clans client against the local stand-in server, offline."""
+import asyncio
+import time
+import pytest
+from utils.coc_api import ClashApiError, ClashClient, NotFound, TokenBucket, cache_ttl
+from utils.coc_standin import CLAN_TAG, ClashStandInServer
+
+PLAYER_TAG = "#LJC8V0GCJ"
+
+def run_with_server(scenario, token="test-token", **server_options):
+    """Run `scenario(server, client)` against a fresh stand-in on a free port."""
+    async def main():
+        server = ClashStandInServer(**server_options)
+        await server.start(port=0)
+        client = ClashClient(f"http://127.0.0.1:{server.port}/v1", token, rate=100, burst=100)
+        try:
+            return await scenario(server, client)
+        finally:
+            await client.close()
+            await server.stop()
+    return asyncio.run(main())
+
+def test_concurrent_lookups_share_one_request():
+    async def scenario(server, client):
+        players = await asyncio.gather(*(client.get_player(PLAYER_TAG) for _ in range(20)))
+        assert server.requests["players"] == 1
+        assert {player["name"] for player in players} == {"Sturm"}
+    run_with_server(scenario, delay=0.2)
+
+def test_responses_are_cached_for_max_age():
+    async def scenario(server, client):
+        await client.get_player(PLAYER_TAG)
+        # Tags are normalized, so these are the same cache entry
+        await client.get_player("ljc8v0gcj")
+        await client.get_player(PLAYER_TAG)
+        assert server.requests["players"] == 1
+        assert client.cache.hits == 2
+        expires, _ = client.cache._entries[("players", PLAYER_TAG)]
+        assert ClashStandInServer.MAX_AGE["players"] - 5 < expires - time.monotonic() <= ClashStandInServer.MAX_AGE["players"]
+    run_with_server(scenario)
+
+def test_max_age_zero_is_not_cached():
+    async def scenario(server, client):
+        server.MAX_AGE = {**ClashStandInServer.MAX_AGE, "clans": 0}
+        await client.get_clan(CLAN_TAG)
+        await client.get_clan(CLAN_TAG)
+        assert server.requests["clans"] == 2
+        assert len(client.cache) == 0
+    run_with_server(scenario)
+
+def test_unknown_tag_raises_not_found():
+    async def scenario(server, client):
+        with pytest.raises(NotFound) as error:
+            await client.get_player("#QQQQQQQQ")
+        assert error.value.status == 404
+        assert error.value.reason == "notFound"
+    run_with_server(scenario)
+
+def test_forbidden_maps_to_api_error_with_status():
+    async def scenario(server, client):
+        with pytest.raises(ClashApiError) as error:
+            await client.get_clan(CLAN_TAG)
+        assert error.value.status == 403
+        assert error.value.reason == "accessDenied"
+        assert not isinstance(error.value, NotFound)
+    run_with_server(scenario, token=" ")
+
+def test_private_war_log_is_forbidden_and_not_cached():
+    async def scenario(server, client):
+        for _ in range(2):
+            with pytest.raises(ClashApiError) as error:
+                await client.get_current_war(CLAN_TAG)
+            assert error.value.status == 403
+        assert server.requests["currentwar"] == 2
+    fixtures = ClashStandInServer().fixtures
+    fixtures["currentwar"] = {}
+    run_with_server(scenario, fixtures=fixtures)
+
+def test_unreachable_api_has_status_zero():
+    async def main():
+        client = ClashClient("http://127.0.0.1:1/v1", "test-token", timeout=2)
+        try:
+            with pytest.raises(ClashApiError) as error:
+                await client.get_clan(CLAN_TAG)
+        finally:
+            await client.close()
+        return error.value
+    error = asyncio.run(main())
+    assert error.status == 0
+    assert error.reason == "unreachable"
+
+def test_token_bucket_paces_requests_after_the_burst():
+    async def main():
+        bucket = TokenBucket(rate=20, burst=2)
+        start = time.monotonic()
+        waits = [await bucket.acquire() for _ in range(6)]
+        return waits, time.monotonic() - start
+    waits, elapsed = asyncio.run(main())
+    assert waits[:2] == [0.0, 0.0]
+    assert all(wait > 0 for wait in waits[2:])
+    # 4 tokens beyond the burst at 20 per second
+    assert 0.18 <= elapsed < 0.5
+
+def test_client_requests_go_through_the_bucket():
+    async def scenario(server, client):
+        client.bucket = TokenBucket(rate=10, burst=1)
+        start = time.monotonic()
+        await asyncio.gather(*(client.get_clan(tag) for tag in (CLAN_TAG, "#AAAAAAAA", "#BBBBBBBB")), return_exceptions=True)
+        assert server.requests["clans"] == 3
+        assert time.monotonic() - start >= 0.18
+    run_with_server(scenario)
+
+@pytest.mark.parametrize("header, expected", [
+    (None, 60),
+    ("public max-age=120", 120),
+    ("max-age=0", 0),
+    ("no-store", 0),
+    ("public", 60)
+])
+def test_cache_ttl(header, expected):
+    assert cache_ttl(header, 60) == expected
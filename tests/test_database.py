@@ -0,0 +1,284 @@
+"""Database against a temporary SQLite file: migrations, batched writes, queries and the outage spool."""
+import asyncio
+from datetime import datetime, timedelta
+import gzip
+import sqlite3
+import time
+import config
+from utils.database import MEMBER_EVENT_INSERT, SESSION_COLUMNS
+from utils.db_backends import ConnectionPool, SQLiteBackend
+from utils.migrations import MIGRATIONS, run_migrations
+
+def make_session(channel_id, state="questions", step=0, **overrides):
+    session = {
+        "channel_id": channel_id,
+        "guild_id": 1,
+        "applicant_id": 100 + channel_id,
+        "applicant_name": f"bewerber{channel_id}",
+        "apply_type": "Mitglieder-Bewerbung",
+        "state": state,
+        "step": step,
+        "attempts": 0,
+        "answers": ["#LJC8V0GCJ", "Hybrid"][:step],
+        "question_message_id": None,
+        "deadline": None,
+        "reminder_step": 0,
+        "created_at": datetime(2026, 10, 1, 12, 0)
+    }
+    session.update(overrides)
+    return session
+
+def take_offline(database, monkeypatch):
+    """Make every checkout fail like an unreachable database file; returns a function that ends the outage."""
+    connection = database.backend.connection
+
+    def unavailable():
+        raise sqlite3.OperationalError("unable to open database file")
+    monkeypatch.setattr(database.backend, "connection", unavailable)
+    return lambda: monkeypatch.setattr(database.backend, "connection", connection)
+
+async def insert_rows(database, sql, rows):
+    """Write rows directly, bypassing the batch writer, e.g. events from before guild ids were stored."""
+    def insert(conn, cursor):
+        cursor.executemany(sql, rows)
+        conn.commit()
+    await database._run(insert)
+
+async def count_rows(database, table):
+    def count(conn, cursor):
+        cursor.execute(f"SELECT COUNT(*) FROM {table}")
+        return cursor.fetchone()[0]
+    return await database._run(count)
+
+async def replayed(database):
+    while database._replay_pending:
+        await asyncio.sleep(0.01)
+
+# Migrations
+
+def test_migrations_apply_every_version_once(tmp_path):
+    backend = SQLiteBackend(str(tmp_path / "migrations.db"), size=1, timeout=1)
+    with backend.connection() as conn:
+        run_migrations(backend, conn)
+        run_migrations(backend, conn)
+        versions = [row[0] for row in conn.execute("SELECT version FROM schema_migrations ORDER BY version")]
+    backend.close()
+    assert versions == [version for version, _, _ in MIGRATIONS]
+
+def test_add_column_migrations_can_be_rerun(tmp_path):
+    # As after a failure that left the column but not the recorded version
+    backend = SQLiteBackend(str(tmp_path / "migrations.db"), size=1, timeout=1)
+    with backend.connection() as conn:
+        run_migrations(backend, conn)
+        conn.execute("DELETE FROM schema_migrations WHERE version IN (5, 10)")
+        conn.commit()
+        run_migrations(backend, conn)
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(application_sessions)")}
+        count = conn.execute("SELECT COUNT(*) FROM schema_migrations").fetchone()[0]
+    backend.close()
+    assert "reminder_step" in columns
+    assert count == len(MIGRATIONS)
+
+# Connection pool
+
+class FakeConnection:
+    def __init__(self, fail_rollback=False):
+        self.fail_rollback = fail_rollback
+        self.rollbacks = 0
+        self.closed = False
+
+    def rollback(self):
+        self.rollbacks += 1
+        if self.fail_rollback:
+            raise sqlite3.OperationalError("disk I/O error")
+
+    def close(self):
+        self.closed = True
+
+def test_pool_ends_the_transaction_of_returned_connections():
+    connections = [FakeConnection(), FakeConnection(fail_rollback=True), FakeConnection()]
+    pool = ConnectionPool(lambda: connections.pop(0), size=1, timeout=1)
+    with pool.connection() as first:
+        pass
+    assert first.rollbacks == 1
+    with pool.connection() as reused:
+        reused.fail_rollback = True
+    assert reused is first
+    # A connection that cannot be rolled back is not handed out again
+    assert first.closed
+    with pool.connection() as fresh:
+        pass
+    assert fresh is not first
+
+# Batched writes and queries
+
+def test_applications_are_paged_by_id(run_db):
+    async def scenario(database):
+        for i in range(7):
+            await database.add_application(f"user{i}", i, "Mitglieder-Bewerbung", None, None, "15",
+                                           "Angenommen" if i % 2 else "Abgelehnt", None, "mod")
+        await database.writer.flush()
+        pages = []
+        after_id = 0
+        while after_id is not None:
+            rows, after_id = await database.query_applications(after_id=after_id, limit=3)
+            pages.append([row["applicant_id"] for row in rows])
+        accepted = [row["applicant_id"] async for row in database.iter_applications(batch_size=2, status="Angenommen")]
+        return pages, accepted, database.writer.stats
+    pages, accepted, stats = run_db(scenario)
+    assert pages == [[0, 1, 2], [3, 4, 5], [6]]
+    assert accepted == [1, 3, 5]
+    assert stats["flushed"] == 7 and stats["backlog"] == 0
+
+def test_user_history_is_cached_until_new_rows_are_written(run_db):
+    async def scenario(database):
+        await database.add_moderation_log(5, "user5", "Warn", "Spam", None, "mod")
+        await database.writer.flush()
+        first = await database.get_user_history(5)
+        cached = await database.get_user_history(5)
+        await database.add_moderation_log(5, "user5", "Kick", "Spam", None, "mod")
+        await database.writer.flush()
+        return first, cached, await database.get_user_history(5), database.history_cache.hits
+    first, cached, updated, hits = run_db(scenario)
+    assert cached is first and hits == 1
+    assert [entry["action_type"] for entry in updated["moderation"]] == ["Kick", "Warn"]
+
+def test_member_events_update_the_daily_rollup(run_db):
+    async def scenario(database):
+        for user_id, event_type in ((1, "Join"), (2, "Join"), (1, "Leave"), (3, "Nickname")):
+            await database.add_member_event(user_id, f"user{user_id}", event_type, guild_id=7)
+        await database.writer.flush()
+        await database.add_member_event(4, "user4", "Join", guild_id=7)
+        await database.writer.flush()
+        return await database.get_member_growth(7, datetime.utcnow() - timedelta(days=1))
+    growth = run_db(scenario)
+    assert len(growth) == 1
+    assert (growth[0]["joins"], growth[0]["leaves"], growth[0]["net"]) == (3, 1, 2)
+
+def test_backfill_attributes_legacy_events_of_single_guild_users(run_db):
+    async def scenario(database):
+        day = datetime(2026, 9, 1, 10, 0)
+        rows = [
+            (1, "user1", "Join", None, day),      # user 1 is only known in guild 7
+            (1, "user1", "Leave", 7, day),
+            (2, "user2", "Join", None, day),      # user 2 was seen in two guilds
+            (2, "user2", "Join", 7, day),
+            (2, "user2", "Join", 8, day),
+            (3, "user3", "Join", None, day)       # user 3 has no event with a guild
+        ]
+        await insert_rows(database, MEMBER_EVENT_INSERT, rows)
+        result = await database.backfill_member_rollups(7)
+        return result, await database.get_member_growth(7, day)
+    (days, attributed, unattributed), growth = run_db(scenario)
+    assert (days, attributed, unattributed) == (1, 1, 2)
+    assert (growth[0]["joins"], growth[0]["leaves"]) == (2, 1)
+
+def test_transcripts_are_written_right_away(run_db):
+    async def scenario(database):
+        await database.add_transcript(1, 42, None, 9, "user9", "Geschlossen", 555, "https://cdn/t.html", 12, 3400)
+        return await database.get_transcripts(1, 9)
+    transcripts = run_db(scenario)
+    assert [(t["channel_id"], t["reason"], t["message_count"]) for t in transcripts] == [(42, "Geschlossen", 12)]
+
+def test_retention_archives_and_drops_old_months(run_db, tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "DB_ARCHIVE_DIR", str(tmp_path / "archive"))
+    old = datetime(2020, 3, 15)
+
+    async def scenario(database):
+        await insert_rows(database, MEMBER_EVENT_INSERT, [
+            (1, "user1", "Join", 7, old),
+            (2, "user2", "Join", 7, datetime.utcnow())
+        ])
+        archived = await database.run_retention()
+        return archived, await count_rows(database, "member_events")
+    archived, remaining = run_db(scenario)
+    assert archived == {"moderation_logs": 0, "member_events": 1}
+    assert remaining == 1
+    with gzip.open(tmp_path / "archive" / "member_events-2020-03.jsonl.gz", "rt") as archive:
+        assert len(archive.readlines()) == 1
+
+# Application sessions
+
+def test_sessions_are_upserted_and_transitioned_once(run_db):
+    async def scenario(database):
+        await database.save_application_session(make_session(1))
+        await database.save_application_session(make_session(1, state="review", step=2))
+        session = await database.get_application_session(1)
+        claims = [await database.transition_application_state(1, "review", state) for state in ("accepted", "denied")]
+        await database.set_reminder_step(1, 2)
+        final = await database.get_application_session(1)
+        await database.delete_application_session(1)
+        return session, claims, final, await database.get_application_sessions()
+    session, claims, final, remaining = run_db(scenario)
+    assert set(SESSION_COLUMNS) <= set(session)
+    assert (session["state"], session["step"], session["answers"]) == ("review", 2, ["#LJC8V0GCJ", "Hybrid"])
+    assert claims == [True, False]
+    assert (final["state"], final["reminder_step"]) == ("accepted", 2)
+    assert remaining == []
+
+def test_rate_limits_round_trip(run_db):
+    async def scenario(database):
+        now = datetime.utcnow().replace(microsecond=0)
+        await database.save_rate_limits([("faq", 1, 0.5, now), ("faq", 2, 1.0, now - timedelta(hours=2))])
+        await database.save_rate_limits([("faq", 1, 0.25, now)])
+        return await database.load_rate_limits(now - timedelta(hours=1))
+    rows = run_db(scenario)
+    assert [(row["name"], row["scope_id"], row["tokens"]) for row in rows] == [("faq", 1, 0.25)]
+
+# Outage spool
+
+def test_writes_during_an_outage_are_spooled_and_replayed(run_db, monkeypatch):
+    async def scenario(database):
+        await database.get_guild_settings()
+        restore = take_offline(database, monkeypatch)
+        await database.save_application_session(make_session(1))
+        await database.set_guild_setting(1, "log_channel", 99)
+        await database.add_member_event(1, "user1", "Join", guild_id=7)
+        await database.writer.flush()
+        during = (database.healthy, dict(database.spool_stats), database.writer.stats["deferred"])
+        restore()
+        await replayed(database)
+        return during, database.spool_stats, await database.get_application_session(1), await database.get_guild_settings()
+    (healthy, spool, deferred), after, session, settings = run_db(scenario)
+    assert not healthy
+    assert spool["pending"] == 3 and deferred == 1
+    assert after["replayed"] == 3 and after["pending"] == 0
+    assert session["state"] == "questions"
+    assert settings == [{"guild_id": 1, "name": "log_channel", "target_id": 99}]
+
+def test_rejected_statements_are_dead_lettered(run_db):
+    async def scenario(database):
+        await database.get_guild_settings()
+        database._spool.append(("INSERT INTO missing_table (id) VALUES (%s)", (1,)))
+        # Queued behind the spooled statement and replayed with it
+        await database.save_application_session(make_session(1))
+        await replayed(database)
+        return database.spool_stats, list(database.dead_letters), await database.get_application_session(1)
+    stats, dead_letters, session = run_db(scenario)
+    assert (stats["dead_lettered"], stats["replayed"], stats["pending"]) == (1, 1, 0)
+    assert dead_letters[0][0] == "INSERT INTO missing_table (id) VALUES (%s)"
+    assert session is not None
+
+def test_writes_queue_behind_a_replay_in_flight(run_db, monkeypatch):
+    async def scenario(database):
+        await database.get_guild_settings()
+        replay = database._replay
+        started = asyncio.Event()
+        loop = asyncio.get_running_loop()
+
+        def slow_replay(conn, cursor, entries):
+            loop.call_soon_threadsafe(started.set)
+            time.sleep(0.2)
+            return replay(conn, cursor, entries)
+        monkeypatch.setattr(database, "_replay", slow_replay)
+        restore = take_offline(database, monkeypatch)
+        await database.save_application_session(make_session(1, step=1))
+        restore()
+        await started.wait()
+        # The spool is empty while its batch is replayed, yet the newer state must not overtake it
+        assert not database._spool
+        await database.save_application_session(make_session(1, step=2))
+        assert len(database._spool) == 1
+        await replayed(database)
+        return await database.get_application_session(1)
+    assert run_db(scenario)["step"] == 2
@@ -0,0 +1,76 @@
+"""RateLimiter: cooldowns, token buckets, eviction and persisted buckets."""
+import asyncio
+from datetime import datetime, timezone
+import pytest
+import utils.rate_limits
+from utils.rate_limits import RateLimiter, Rule, format_wait
+
+class Clock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(utils.rate_limits.time, "time", clock)
+    return clock
+
+def test_cooldown_allows_one_use_per_period(clock):
+    limiter = RateLimiter([Rule("feedback", "user", 1, 300)])
+    assert limiter.hit("feedback", scope_id=1) == 0
+    assert limiter.hit("feedback", scope_id=1) == pytest.approx(300)
+    # Other users have their own cooldown
+    assert limiter.hit("feedback", scope_id=2) == 0
+    clock.now += 120
+    assert limiter.hit("feedback", scope_id=1) == pytest.approx(180)
+    clock.now += 180
+    assert limiter.hit("feedback", scope_id=1) == 0
+
+def test_token_bucket_refills_evenly(clock):
+    limiter = RateLimiter([Rule("faq", "user", 3, 60)])
+    assert [limiter.hit("faq", scope_id=1) for _ in range(3)] == [0, 0, 0]
+    assert limiter.hit("faq", scope_id=1) == pytest.approx(20)
+    clock.now += 20
+    assert limiter.hit("faq", scope_id=1) == 0
+    assert limiter.hit("faq", scope_id=1) == pytest.approx(20)
+
+def test_refilled_buckets_are_evicted(clock):
+    limiter = RateLimiter([Rule("faq", "user", 3, 60)])
+    for scope_id in range(5):
+        limiter.hit("faq", scope_id=scope_id)
+    assert len(limiter) == 5
+    clock.now += 60
+    limiter.hit("faq", scope_id=99)
+    assert len(limiter) == 1
+    limiter.reset("faq", 99)
+    assert len(limiter) == 0
+
+def test_unknown_scope_is_rejected():
+    with pytest.raises(ValueError):
+        Rule("broken", "server", 1, 60)
+
+def test_format_wait():
+    assert format_wait(4.2) == "5 Sekunde(n)"
+    assert format_wait(61) == "2 Minute(n)"
+
+def test_persisted_buckets_survive_a_restart(run_db, clock, monkeypatch):
+    rules = [Rule("cwl_req", "guild", 2, 3600, persist=True), Rule("faq", "user", 3, 60)]
+    clock.now = datetime.utcnow().replace(tzinfo=timezone.utc).timestamp()
+
+    async def scenario(database):
+        monkeypatch.setattr(utils.rate_limits, "db", database)
+        limiter = RateLimiter(rules, flush_interval=0.01)
+        limiter.hit("cwl_req", scope_id=7)
+        limiter.hit("cwl_req", scope_id=7)
+        limiter.hit("faq", scope_id=1)
+        # Changed buckets of persisted rules are written shortly after
+        await asyncio.sleep(0.1)
+        restarted = RateLimiter(rules)
+        await restarted.load()
+        return restarted
+    restarted = run_db(scenario)
+    assert restarted.hit("cwl_req", scope_id=7) == pytest.approx(1800, abs=1)
+    assert restarted.hit("faq", scope_id=1) == 0
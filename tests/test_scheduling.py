@@ -0,0 +1,101 @@
+"""AdmissionScheduler and DeadlineScheduler: FIFO slots per guild and heap-ordered deadlines."""
+import asyncio
+from datetime import datetime, timedelta
+from utils.admission import AdmissionScheduler
+from utils.scheduler import DeadlineScheduler
+
+# AdmissionScheduler
+
+def test_waiters_are_admitted_in_arrival_order():
+    async def main():
+        admission = AdmissionScheduler(limit=2)
+        order, positions = [], []
+
+        async def create_ticket(name):
+            async def queued(position):
+                positions.append((name, position))
+            await admission.acquire(1, on_queued=queued)
+            try:
+                order.append(name)
+                await asyncio.sleep(0.02)
+            finally:
+                admission.release(1)
+        await asyncio.gather(*(create_ticket(name) for name in "abcde"))
+        return order, positions, admission
+    order, positions, admission = asyncio.run(main())
+    assert order == list("abcde")
+    assert positions == [("c", 1), ("d", 2), ("e", 3)]
+    # Nothing is left behind once every slot is released
+    assert admission._active == {} and admission.queued() == 0
+
+def test_guilds_do_not_share_slots():
+    async def main():
+        admission = AdmissionScheduler(limit=1)
+        await admission.acquire(1)
+        # Another guild is admitted right away although guild 1 is full
+        waited = await asyncio.wait_for(admission.acquire(2), 0.1)
+        blocked = asyncio.create_task(admission.acquire(1))
+        await asyncio.sleep(0)
+        queued = admission.queued(1), admission.queued()
+        admission.release(1)
+        await blocked
+        return waited, queued
+    waited, queued = asyncio.run(main())
+    assert waited == 0.0
+    assert queued == (1, 1)
+
+def test_cancelled_waiter_gives_up_its_place():
+    async def main():
+        admission = AdmissionScheduler(limit=1)
+        await admission.acquire(1)
+        cancelled = asyncio.create_task(admission.acquire(1))
+        later = asyncio.create_task(admission.acquire(1))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.sleep(0)
+        admission.release(1)
+        await asyncio.wait_for(later, 0.1)
+        return cancelled.cancelled(), admission.queued(1), admission._active
+    cancelled, queued, active = asyncio.run(main())
+    assert cancelled and queued == 0
+    assert active == {1: 1}
+
+# DeadlineScheduler
+
+def test_deadlines_fire_in_order_and_can_be_moved_or_cancelled():
+    async def main():
+        fired = []
+
+        async def callback(key):
+            fired.append(key)
+        scheduler = DeadlineScheduler(callback)
+        now = datetime.utcnow()
+        scheduler.schedule("late", now + timedelta(seconds=0.06))
+        scheduler.schedule("early", now + timedelta(seconds=0.02))
+        scheduler.schedule("moved", now + timedelta(seconds=0.01))
+        scheduler.schedule("moved", now + timedelta(seconds=0.04))
+        scheduler.schedule("cancelled", now + timedelta(seconds=0.03))
+        scheduler.cancel("cancelled")
+        pending = len(scheduler)
+        await asyncio.sleep(0.15)
+        scheduler.stop()
+        return fired, pending, len(scheduler)
+    fired, pending, remaining = asyncio.run(main())
+    assert fired == ["early", "moved", "late"]
+    assert (pending, remaining) == (3, 0)
+
+def test_overdue_deadlines_fire_at_once_and_failures_do_not_stop_the_scheduler():
+    async def main():
+        fired = []
+
+        async def callback(key):
+            fired.append(key)
+            if key == "broken":
+                raise RuntimeError("callback failed")
+        scheduler = DeadlineScheduler(callback)
+        scheduler.schedule("broken", datetime.utcnow() - timedelta(hours=1))
+        scheduler.schedule("next", datetime.utcnow() + timedelta(seconds=0.02))
+        await asyncio.sleep(0.08)
+        scheduler.stop()
+        return fired
+    assert asyncio.run(main()) == ["broken", "next"]
@@ -0,0 +1,60 @@
+"""TicketIndex: lookups by channel and applicant, reservations and open-ticket sweeps."""
+from datetime import datetime
+from types import SimpleNamespace
+from utils.ticket_index import TicketIndex, applicant_from_topic, state_from_name
+
+CREATED = datetime(2026, 10, 1, 12, 0)
+
+def test_tickets_are_found_by_channel_and_applicant():
+    index = TicketIndex()
+    index.update(10, 1, 100, "questions", CREATED)
+    index.update(11, 2, 100, "review", CREATED)
+    assert 10 in index and len(index) == 2
+    assert index.find(1, 100) == 10 and index.find(2, 100) == 11
+    assert index.find(1, 101) is None
+    index.set_state(10, "review")
+    index.set_reminder_step(10, 2)
+    assert (index.get(10)["state"], index.get(10)["reminder_step"]) == ("review", 2)
+    index.remove(10)
+    assert index.find(1, 100) is None and 10 not in index
+    assert index.remove(10) is None
+
+def test_reservation_blocks_a_second_ticket_until_released_or_created():
+    index = TicketIndex()
+    assert index.reserve(1, 100)
+    assert not index.reserve(1, 100)
+    assert index.has_ticket(1, 100)
+    index.release(1, 100)
+    assert index.reserve(1, 100)
+    index.update(10, 1, 100, "questions", CREATED)
+    # The created ticket replaces the reservation
+    assert not index.reserve(1, 100)
+    index.remove(10)
+    assert index.reserve(1, 100)
+
+def test_removing_an_old_ticket_keeps_the_newer_one():
+    index = TicketIndex()
+    index.update(10, 1, 100, "accepted", CREATED)
+    index.update(11, 1, 100, "questions", CREATED)
+    index.remove(10)
+    assert index.find(1, 100) == 11
+
+def test_sweeps_only_visit_open_tickets_of_the_guild():
+    index = TicketIndex()
+    index.update(10, 1, 100, "questions", CREATED)
+    index.update(11, 1, 101, "accepted", CREATED)
+    index.update(12, 1, 102, "review", CREATED)
+    index.update(13, 2, 103, "review", CREATED)
+    assert sorted(ticket["channel_id"] for ticket in index.tickets(1)) == [10, 12]
+    assert [ticket["channel_id"] for ticket in index.tickets(1, ("accepted",))] == [11]
+    index.clear()
+    assert len(index) == 0 and not index.has_ticket(1, 100)
+
+def test_ticket_channels_are_recognised_by_name_and_topic():
+    ticket = SimpleNamespace(name="bewerbung-sturm", topic="Bewerbung von Sturm | ID: 123456")
+    accepted = SimpleNamespace(name="angenommen-sturm", topic="Bewerbung von Sturm | ID: 123456")
+    other = SimpleNamespace(name="allgemein", topic="Bewerbung von Sturm | ID: 123456")
+    assert applicant_from_topic(ticket) == 123456
+    assert applicant_from_topic(other) is None
+    assert applicant_from_topic(SimpleNamespace(name="bewerbung-x", topic=None)) is None
+    assert (state_from_name(ticket), state_from_name(accepted)) == ("review", "accepted")
@@ -0,0 +1,60 @@
+import asyncio
+from collections import deque
+import time
+from typing import Awaitable, Callable, Deque, Dict, Optional
+
+class AdmissionScheduler:
+    """
+    Per-guild FIFO admission for a rate-limited operation such as creating ticket channels.
+    At most `limit` callers per guild hold a slot at once; everyone else waits in arrival order and
+    a released slot is handed directly to the oldest waiter, so later callers cannot overtake.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._active: Dict[int, int] = {}
+        self._waiters: Dict[int, Deque[asyncio.Future]] = {}
+
+    def queued(self, guild_id: Optional[int] = None) -> int:
+        """Callers waiting for a slot in one guild, or in all guilds."""
+        if guild_id is not None:
+            return len(self._waiters.get(guild_id, ()))
+        return sum(len(queue) for queue in self._waiters.values())
+
+    async def acquire(self, guild_id: int, on_queued: Optional[Callable[[int], Awaitable]] = None) -> float:
+        """
+        Wait for a slot in the guild and return the seconds spent waiting. If the caller has to queue,
+        `on_queued(position)` is awaited first with its 1-based place in the queue.
+        """
+        queue = self._waiters.setdefault(guild_id, deque())
+        if self._active.get(guild_id, 0) < self.limit and not queue:
+            self._active[guild_id] = self._active.get(guild_id, 0) + 1
+            return 0.0
+        started = time.monotonic()
+        waiter = asyncio.get_running_loop().create_future()
+        queue.append(waiter)
+        try:
+            if on_queued is not None:
+                await on_queued(len(queue))
+            await waiter
+        except BaseException:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was already handed over, pass it on to the next waiter.
+                self.release(guild_id)
+            else:
+                waiter.cancel()
+                queue.remove(waiter)
+            raise
+        return time.monotonic() - started
+
+    def release(self, guild_id: int):
+        queue = self._waiters.get(guild_id)
+        while queue:
+            waiter = queue.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._active[guild_id] -= 1
+        if not self._active[guild_id]:
+            del self._active[guild_id]
+            self._waiters.pop(guild_id, None)
@@ -0,0 +1,101 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+class BatchWriter:
+    """
+    A write-behind buffer for append-only INSERT statements.
+    Rows are collected in a bounded queue and written with `executemany` in a single transaction,
+    either once `max_batch` rows are pending or `flush_interval` seconds after the first pending row.
+    When the queue is full, `enqueue` waits until the flusher has made room (backpressure).
+    The write callback may return the number of rows it deferred (e.g. spooled during an outage) instead of writing.
+    """
+
+    def __init__(
+        self,
+        write: Callable[[Dict[str, List[Tuple]]], Awaitable[Optional[int]]],
+        max_batch: int = 50,
+        flush_interval: float = 0.5,
+        max_queue: int = 1000
+    ):
+        self._write = write
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self._pending: List[Tuple[str, Tuple]] = []
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.queued = 0
+        self.flushed = 0
+        self.deferred = 0
+        self.failed = 0
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Counters for queued, flushed, deferred and failed rows plus the current backlog."""
+        return {
+            "queued": self.queued,
+            "flushed": self.flushed,
+            "deferred": self.deferred,
+            "failed": self.failed,
+            "backlog": self._queue.qsize() + len(self._pending)
+        }
+
+    async def enqueue(self, sql: str, row: Tuple):
+        """Queue a row for the given INSERT statement, waiting if the queue is full."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._flush_loop(), name="oluja-batch-writer")
+        await self._queue.put((sql, row))
+        self.queued += 1
+
+    async def _flush_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            self._pending.append(await self._queue.get())
+            deadline = loop.time() + self.flush_interval
+            while len(self._pending) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    self._pending.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            # Shielded so a cancellation from close() never drops rows that are already being written.
+            await asyncio.shield(self._write_pending())
+
+    async def _write_pending(self):
+        async with self._lock:
+            rows, self._pending = self._pending, []
+            if not rows:
+                return
+            batches: Dict[str, List[Tuple]] = {}
+            for sql, row in rows:
+                batches.setdefault(sql, []).append(row)
+            try:
+                deferred = await self._write(batches) or 0
+                self.flushed += len(rows) - deferred
+                self.deferred += deferred
+            except Exception as e:
+                self.failed += len(rows)
+                logging.error(f"Error writing batch of {len(rows)} rows: {e}")
+
+    async def flush(self):
+        """Write every queued row now, e.g. before a cog is unloaded."""
+        while True:
+            try:
+                self._pending.append(self._queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        await self._write_pending()
+
+    async def close(self):
+        """Stop the background flusher and write out everything that is still queued."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
@@ -0,0 +1,200 @@
+import asyncio
+from datetime import datetime
+import logging
+import re
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import quote
+import aiohttp
+import config
+from utils.cache import TTLCache
+from utils.metrics import metrics
+
+logger = logging.getLogger("OperationOlujaBot")
+
+COC_API_REQUESTS = metrics.counter(
+    "oluja_coc_api_requests_total", "Clash of Clans API requests by endpoint and status (0 = no response)", ("endpoint", "status")
+)
+COC_API_SECONDS = metrics.histogram(
+    "oluja_coc_api_request_seconds", "Duration of Clash of Clans API requests by endpoint", ("endpoint",)
+)
+COC_API_LOOKUPS = metrics.counter(
+    "oluja_coc_api_lookups_total", "Clash of Clans API lookups by endpoint and whether they hit the cache, joined an in-flight request or went out", ("endpoint", "result")
+)
+COC_API_THROTTLE_SECONDS = metrics.histogram(
+    "oluja_coc_api_throttle_seconds", "Time a Clash of Clans API request waited for the rate limiter",
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+)
+
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+class ClashApiError(Exception):
+    """An API request failed; `status` is the HTTP status, or 0 if the API could not be reached."""
+
+    def __init__(self, status: int, reason: str, message: str = ""):
+        super().__init__(f"{status} {reason}: {message}" if message else f"{status} {reason}")
+        self.status = status
+        self.reason = reason
+
+class NotFound(ClashApiError):
+    """The requested player, clan or war does not exist."""
+
+def normalize_tag(tag: str) -> str:
+    tag = tag.strip().upper()
+    return tag if tag.startswith("#") else f"#{tag}"
+
+def cache_ttl(cache_control: Optional[str], default: float) -> float:
+    """Seconds a response may be cached according to its Cache-Control header; 0 means not at all."""
+    if not cache_control:
+        return default
+    if "no-store" in cache_control or "no-cache" in cache_control:
+        return 0
+    match = _MAX_AGE.search(cache_control)
+    return int(match.group(1)) if match else default
+
+def parse_time(value: str) -> datetime:
+    """API timestamps like 20261018T180000.000Z as naive UTC."""
+    return datetime.strptime(value, "%Y%m%dT%H%M%S.%fZ")
+
+class TokenBucket:
+    """
+    Paces requests to `rate` per second with bursts of up to `burst`.
+    Every caller reserves a token up front, so waiters are served in arrival order without a lock.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+
+    async def acquire(self) -> float:
+        """Take a token, sleeping until it is available. Returns the seconds waited."""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= 1
+        if self._tokens >= 0:
+            return 0.0
+        wait = -self._tokens / self.rate
+        try:
+            await asyncio.sleep(wait)
+        except asyncio.CancelledError:
+            self._tokens += 1
+            raise
+        return wait
+
+class ClashClient:
+    """
+    Client for the Clash of Clans API shared by all cogs.
+    Requests go through one pooled HTTP session and a token bucket. Responses are cached per endpoint
+    and tag for as long as the API's Cache-Control header allows, and concurrent lookups of the same
+    resource share one request.
+    """
+
+    def __init__(self, base_url: str, token: str, rate: float = 10, burst: int = 10, timeout: float = 10,
+                 connections: int = 10, cache_size: int = 512, cache_ttl: float = 60):
+        self.base_url = base_url.rstrip("/")
+        self.token = token
+        self.timeout = timeout
+        self.connections = connections
+        self.default_ttl = cache_ttl
+        self.bucket = TokenBucket(rate, burst)
+        self.cache = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+        self._inflight: Dict[Tuple[str, str], asyncio.Task] = {}
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.token)
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        # Created lazily, so the session belongs to the running event loop
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.connections, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={"Authorization": f"Bearer {self.token}", "Accept": "application/json"}
+            )
+        return self._session
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _fetch(self, endpoint: str, path: str, key: Tuple[str, str]) -> dict:
+        waited = await self.bucket.acquire()
+        COC_API_THROTTLE_SECONDS.observe(waited)
+        start = time.perf_counter()
+        status = 0
+        try:
+            async with self._get_session().get(f"{self.base_url}{path}") as response:
+                status = response.status
+                try:
+                    data = await response.json(content_type=None)
+                except ValueError:
+                    data = {}
+                if status != 200:
+                    data = data if isinstance(data, dict) else {}
+                    error = NotFound if status == 404 else ClashApiError
+                    raise error(status, data.get("reason", response.reason or "error"), data.get("message", ""))
+                ttl = cache_ttl(response.headers.get("Cache-Control"), self.default_ttl)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.warning(f"Clash of Clans API unreachable for {endpoint}: {e!r}")
+            raise ClashApiError(0, "unreachable", str(e) or type(e).__name__) from e
+        finally:
+            COC_API_REQUESTS.inc(endpoint, status)
+            COC_API_SECONDS.observe(time.perf_counter() - start, endpoint)
+        if ttl > 0:
+            self.cache.set(key, data, ttl=ttl)
+        return data
+
+    def _forget(self, key: Tuple[str, str], task: asyncio.Task):
+        self._inflight.pop(key, None)
+        # Retrieve the exception, in case every caller stopped waiting for the request
+        if not task.cancelled():
+            task.exception()
+
+    async def get(self, endpoint: str, path: str, tag: str) -> dict:
+        """The response for `path`, from the cache or an in-flight request of the same endpoint and tag if possible."""
+        key = (endpoint, tag)
+        data = self.cache.get(key)
+        if data is not None:
+            COC_API_LOOKUPS.inc(endpoint, "hit")
+            return data
+        task = self._inflight.get(key)
+        if task is not None:
+            COC_API_LOOKUPS.inc(endpoint, "shared")
+        else:
+            COC_API_LOOKUPS.inc(endpoint, "miss")
+            task = asyncio.create_task(self._fetch(endpoint, path, key), name=f"oluja-coc-{endpoint}")
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        # Shielded, so a caller that gives up does not cancel the request for the others
+        return await asyncio.shield(task)
+
+    async def get_player(self, tag: str) -> dict:
+        tag = normalize_tag(tag)
+        return await self.get("players", f"/players/{quote(tag)}", tag)
+
+    async def get_clan(self, tag: str) -> dict:
+        tag = normalize_tag(tag)
+        return await self.get("clans", f"/clans/{quote(tag)}", tag)
+
+    async def get_current_war(self, clan_tag: str) -> dict:
+        """The clan's current regular war; raises ClashApiError with status 403 if its war log is private."""
+        clan_tag = normalize_tag(clan_tag)
+        return await self.get("currentwar", f"/clans/{quote(clan_tag)}/currentwar", clan_tag)
+
+coc_api = ClashClient(
+    config.COC_API_URL,
+    config.COC_API_TOKEN,
+    rate=config.COC_API_RATE,
+    burst=config.COC_API_BURST,
+    timeout=config.COC_API_TIMEOUT,
+    connections=config.COC_API_CONNECTIONS,
+    cache_size=config.COC_API_CACHE_SIZE,
+    cache_ttl=config.COC_API_CACHE_TTL
+)
+metrics.gauge("oluja_coc_api_cache_entries", "Clash of Clans API responses held in the cache", lambda: len(coc_api.cache))
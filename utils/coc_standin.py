@@ -0,0 +1,127 @@
+"""
+Local stand-in for the Clash of Clans API, for running and testing the bot offline.
+
+    python -m utils.coc_standin [port]
+
+and point config.COC_API_URL at http://127.0.0.1:8086/v1 with any non-empty COC_API_TOKEN.
+It serves the player, clan and current-war endpoints the bot uses from fixture data, with the
+API's error format and Cache-Control headers.
+"""
+import asyncio
+from collections import Counter
+from datetime import datetime, timedelta
+import logging
+import sys
+from typing import Optional
+from aiohttp import web
+import config
+from utils.coc_api import normalize_tag
+
+logger = logging.getLogger("OperationOlujaBot")
+
+CLAN_TAG = "#2PP"
+
+def api_time(value: datetime) -> str:
+    return value.strftime("%Y%m%dT%H%M%S.000Z")
+
+def default_fixtures(clan_tag: str = CLAN_TAG) -> dict:
+    """Players, clans and wars keyed by tag, the war by the tag of the clan it is requested for."""
+    now = datetime.utcnow()
+    members = [
+        {"tag": "#LJC8V0GCJ", "name": "Sturm", "townHallLevel": 16, "expLevel": 231, "trophies": 5120, "role": "leader"},
+        {"tag": "#9QJ2R8PLY", "name": "Jelacic", "townHallLevel": 15, "expLevel": 198, "trophies": 4630, "role": "coLeader"},
+        {"tag": "#8YV0Q2UCR", "name": "Bura", "townHallLevel": 14, "expLevel": 170, "trophies": 4210, "role": "member"}
+    ]
+    clan = {"tag": clan_tag, "name": "Operation-Oluja", "clanLevel": 18, "members": len(members), "isWarLogPublic": True}
+    players = {
+        member["tag"]: {**member, "clan": {"tag": clan_tag, "name": clan["name"]}}
+        for member in members
+    }
+    war = {
+        "state": "inWar",
+        "teamSize": 15,
+        "attacksPerMember": 2,
+        "preparationStartTime": api_time(now - timedelta(hours=30)),
+        "startTime": api_time(now - timedelta(hours=6)),
+        "endTime": api_time(now + timedelta(hours=18)),
+        "clan": {"tag": clan_tag, "name": clan["name"], "stars": 27, "destructionPercentage": 68.4, "attacks": 19},
+        "opponent": {"tag": "#8LQ2YJP9", "name": "Tempest", "stars": 22, "destructionPercentage": 59.1, "attacks": 17}
+    }
+    return {"players": players, "clans": {clan_tag: clan}, "currentwar": {clan_tag: war}}
+
+class ClashStandInServer:
+    """
+    Serves /v1/players/{tag}, /v1/clans/{tag} and /v1/clans/{tag}/currentwar from fixture data.
+    Requests without a bearer token are refused like the real API does; `requests` counts what was served per endpoint.
+    """
+
+    MAX_AGE = {"players": 60, "clans": 120, "currentwar": 120}
+
+    def __init__(self, fixtures: Optional[dict] = None, delay: float = 0):
+        self.fixtures = fixtures or default_fixtures()
+        self.delay = delay
+        self.requests: Counter = Counter()
+        self._runner: Optional[web.AppRunner] = None
+        self.port: Optional[int] = None
+
+    @staticmethod
+    def _error(status: int, reason: str, message: str) -> web.Response:
+        return web.json_response({"reason": reason, "message": message}, status=status)
+
+    async def _serve(self, endpoint: str, request: web.Request) -> web.Response:
+        self.requests[endpoint] += 1
+        scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+        if scheme != "Bearer" or not token.strip():
+            return self._error(403, "accessDenied", "Invalid authorization")
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        tag = request.match_info["tag"].upper()
+        data = self.fixtures[endpoint].get(tag)
+        if data is None:
+            if endpoint == "currentwar" and tag in self.fixtures["clans"]:
+                return self._error(403, "accessDenied", "War log is private")
+            return self._error(404, "notFound", f"{tag} not found")
+        return web.json_response(data, headers={"Cache-Control": f"public max-age={self.MAX_AGE[endpoint]}"})
+
+    async def _player(self, request: web.Request) -> web.Response:
+        return await self._serve("players", request)
+
+    async def _clan(self, request: web.Request) -> web.Response:
+        return await self._serve("clans", request)
+
+    async def _current_war(self, request: web.Request) -> web.Response:
+        return await self._serve("currentwar", request)
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8086):
+        """Listen on `host`:`port`; port 0 picks a free one, available as `port` afterwards."""
+        app = web.Application()
+        # aiohttp decodes %23 in the path, so the tag arrives with its leading #
+        app.router.add_get("/v1/players/{tag}", self._player)
+        app.router.add_get("/v1/clans/{tag}/currentwar", self._current_war)
+        app.router.add_get("/v1/clans/{tag}", self._clan)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+        self.port = self._runner.addresses[0][1]
+        logger.info(f"Clash of Clans stand-in listening on http://{host}:{self.port}/v1")
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+async def _main(port: int):
+    # The configured clan, so /warstatus has data offline too
+    server = ClashStandInServer(default_fixtures(normalize_tag(config.CLAN_TAG) if config.CLAN_TAG else CLAN_TAG))
+    await server.start(port=port)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(_main(int(sys.argv[1]) if len(sys.argv) > 1 else 8086))
+    except KeyboardInterrupt:
+        pass
@@ -1,15 +1,65 @@
-import mysql.connector
 from datetime import datetime
-from mysql.connector import Error
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import collections
+import functools
+import itertools
+import json
 import logging
-from typing import Optional
+import threading
+from typing import AsyncIterator, List, Optional, Tuple
+import config
+from utils.batch_writer import BatchWriter
+from utils.cache import TTLCache
+from utils.db_backends import DatabaseError, create_backend, is_connection_error
+from utils.metrics import metrics
+from utils.migrations import run_migrations
+from utils.retention import apply_retention
+
+APPLICATION_INSERT = '''
+    INSERT INTO applications
+    (applicant_name, applicant_id, apply_type, spieler_tag, strategien, th_level, status, reason, handled_by, date)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+'''
+MODERATION_LOG_INSERT = '''
+    INSERT INTO moderation_logs
+    (user_id, user_name, action_type, reason, duration, handled_by, date)
+    VALUES (%s, %s, %s, %s, %s, %s, %s)
+'''
+MEMBER_EVENT_INSERT = '''
+    INSERT INTO member_events (user_id, user_name, event_type, guild_id, date)
+    VALUES (%s, %s, %s, %s, %s)
+'''
+TRANSCRIPT_INSERT = '''
+    INSERT INTO ticket_transcripts
+    (guild_id, channel_id, application_id, applicant_id, applicant_name, reason,
+     archive_message_id, archive_url, message_count, size_bytes, created_at)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+'''
+# Single-row inserts that may be replayed from the outage spool with executemany.
+BATCHED_INSERTS = (APPLICATION_INSERT, MODERATION_LOG_INSERT, MEMBER_EVENT_INSERT)
+# Position of the user id in the rows of inserts that change a user's cached history.
+HISTORY_USER_COLUMN = {APPLICATION_INSERT: 1, MODERATION_LOG_INSERT: 0}
+
+SESSION_COLUMNS = (
+    "channel_id", "guild_id", "applicant_id", "applicant_name", "apply_type", "state",
+    "step", "attempts", "answers", "question_message_id", "deadline", "reminder_step", "created_at"
+)
+
+CWL_POLL_UPDATE_COLUMNS = ("channel_id", "channel_name", "duration", "yes_count", "no_count", "date")
 
 class Database:
     """
-    A singleton class to manage MySQL database connections and operations for the Operation-Oluja bot.
+    A singleton class to manage database connections and operations for the Operation-Oluja bot.
     Handles tables for applications, moderation logs, member events, and CWL polls.
+    Storage is delegated to the backend selected in config (MySQL or embedded SQLite).
+    All queries run on a dedicated thread pool, so every public method is awaitable and never blocks the event loop.
+    Lost connections are detected and re-established with exponential backoff; idempotent statements are retried
+    transparently and writes issued during an outage are held in a bounded spool until the link is back.
+    Spooled are the batched inserts and the idempotent upserts/updates (sessions, settings, polls, rate limits);
+    transition_application_state and reads still raise, since their callers need the result.
     """
-    
+
     _instance = None
 
     def __new__(cls):
@@ -19,92 +69,282 @@ class Database:
         return cls._instance
 
     def __init__(self):
-        """Initialize database connection and create necessary tables."""
+        """Set up the storage backend; connections are opened and migrations applied on first use."""
         if hasattr(self, '_initialized') and self._initialized:
             return
+        self.backend = create_backend()
+        self._executor = ThreadPoolExecutor(max_workers=config.DB_POOL_SIZE, thread_name_prefix="oluja-db")
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+        self.writer = BatchWriter(
+            self._write_batches,
+            max_batch=config.DB_BATCH_SIZE,
+            flush_interval=config.DB_BATCH_INTERVAL_MS / 1000,
+            max_queue=config.DB_BATCH_QUEUE_SIZE
+        )
+        self.history_cache = TTLCache(maxsize=config.HISTORY_CACHE_SIZE, ttl=config.HISTORY_CACHE_TTL)
+        self.healthy = True
+        self._spool = collections.deque(maxlen=config.DB_SPOOL_SIZE)
+        self._recovery: Optional[asyncio.Task] = None
+        self.spooled = 0
+        self.replayed = 0
+        self.dropped = 0
+        # Spooled statements the database rejected on replay, kept for inspection instead of retried forever
+        self.dead_letters = collections.deque(maxlen=100)
+        self.dead_lettered = 0
+        self._initialized = True
+
+    @property
+    def spool_stats(self) -> dict:
+        """Counters for statements spooled during outages, replayed afterwards, dropped on overflow or rejected on replay."""
+        return {
+            "spooled": self.spooled,
+            "replayed": self.replayed,
+            "dropped": self.dropped,
+            "dead_lettered": self.dead_lettered,
+            "pending": len(self._spool)
+        }
+
+    async def _run(self, func, *args, idempotent: bool = False, **kwargs):
+        """
+        Run a blocking database operation with a pooled connection on the worker threads.
+        Idempotent operations are retried with exponential backoff when the connection is lost.
+        """
+        loop = asyncio.get_running_loop()
+        call = functools.partial(self._with_connection, func, *args, **kwargs)
+        attempts = config.DB_RETRY_ATTEMPTS if idempotent else 1
+        for attempt in range(attempts):
+            try:
+                return await loop.run_in_executor(self._executor, call)
+            except DatabaseError as e:
+                if not is_connection_error(e):
+                    raise
+                await self._mark_unhealthy(e)
+                if attempt == attempts - 1:
+                    raise
+                await asyncio.sleep(self._backoff(attempt))
+
+    def _backoff(self, attempt: int) -> float:
+        return min(config.DB_BACKOFF_BASE * 2 ** attempt, config.DB_BACKOFF_MAX)
+
+    async def _mark_unhealthy(self, error: Exception):
+        """Record a lost connection, drop pooled connections and start the background recovery."""
+        if self.healthy:
+            logging.warning(f"Database connection lost: {error}")
+            self.healthy = False
+            # Closing connections blocks, so it runs on the worker threads like every other backend call.
+            await asyncio.get_running_loop().run_in_executor(self._executor, self.backend.reconnect)
+        if self._recovery is None or self._recovery.done():
+            self._recovery = asyncio.create_task(self._recover(), name="oluja-db-recovery")
+
+    async def health_check(self) -> bool:
+        """Check the database with a trivial query and update `healthy` accordingly."""
         try:
-            self.conn = mysql.connector.connect(
-                host="localhost",  # Use environment variable or config in production
-                port=3306,
-                user="your_username",  # Replace with environment variable in production
-                password="your_password",  # Replace with environment variable in production
-                database="oluja_data"
-            )
-            self.cursor = self.conn.cursor()
-            self._create_tables()
-            self._initialized = True
-            logging.info("Database connection established and tables initialized.")
-        except Error as e:
-            logging.error(f"Failed to connect to database: {e}")
-            raise
-
-    def _create_tables(self):
-        """Create database tables if they do not exist."""
-        try:
-            # Applications table
-            self.cursor.execute('''
-                CREATE TABLE IF NOT EXISTS applications (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    applicant_name VARCHAR(255) NOT NULL,
-                    applicant_id BIGINT NOT NULL,
-                    apply_type VARCHAR(50) NOT NULL,
-                    spieler_tag VARCHAR(15),
-                    strategien TEXT,
-                    th_level VARCHAR(10),
-                    status VARCHAR(50) NOT NULL,
-                    reason TEXT,
-                    handled_by VARCHAR(255),
-                    date DATETIME NOT NULL
-                )
-            ''')
-
-            # Moderation logs table
-            self.cursor.execute('''
-                CREATE TABLE IF NOT EXISTS moderation_logs (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    user_id BIGINT NOT NULL,
-                    user_name VARCHAR(255) NOT NULL,
-                    action_type VARCHAR(50) NOT NULL,
-                    reason TEXT,
-                    duration INT,
-                    handled_by VARCHAR(255),
-                    date DATETIME NOT NULL
-                )
-            ''')
-
-            # Member events table
-            self.cursor.execute('''
-                CREATE TABLE IF NOT EXISTS member_events (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    user_id BIGINT NOT NULL,
-                    user_name VARCHAR(255) NOT NULL,
-                    event_type VARCHAR(50) NOT NULL,
-                    date DATETIME NOT NULL
-                )
-            ''')
-
-            # CWL polls table
-            self.cursor.execute('''
-                CREATE TABLE IF NOT EXISTS cwl_polls (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    poll_id BIGINT UNIQUE NOT NULL,
-                    channel_id BIGINT NOT NULL,
-                    channel_name VARCHAR(255) NOT NULL,
-                    duration INT NOT NULL,
-                    yes_count INT DEFAULT 0,
-                    no_count INT DEFAULT 0,
-                    date DATETIME NOT NULL
-                )
-            ''')
+            await self._run(self._ping)
+        except DatabaseError:
+            return False
+        if not self.healthy:
+            logging.info("Database connection re-established")
+        self.healthy = True
+        return True
+
+    def _ping(self, conn, cursor):
+        cursor.execute("SELECT 1")
+        cursor.fetchall()
+
+    async def _recover(self):
+        """Probe the database with exponential backoff until it answers, then replay the spool."""
+        attempt = 0
+        while True:
+            if not await self.health_check():
+                await asyncio.sleep(self._backoff(attempt))
+                attempt += 1
+                continue
+            if not self._spool:
+                return
+            entries = [self._spool.popleft() for _ in range(min(len(self._spool), config.DB_BATCH_SIZE))]
+            try:
+                await self._run(self._replay, entries)
+                for sql, params in entries:
+                    self._invalidate_history(sql, params)
+                self.replayed += len(entries)
+                attempt = 0
+            except DatabaseError as e:
+                if is_connection_error(e):
+                    self._spool.extendleft(reversed(entries))
+                    await asyncio.sleep(self._backoff(attempt))
+                    attempt += 1
+                    continue
+                # A statement of the batch was rejected; replay them one by one so only that one is set aside.
+                logging.warning(f"Replaying {len(entries)} spooled statements one by one after: {e}")
+                attempted = []
+                try:
+                    await self._run(self._replay_each, entries, attempted)
+                except DatabaseError:
+                    # Link lost again; what was not attempted yet goes back to the front of the spool.
+                    self._spool.extendleft(reversed(entries[len(attempted):]))
+                for (sql, params), error in attempted:
+                    if error is None:
+                        self._invalidate_history(sql, params)
+                        self.replayed += 1
+                    else:
+                        self._dead_letter(sql, params, error)
 
-            self.conn.commit()
-            logging.info("Database tables created successfully or already exist.")
-        except Error as e:
-            logging.error(f"Error creating tables: {e}")
-            self.conn.rollback()
+    def _spool_statement(self, sql: str, params: Tuple):
+        """Hold a write for replay once the database is reachable again."""
+        if len(self._spool) == self._spool.maxlen:
+            self.dropped += 1
+            if self.dropped % 100 == 1:
+                logging.warning(f"Database spool full, oldest writes dropped ({self.dropped} so far)")
+        self._spool.append((sql, params))
+        self.spooled += 1
+
+    def _replay(self, conn, cursor, entries):
+        try:
+            for sql, group in itertools.groupby(entries, key=lambda entry: entry[0]):
+                params = [entry[1] for entry in group]
+                if sql in BATCHED_INSERTS:
+                    cursor.executemany(sql, params)
+                else:
+                    for row in params:
+                        cursor.execute(sql, row)
+                if sql == MEMBER_EVENT_INSERT:
+                    self._update_member_rollups(cursor, params)
+            conn.commit()
+            logging.info(f"Replayed {len(entries)} spooled statements")
+        except DatabaseError as e:
+            logging.error(f"Error replaying spooled statements: {e}")
+            conn.rollback()
             raise
 
-    def add_application(
+    def _replay_each(self, conn, cursor, entries, attempted):
+        """
+        Replay spooled statements in a transaction each. `attempted` collects ((sql, params), error) for every
+        statement that was committed (error None) or rejected; a connection error is raised for the caller.
+        """
+        for sql, params in entries:
+            try:
+                cursor.execute(sql, params)
+                if sql == MEMBER_EVENT_INSERT:
+                    self._update_member_rollups(cursor, [params])
+                conn.commit()
+                attempted.append(((sql, params), None))
+            except DatabaseError as e:
+                conn.rollback()
+                if is_connection_error(e):
+                    raise
+                attempted.append(((sql, params), e))
+
+    def _dead_letter(self, sql: str, params: Tuple, error: Exception):
+        """Set aside a spooled statement the database rejected, so it does not block the rest of the spool."""
+        logging.error(f"Spooled statement rejected on replay and dead-lettered: {error}\n{' '.join(sql.split())} {params!r}")
+        self.dead_letters.append((sql, params, str(error)))
+        self.dead_lettered += 1
+
+    @property
+    def _replay_pending(self) -> bool:
+        """
+        Whether spooled writes are waiting or being replayed. A batch taken off the spool is still in flight
+        until _recover is done with it, so newer writes must queue behind it rather than go straight through.
+        """
+        return bool(self._spool) or (self._recovery is not None and not self._recovery.done())
+
+    async def _write_or_spool(self, what: str, func, sql: str, params: Tuple, *args):
+        """
+        Run an idempotent write, retrying lost connections. If the database stays unreachable, or earlier
+        writes are still waiting in the spool, the statement is spooled for replay in order instead of raising.
+        """
+        if not self._replay_pending:
+            try:
+                await self._run(func, sql, params, *args, idempotent=True)
+                return
+            except DatabaseError as e:
+                if not is_connection_error(e):
+                    raise
+        logging.warning(f"Database unreachable or replay pending, {what} spooled")
+        self._spool_statement(sql, params)
+        if self._recovery is None or self._recovery.done():
+            self._recovery = asyncio.create_task(self._recover(), name="oluja-db-recovery")
+
+    def _with_connection(self, func, *args, **kwargs):
+        with self.backend.connection() as conn:
+            self._ensure_schema(conn)
+            cursor = self.backend.cursor(conn)
+            try:
+                return func(conn, cursor, *args, **kwargs)
+            finally:
+                cursor.close()
+
+    def _ensure_schema(self, conn):
+        if self._schema_ready:
+            return
+        with self._schema_lock:
+            if self._schema_ready:
+                return
+            run_migrations(self.backend, conn)
+            self._schema_ready = True
+            logging.info("Database connection established and schema is up to date.")
+
+    async def _write_batches(self, batches: dict) -> int:
+        """
+        Write buffered rows from the batch writer in a single transaction.
+        While the database is unreachable the rows are spooled instead; returns the number of spooled rows.
+        """
+        if self.healthy:
+            try:
+                await self._run(self._executemany, batches)
+                # Drop history that was cached while these rows were still queued.
+                for sql, rows in batches.items():
+                    for row in rows:
+                        self._invalidate_history(sql, row)
+                return 0
+            except DatabaseError as e:
+                if not is_connection_error(e):
+                    raise
+        for sql, rows in batches.items():
+            for row in rows:
+                self._spool_statement(sql, row)
+        return sum(len(rows) for rows in batches.values())
+
+    def _executemany(self, conn, cursor, batches):
+        try:
+            for sql, rows in batches.items():
+                cursor.executemany(sql, rows)
+            if MEMBER_EVENT_INSERT in batches:
+                self._update_member_rollups(cursor, batches[MEMBER_EVENT_INSERT])
+            conn.commit()
+            logging.info(f"Batch written: {sum(len(rows) for rows in batches.values())} rows")
+        except DatabaseError as e:
+            logging.error(f"Error writing batch: {e}")
+            conn.rollback()
+            raise
+
+    def _update_member_rollups(self, cursor, rows):
+        """Add freshly written member events to the daily per-guild rollup, in the caller's transaction."""
+        counts = {}
+        for user_id, user_name, event_type, guild_id, date in rows:
+            if guild_id is None or event_type not in ("Join", "Leave"):
+                continue
+            joins, leaves = counts.get((guild_id, date.date()), (0, 0))
+            counts[(guild_id, date.date())] = (joins + (event_type == "Join"), leaves + (event_type == "Leave"))
+        if not counts:
+            return
+        sql = f'''
+            INSERT INTO member_event_daily (guild_id, day, joins, leaves)
+            VALUES {", ".join(["(%s, %s, %s, %s)"] * len(counts))}
+            {self.backend.upsert_clause("guild_id, day", ("joins", "leaves"), increment=True)}
+        '''
+        params = []
+        for (guild_id, day), (joins, leaves) in counts.items():
+            params.extend((guild_id, day, joins, leaves))
+        cursor.execute(sql, tuple(params))
+
+    def _invalidate_history(self, sql: str, row: Tuple):
+        column = HISTORY_USER_COLUMN.get(sql)
+        if column is not None:
+            self.history_cache.invalidate(row[column])
+
+    async def add_application(
         self,
         applicant_name: str,
         applicant_id: int,
@@ -116,26 +356,15 @@ class Database:
         reason: Optional[str],
         handled_by: Optional[str]
     ):
-        """Add a new application to the database."""
-        try:
-            date = datetime.utcnow()
-            sql = '''
-                INSERT INTO applications 
-                (applicant_name, applicant_id, apply_type, spieler_tag, strategien, th_level, status, reason, handled_by, date)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            '''
-            self.cursor.execute(sql, (
-                applicant_name, applicant_id, apply_type, spieler_tag, strategien, 
-                th_level, status, reason, handled_by, date
-            ))
-            self.conn.commit()
-            logging.info(f"Application added for {applicant_name} (ID: {applicant_id})")
-        except Error as e:
-            logging.error(f"Error adding application for {applicant_name}: {e}")
-            self.conn.rollback()
-            raise
+        """Queue a new application for the next batched write."""
+        date = datetime.utcnow()
+        self.history_cache.invalidate(applicant_id)
+        await self.writer.enqueue(APPLICATION_INSERT, (
+            applicant_name, applicant_id, apply_type, spieler_tag, strategien,
+            th_level, status, reason, handled_by, date
+        ))
 
-    def add_moderation_log(
+    async def add_moderation_log(
         self,
         user_id: int,
         user_name: str,
@@ -144,93 +373,516 @@ class Database:
         duration: Optional[int],
         handled_by: Optional[str]
     ):
-        """Add a moderation log entry to the database."""
+        """Queue a moderation log entry for the next batched write."""
+        date = datetime.utcnow()
+        self.history_cache.invalidate(user_id)
+        await self.writer.enqueue(MODERATION_LOG_INSERT, (user_id, user_name, action_type, reason, duration, handled_by, date))
+
+    async def add_member_event(self, user_id: int, user_name: str, event_type: str, guild_id: Optional[int] = None):
+        """Queue a member event for the next batched write; Join/Leave events also update the daily rollup."""
+        date = datetime.utcnow()
+        await self.writer.enqueue(MEMBER_EVENT_INSERT, (user_id, user_name, event_type, guild_id, date))
+
+    async def add_transcript(
+        self,
+        guild_id: int,
+        channel_id: int,
+        application_id: Optional[int],
+        applicant_id: Optional[int],
+        applicant_name: Optional[str],
+        reason: str,
+        archive_message_id: int,
+        archive_url: str,
+        message_count: int,
+        size_bytes: int
+    ):
+        """
+        Write the index entry of an archived ticket transcript right away, not through the batch writer,
+        so it is committed before the ticket channel is deleted. Raises DatabaseError if that fails.
+        """
+        await self._run(self._add_transcript, (
+            guild_id, channel_id, application_id, applicant_id, applicant_name, reason,
+            archive_message_id, archive_url, message_count, size_bytes, datetime.utcnow()
+        ))
+
+    def _add_transcript(self, conn, cursor, params):
         try:
-            date = datetime.utcnow()
-            sql = '''
-                INSERT INTO moderation_logs 
-                (user_id, user_name, action_type, reason, duration, handled_by, date)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-            '''
-            self.cursor.execute(sql, (user_id, user_name, action_type, reason, duration, handled_by, date))
-            self.conn.commit()
-            logging.info(f"Moderation log added for {user_name} (Action: {action_type})")
-        except Error as e:
-            logging.error(f"Error adding moderation log for {user_name}: {e}")
-            self.conn.rollback()
+            cursor.execute(TRANSCRIPT_INSERT, params)
+            conn.commit()
+        except DatabaseError as e:
+            logging.error(f"Error saving transcript of channel {params[1]}: {e}")
+            conn.rollback()
             raise
 
-    def add_member_event(self, user_id: int, user_name: str, event_type: str):
-        """Add a member event to the database."""
+    async def get_transcripts(self, guild_id: int, applicant_id: int, limit: int = 10) -> List[dict]:
+        """An applicant's most recent archived ticket transcripts in a guild, newest first."""
+        return await self._run(self._get_transcripts, guild_id, applicant_id, limit, idempotent=True)
+
+    def _get_transcripts(self, conn, cursor, guild_id, applicant_id, limit):
         try:
-            date = datetime.utcnow()
-            sql = '''
-                INSERT INTO member_events (user_id, user_name, event_type, date)
-                VALUES (%s, %s, %s, %s)
-            '''
-            self.cursor.execute(sql, (user_id, user_name, event_type, date))
-            self.conn.commit()
-            logging.info(f"Member event '{event_type}' added for {user_name}")
-        except Error as e:
-            logging.error(f"Error adding member event for {user_name}: {e}")
-            self.conn.rollback()
+            cursor.execute('''
+                SELECT id, channel_id, application_id, applicant_name, reason, archive_message_id,
+                       archive_url, message_count, size_bytes, created_at
+                FROM ticket_transcripts
+                WHERE guild_id = %s AND applicant_id = %s
+                ORDER BY id DESC
+                LIMIT %s
+            ''', (guild_id, applicant_id, limit))
+            columns = [col[0] for col in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+        except DatabaseError as e:
+            logging.error(f"Error retrieving transcripts for applicant {applicant_id}: {e}")
             raise
 
-    def add_cwl_poll(self, poll_id: int, channel_id: int, channel_name: str, duration: int, yes_count: int, no_count: int):
+    async def get_member_growth(self, guild_id: int, since: datetime) -> List[dict]:
+        """Daily joins, leaves and net growth of a guild since the given day, read from the rollup table."""
+        return await self._run(self._get_member_growth, guild_id, since.date(), idempotent=True)
+
+    def _get_member_growth(self, conn, cursor, guild_id, since):
+        try:
+            cursor.execute(
+                "SELECT day, joins, leaves, joins - leaves AS net FROM member_event_daily "
+                "WHERE guild_id = %s AND day >= %s ORDER BY day",
+                (guild_id, since)
+            )
+            columns = [col[0] for col in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+        except DatabaseError as e:
+            logging.error(f"Error retrieving member growth for guild {guild_id}: {e}")
+            raise
+
+    async def backfill_member_rollups(self, guild_id: int) -> Tuple[int, int, int]:
+        """
+        Rebuild the daily rollup from the raw member events of a guild.
+        Events recorded before guild ids were stored are assigned to this guild only if their user's other
+        events all belong to it; events that cannot be attributed keep guild_id NULL and stay out of every
+        per-guild rollup. Returns the number of days, of events attributed now and of events left unattributed.
+        """
+        await self.writer.flush()
+        return await self._run(self._backfill_member_rollups, guild_id)
+
+    def _backfill_member_rollups(self, conn, cursor, guild_id):
+        try:
+            # The derived table lets MySQL read member_events while updating it.
+            cursor.execute('''
+                UPDATE member_events SET guild_id = %s
+                WHERE guild_id IS NULL AND user_id IN (
+                    SELECT user_id FROM (
+                        SELECT user_id FROM member_events
+                        WHERE guild_id IS NOT NULL
+                        GROUP BY user_id
+                        HAVING COUNT(DISTINCT guild_id) = 1 AND MIN(guild_id) = %s
+                    ) AS single_guild_users
+                )
+            ''', (guild_id, guild_id))
+            attributed = cursor.rowcount
+            cursor.execute("SELECT COUNT(*) FROM member_events WHERE guild_id IS NULL")
+            unattributed = cursor.fetchone()[0]
+            cursor.execute("DELETE FROM member_event_daily WHERE guild_id = %s", (guild_id,))
+            cursor.execute('''
+                INSERT INTO member_event_daily (guild_id, day, joins, leaves)
+                SELECT guild_id, DATE(date),
+                    SUM(CASE WHEN event_type = 'Join' THEN 1 ELSE 0 END),
+                    SUM(CASE WHEN event_type = 'Leave' THEN 1 ELSE 0 END)
+                FROM member_events
+                WHERE guild_id = %s
+                GROUP BY guild_id, DATE(date)
+            ''', (guild_id,))
+            days = cursor.rowcount
+            conn.commit()
+            logging.info(f"Member rollup rebuilt for guild {guild_id}: {days} days, {attributed} events attributed, {unattributed} without guild")
+            return days, attributed, unattributed
+        except DatabaseError as e:
+            logging.error(f"Error rebuilding member rollup for guild {guild_id}: {e}")
+            conn.rollback()
+            raise
+
+    async def add_cwl_poll(self, poll_id: int, channel_id: int, channel_name: str, duration: int, yes_count: int, no_count: int):
         """Add or update a CWL poll in the database."""
+        await self.save_cwl_polls([{
+            "poll_id": poll_id,
+            "channel_id": channel_id,
+            "channel_name": channel_name,
+            "duration": duration,
+            "yes_count": yes_count,
+            "no_count": no_count
+        }])
+
+    async def save_cwl_polls(self, polls: List[dict]):
+        """
+        Upsert snapshots of several CWL polls in one statement and one commit.
+        Each dict needs the keys poll_id, channel_id, channel_name, duration, yes_count and no_count.
+        """
+        if not polls:
+            return
+        sql, params = self._cwl_poll_upsert(polls)
+        # Upserts are idempotent, so they are safe to retry after a dropped connection.
+        await self._write_or_spool(f"{len(polls)} CWL poll(s)", self._save_cwl_polls, sql, params, len(polls))
+
+    def _cwl_poll_upsert(self, polls):
+        date = datetime.utcnow()
+        # One multi-row upsert against the UNIQUE poll_id instead of a SELECT plus UPDATE/INSERT per poll.
+        sql = f'''
+            INSERT INTO cwl_polls (poll_id, channel_id, channel_name, duration, yes_count, no_count, date)
+            VALUES {", ".join(["(%s, %s, %s, %s, %s, %s, %s)"] * len(polls))}
+            {self.backend.upsert_clause("poll_id", CWL_POLL_UPDATE_COLUMNS)}
+        '''
+        params = []
+        for poll in polls:
+            params.extend((
+                poll["poll_id"], poll["channel_id"], poll["channel_name"], poll["duration"],
+                poll["yes_count"], poll["no_count"], date
+            ))
+        return sql, tuple(params)
+
+    def _save_cwl_polls(self, conn, cursor, sql, params, count):
         try:
-            date = datetime.utcnow()
-            self.cursor.execute("SELECT id FROM cwl_polls WHERE poll_id = %s", (poll_id,))
-            if self.cursor.fetchone():
-                sql = '''
-                    UPDATE cwl_polls 
-                    SET channel_id = %s, channel_name = %s, duration = %s, yes_count = %s, no_count = %s, date = %s
-                    WHERE poll_id = %s
-                '''
-                self.cursor.execute(sql, (channel_id, channel_name, duration, yes_count, no_count, date, poll_id))
-                logging.info(f"CWL poll {poll_id} updated: Yes={yes_count}, No={no_count}")
-            else:
-                sql = '''
-                    INSERT INTO cwl_polls (poll_id, channel_id, channel_name, duration, yes_count, no_count, date)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s)
-                '''
-                self.cursor.execute(sql, (poll_id, channel_id, channel_name, duration, yes_count, no_count, date))
-                logging.info(f"CWL poll {poll_id} created: Yes={yes_count}, No={no_count}")
-            self.conn.commit()
-        except Error as e:
-            logging.error(f"Error saving CWL poll {poll_id}: {e}")
-            self.conn.rollback()
-            raise
-
-    def get_applications(self, status: Optional[str] = None) -> list:
+            cursor.execute(sql, params)
+            conn.commit()
+            logging.info(f"{count} CWL poll(s) saved")
+        except DatabaseError as e:
+            logging.error(f"Error saving CWL polls: {e}")
+            conn.rollback()
+            raise
+
+    async def get_guild_settings(self) -> List[dict]:
+        """All pinned guild settings as dicts with guild_id, name and target_id."""
+        return await self._run(self._get_guild_settings, idempotent=True)
+
+    def _get_guild_settings(self, conn, cursor):
+        try:
+            cursor.execute("SELECT guild_id, name, target_id FROM guild_settings")
+            columns = [col[0] for col in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+        except DatabaseError as e:
+            logging.error(f"Error retrieving guild settings: {e}")
+            raise
+
+    async def set_guild_setting(self, guild_id: int, name: str, target_id: Optional[int]):
+        """Pin a guild setting to an id, or remove the pin when `target_id` is None."""
+        if target_id is None:
+            sql = "DELETE FROM guild_settings WHERE guild_id = %s AND name = %s"
+            params = (guild_id, name)
+        else:
+            sql = f'''
+                INSERT INTO guild_settings (guild_id, name, target_id, updated_at) VALUES (%s, %s, %s, %s)
+                {self.backend.upsert_clause("guild_id, name", ("target_id", "updated_at"))}
+            '''
+            params = (guild_id, name, target_id, datetime.utcnow())
+        await self._write_or_spool(f"guild setting {name}", self._set_guild_setting, sql, params, guild_id, name)
+
+    def _set_guild_setting(self, conn, cursor, sql, params, guild_id, name):
+        try:
+            cursor.execute(sql, params)
+            conn.commit()
+            logging.info(f"Guild setting {name} updated for guild {guild_id}")
+        except DatabaseError as e:
+            logging.error(f"Error updating guild setting {name} for guild {guild_id}: {e}")
+            conn.rollback()
+            raise
+
+    async def save_application_session(self, session: dict):
+        """
+        Insert or update the persisted state of an application, keyed by its ticket channel.
+        `session` needs every key of SESSION_COLUMNS; answers are stored as a JSON list.
+        """
+        sql = f'''
+            INSERT INTO application_sessions ({", ".join(SESSION_COLUMNS)})
+            VALUES ({", ".join(["%s"] * len(SESSION_COLUMNS))})
+            {self.backend.upsert_clause("channel_id", SESSION_COLUMNS[1:-1])}
+        '''
+        params = tuple(
+            json.dumps(session[column], ensure_ascii=False) if column == "answers" else session[column]
+            for column in SESSION_COLUMNS
+        )
+        await self._write_or_spool(f"application session {session['channel_id']}", self._save_application_session, sql, params, session["channel_id"])
+
+    def _save_application_session(self, conn, cursor, sql, params, channel_id):
+        try:
+            cursor.execute(sql, params)
+            conn.commit()
+        except DatabaseError as e:
+            logging.error(f"Error saving application session for channel {channel_id}: {e}")
+            conn.rollback()
+            raise
+
+    async def get_application_sessions(self, state: Optional[str] = None) -> List[dict]:
+        """Persisted application sessions, optionally only those in the given state."""
+        return await self._run(self._get_application_sessions, state, idempotent=True)
+
+    def _get_application_sessions(self, conn, cursor, state):
+        try:
+            query = "SELECT id, " + ", ".join(SESSION_COLUMNS) + " FROM application_sessions"
+            params = ()
+            if state:
+                query += " WHERE state = %s"
+                params = (state,)
+            cursor.execute(query, params)
+            columns = [col[0] for col in cursor.description]
+            sessions = [dict(zip(columns, row)) for row in cursor.fetchall()]
+            for session in sessions:
+                session["answers"] = json.loads(session["answers"])
+            return sessions
+        except DatabaseError as e:
+            logging.error(f"Error retrieving application sessions: {e}")
+            raise
+
+    async def save_rate_limits(self, rows: List[Tuple]):
+        """Upsert persisted rate-limit buckets given as (name, scope_id, tokens, updated_at) rows."""
+        if not rows:
+            return
+        sql = f'''
+            INSERT INTO rate_limits (name, scope_id, tokens, updated_at)
+            VALUES {", ".join(["(%s, %s, %s, %s)"] * len(rows))}
+            {self.backend.upsert_clause("name, scope_id", ("tokens", "updated_at"))}
+        '''
+        params = tuple(value for row in rows for value in row)
+        await self._write_or_spool(f"{len(rows)} rate limits", self._save_rate_limits, sql, params, len(rows))
+
+    def _save_rate_limits(self, conn, cursor, sql, params, count):
+        try:
+            cursor.execute(sql, params)
+            conn.commit()
+        except DatabaseError as e:
+            logging.error(f"Error saving {count} rate limits: {e}")
+            conn.rollback()
+            raise
+
+    async def load_rate_limits(self, since: datetime) -> List[dict]:
+        """Drop persisted rate-limit buckets last used before `since` and return the rest."""
+        return await self._run(self._load_rate_limits, since, idempotent=True)
+
+    def _load_rate_limits(self, conn, cursor, since):
+        try:
+            cursor.execute("DELETE FROM rate_limits WHERE updated_at < %s", (since,))
+            conn.commit()
+            cursor.execute("SELECT name, scope_id, tokens, updated_at FROM rate_limits")
+            columns = [col[0] for col in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+        except DatabaseError as e:
+            logging.error(f"Error loading rate limits: {e}")
+            conn.rollback()
+            raise
+
+    async def get_application_session(self, channel_id: int) -> Optional[dict]:
+        """The persisted application of a ticket channel, or None."""
+        return await self._run(self._get_application_session, channel_id, idempotent=True)
+
+    def _get_application_session(self, conn, cursor, channel_id):
+        try:
+            cursor.execute(
+                "SELECT id, " + ", ".join(SESSION_COLUMNS) + " FROM application_sessions WHERE channel_id = %s",
+                (channel_id,)
+            )
+            row = cursor.fetchone()
+            if row is None:
+                return None
+            session = dict(zip([col[0] for col in cursor.description], row))
+            session["answers"] = json.loads(session["answers"])
+            return session
+        except DatabaseError as e:
+            logging.error(f"Error retrieving application session for channel {channel_id}: {e}")
+            raise
+
+    async def transition_application_state(self, channel_id: int, from_state: str, to_state: str) -> bool:
+        """
+        Move an application from one state to another in a single UPDATE.
+        Returns False if it was not in `from_state`, e.g. because another admin already decided it.
+        Unlike the other session writes this is never spooled, since the caller needs the outcome now;
+        it raises DatabaseError if the database is unreachable.
+        """
+        return await self._run(self._transition_application_state, channel_id, from_state, to_state)
+
+    def _transition_application_state(self, conn, cursor, channel_id, from_state, to_state):
+        try:
+            cursor.execute(
+                "UPDATE application_sessions SET state = %s WHERE channel_id = %s AND state = %s",
+                (to_state, channel_id, from_state)
+            )
+            conn.commit()
+            return cursor.rowcount == 1
+        except DatabaseError as e:
+            logging.error(f"Error updating application state for channel {channel_id}: {e}")
+            conn.rollback()
+            raise
+
+    async def set_application_state(self, channel_id: int, state: str):
+        """Change only the state of a persisted application, e.g. when its ticket is accepted."""
+        sql = "UPDATE application_sessions SET state = %s WHERE channel_id = %s"
+        await self._write_or_spool(f"state of application {channel_id}", self._set_application_state, sql, (state, channel_id), channel_id)
+
+    def _set_application_state(self, conn, cursor, sql, params, channel_id):
+        try:
+            cursor.execute(sql, params)
+            conn.commit()
+        except DatabaseError as e:
+            logging.error(f"Error updating application state for channel {channel_id}: {e}")
+            conn.rollback()
+            raise
+
+    async def set_reminder_step(self, channel_id: int, step: int):
+        """Record the last reminder step posted for an open ticket."""
+        sql = "UPDATE application_sessions SET reminder_step = %s WHERE channel_id = %s"
+        await self._write_or_spool(f"reminder step of application {channel_id}", self._set_reminder_step, sql, (step, channel_id), channel_id)
+
+    def _set_reminder_step(self, conn, cursor, sql, params, channel_id):
+        try:
+            cursor.execute(sql, params)
+            conn.commit()
+        except DatabaseError as e:
+            logging.error(f"Error updating reminder step for channel {channel_id}: {e}")
+            conn.rollback()
+            raise
+
+    async def delete_application_session(self, channel_id: int):
+        sql = "DELETE FROM application_sessions WHERE channel_id = %s"
+        await self._write_or_spool(f"deletion of application {channel_id}", self._delete_application_session, sql, (channel_id,), channel_id)
+
+    def _delete_application_session(self, conn, cursor, sql, params, channel_id):
+        try:
+            cursor.execute(sql, params)
+            conn.commit()
+        except DatabaseError as e:
+            logging.error(f"Error deleting application session for channel {channel_id}: {e}")
+            conn.rollback()
+            raise
+
+    async def get_applications(self, status: Optional[str] = None) -> list:
         """Retrieve applications from the database, optionally filtered by status."""
+        return [app async for app in self.iter_applications(status=status)]
+
+    async def query_applications(
+        self,
+        status: Optional[str] = None,
+        apply_type: Optional[str] = None,
+        applicant_id: Optional[int] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        after_id: int = 0,
+        limit: int = 100
+    ) -> Tuple[List[dict], Optional[int]]:
+        """
+        Retrieve one page of applications matching the given filters, ordered by id.
+        Returns the rows and the cursor to pass as `after_id` for the next page (None on the last page).
+        """
+        rows = await self._run(
+            self._query_applications, status, apply_type, applicant_id, since, until, after_id, limit, idempotent=True
+        )
+        next_id = rows[-1]["id"] if len(rows) == limit else None
+        return rows, next_id
+
+    def _query_applications(self, conn, cursor, status, apply_type, applicant_id, since, until, after_id, limit):
         try:
+            # Keyset pagination: every page is an index range scan starting after the last seen id.
+            clauses, params = ["id > %s"], [after_id]
             if status:
-                self.cursor.execute("SELECT * FROM applications WHERE status = %s", (status,))
-            else:
-                self.cursor.execute("SELECT * FROM applications")
-            columns = [col[0] for col in self.cursor.description]
-            return [dict(zip(columns, row)) for row in self.cursor.fetchall()]
-        except Error as e:
+                clauses.append("status = %s")
+                params.append(status)
+            if apply_type:
+                clauses.append("apply_type = %s")
+                params.append(apply_type)
+            if applicant_id is not None:
+                clauses.append("applicant_id = %s")
+                params.append(applicant_id)
+            if since:
+                clauses.append("date >= %s")
+                params.append(since)
+            if until:
+                clauses.append("date < %s")
+                params.append(until)
+            params.append(limit)
+            cursor.execute(
+                f"SELECT * FROM applications WHERE {' AND '.join(clauses)} ORDER BY id LIMIT %s",
+                tuple(params)
+            )
+            columns = [col[0] for col in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+        except DatabaseError as e:
             logging.error(f"Error retrieving applications: {e}")
             raise
 
-    def close(self):
-        """Close the database cursor and connection."""
+    async def iter_applications(self, batch_size: int = 500, **filters) -> AsyncIterator[dict]:
+        """
+        Stream applications matching the filters of `query_applications`, one page of `batch_size` rows at a time.
+        Only the current page is held in memory.
+        """
+        after_id = 0
+        while True:
+            rows, after_id = await self.query_applications(after_id=after_id, limit=batch_size, **filters)
+            for row in rows:
+                yield row
+            if after_id is None:
+                return
+
+    async def get_user_history(self, user_id: int) -> dict:
+        """
+        Retrieve a user's HISTORY_LIMIT most recent moderation actions and applications, newest first.
+        Results are served from an LRU/TTL cache that is invalidated whenever new rows for the user are written.
+        """
+        history = self.history_cache.get(user_id)
+        if history is None:
+            history = await self._run(self._get_user_history, user_id, config.HISTORY_LIMIT, idempotent=True)
+            self.history_cache.set(user_id, history)
+        return history
+
+    def _get_user_history(self, conn, cursor, user_id, limit):
         try:
-            self.cursor.close()
-            self.conn.close()
+            cursor.execute(
+                "SELECT action_type, reason, duration, handled_by, date FROM moderation_logs "
+                "WHERE user_id = %s ORDER BY date DESC LIMIT %s",
+                (user_id, limit)
+            )
+            columns = [col[0] for col in cursor.description]
+            moderation = [dict(zip(columns, row)) for row in cursor.fetchall()]
+            cursor.execute(
+                "SELECT apply_type, spieler_tag, status, reason, handled_by, date FROM applications "
+                "WHERE applicant_id = %s ORDER BY date DESC LIMIT %s",
+                (user_id, limit)
+            )
+            columns = [col[0] for col in cursor.description]
+            applications = [dict(zip(columns, row)) for row in cursor.fetchall()]
+            return {"moderation": moderation, "applications": applications}
+        except DatabaseError as e:
+            logging.error(f"Error retrieving history for user {user_id}: {e}")
+            raise
+
+    async def run_retention(self) -> dict:
+        """
+        Archive and drop event-table months older than DB_RETENTION_MONTHS and create upcoming monthly partitions.
+        Returns the number of archived rows per table.
+        """
+        return await self._run(
+            apply_retention, self.backend, config.DB_RETENTION_MONTHS,
+            config.DB_PARTITION_MONTHS_AHEAD, config.DB_ARCHIVE_DIR
+        )
+
+    def reconnect(self):
+        """Drop all idle connections so the next query opens a fresh one."""
+        self.backend.reconnect()
+
+    async def close(self):
+        """Flush buffered writes, close all pooled connections and stop the worker threads."""
+        await self.writer.close()
+        if self._recovery is not None:
+            self._recovery.cancel()
+        if self._spool:
+            logging.warning(f"Database closed with {len(self._spool)} spooled writes that could not be replayed")
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, self.backend.close)
+            self._executor.shutdown(wait=False)
             logging.info("Database connection closed.")
-        except Error as e:
+        except DatabaseError as e:
             logging.error(f"Error closing database connection: {e}")
             raise
 
-# Singleton instance (initialize only when needed)
-db = None
+# Singleton instance (no connection is opened until the first query)
+db = Database()
+
+metrics.gauge("oluja_db_healthy", "1 while the database is reachable, 0 during an outage", lambda: int(db.healthy))
+metrics.gauge("oluja_db_write_backlog", "Rows waiting in the batch writer", lambda: db.writer.stats["backlog"])
+metrics.gauge("oluja_db_spooled_statements", "Statements held in the outage spool", lambda: len(db._spool))
+metrics.gauge("oluja_history_cache_entries", "Entries in the user history cache", lambda: len(db.history_cache))
 
 def get_db() -> Database:
-    """Get the singleton Database instance, initializing it if necessary."""
-    global db
-    if db is None:
-        db = Database()
-    return db
\ No newline at end of file
+    """Get the singleton Database instance."""
+    return db
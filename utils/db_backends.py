@@ -0,0 +1,391 @@
+import mysql.connector
+from mysql.connector.errors import PoolError
+from contextlib import contextmanager
+from datetime import date, datetime
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from typing import Callable, Iterable, Optional
+import config
+from utils.metrics import DB_QUERY_SECONDS, statement_type
+from utils.retention import add_months
+
+# Errors raised by any of the supported drivers.
+DatabaseError = (mysql.connector.Error, sqlite3.Error)
+
+# SQLite result codes (primary code, the low byte of extended codes) that mean the file could not be
+# used right now, as opposed to an error in the statement or the schema.
+SQLITE_UNAVAILABLE_CODES = {
+    5,   # SQLITE_BUSY
+    6,   # SQLITE_LOCKED
+    10,  # SQLITE_IOERR
+    14   # SQLITE_CANTOPEN
+}
+SQLITE_UNAVAILABLE_MESSAGES = ("database is locked", "database table is locked", "unable to open database", "disk i/o error")
+
+def is_connection_error(error: Exception) -> bool:
+    """
+    Check whether an error means the database was unreachable (lost link, exhausted pool, locked file)
+    rather than a problem with the statement itself.
+    sqlite3 raises OperationalError for both, e.g. also for "no such table", so it is told apart by result code.
+    """
+    if isinstance(error, sqlite3.OperationalError):
+        code = getattr(error, "sqlite_errorcode", None)
+        if code is not None:
+            return code & 0xFF in SQLITE_UNAVAILABLE_CODES
+        return str(error).lower().startswith(SQLITE_UNAVAILABLE_MESSAGES)
+    return isinstance(error, (
+        mysql.connector.errors.OperationalError,
+        mysql.connector.errors.InterfaceError,
+        PoolError
+    ))
+
+class MeteredCursor:
+    """
+    Cursor proxy that records the duration of every statement by its type (SELECT, INSERT, ...).
+    """
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def execute(self, sql: str, params=None):
+        start = time.perf_counter()
+        try:
+            return self._cursor.execute(sql) if params is None else self._cursor.execute(sql, params)
+        finally:
+            DB_QUERY_SECONDS.observe(time.perf_counter() - start, statement_type(sql))
+
+    def executemany(self, sql: str, rows):
+        start = time.perf_counter()
+        try:
+            return self._cursor.executemany(sql, rows)
+        finally:
+            DB_QUERY_SECONDS.observe(time.perf_counter() - start, statement_type(sql))
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+class ConnectionPool:
+    """
+    A bounded, thread-safe pool of database connections.
+    Connections are opened lazily, pinged when they are borrowed and returned to the pool after each query.
+    """
+
+    def __init__(self, connect: Callable, size: int = 5, timeout: float = 10, ping: Optional[Callable] = None):
+        self._connect = connect
+        self._ping = ping
+        self.size = size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._closed = False
+
+    def _discard(self, conn):
+        """Close a connection without raising if it is already broken."""
+        try:
+            conn.close()
+        except DatabaseError:
+            pass
+
+    def acquire(self):
+        """
+        Borrow a connection from the pool, blocking up to `timeout` seconds if all connections are in use.
+        Idle connections are pinged first and replaced if the server dropped them.
+        """
+        if self._closed:
+            raise PoolError("Connection pool is closed")
+        if not self._slots.acquire(timeout=self.timeout):
+            raise PoolError(f"No database connection available within {self.timeout} seconds")
+        try:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return self._connect()
+            if self._ping is not None:
+                try:
+                    self._ping(conn)
+                except DatabaseError as e:
+                    logging.warning(f"Discarding stale database connection: {e}")
+                    self._discard(conn)
+                    conn = self._connect()
+            return conn
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, conn):
+        """
+        Return a borrowed connection to the pool.
+        Whatever the borrower left open is rolled back first: a connection that only served reads would
+        otherwise keep its first snapshot under REPEATABLE READ and return stale rows to the next borrower.
+        """
+        if self._closed:
+            self._discard(conn)
+        else:
+            try:
+                conn.rollback()
+            except DatabaseError as e:
+                logging.warning(f"Discarding database connection that could not be rolled back: {e}")
+                self._discard(conn)
+            else:
+                self._idle.put(conn)
+        self._slots.release()
+
+    @contextmanager
+    def connection(self):
+        """Context manager that borrows a connection and always returns it."""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def drain(self):
+        """Close all idle connections so the next checkout opens a fresh one."""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._discard(conn)
+
+    def close(self):
+        """Close all idle connections; connections still in use are closed when released."""
+        self._closed = True
+        self.drain()
+
+class MySQLBackend:
+    """
+    Storage backend for a MySQL server, using pooled mysql.connector connections.
+    """
+
+    name = "mysql"
+    auto_id = "INT AUTO_INCREMENT PRIMARY KEY"
+
+    def __init__(self, size: int, timeout: float, **connect_args):
+        self.connect_args = connect_args
+        self.pool = ConnectionPool(self._connect, size=size, timeout=timeout, ping=self._ping)
+
+    def _connect(self):
+        return mysql.connector.connect(**self.connect_args)
+
+    def _ping(self, conn):
+        conn.ping(reconnect=True, attempts=1, delay=0)
+
+    def connection(self):
+        return self.pool.connection()
+
+    def cursor(self, conn):
+        return MeteredCursor(conn.cursor())
+
+    def ensure_index(self, cursor, table: str, index_name: str, columns: str):
+        """Create a secondary index unless it already exists (MySQL has no CREATE INDEX IF NOT EXISTS)."""
+        cursor.execute(f"SHOW INDEX FROM {table} WHERE Key_name = %s", (index_name,))
+        if not cursor.fetchall():
+            cursor.execute(f"CREATE INDEX {index_name} ON {table} ({columns})")
+            logging.info(f"Index {index_name} created on {table}({columns})")
+
+    def ensure_column(self, cursor, table: str, column: str, definition: str):
+        """
+        Add a column unless it already exists. DDL commits implicitly in MySQL, so a migration that failed
+        after adding it would otherwise fail with "Duplicate column" on every later run.
+        """
+        cursor.execute(
+            "SELECT COLUMN_NAME FROM information_schema.COLUMNS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s",
+            (table, column)
+        )
+        if not cursor.fetchall():
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+            logging.info(f"Column {column} added to {table}")
+
+    def upsert_clause(self, key: str, columns: Iterable[str], increment: bool = False) -> str:
+        """
+        Conflict clause that overwrites `columns` (or adds to them with `increment`)
+        when a row with the same unique `key` exists.
+        """
+        if increment:
+            return "ON DUPLICATE KEY UPDATE " + ", ".join(f"{column} = {column} + VALUES({column})" for column in columns)
+        return "ON DUPLICATE KEY UPDATE " + ", ".join(f"{column} = VALUES({column})" for column in columns)
+
+    def _partitions(self, cursor, table: str) -> set:
+        cursor.execute(
+            "SELECT PARTITION_NAME FROM information_schema.PARTITIONS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND PARTITION_NAME IS NOT NULL",
+            (table,)
+        )
+        return {row[0] for row in cursor.fetchall()}
+
+    def _partition(self, month: datetime) -> str:
+        return f"PARTITION p{month:%Y%m} VALUES LESS THAN ('{add_months(month, 1):%Y-%m-%d}')"
+
+    def partition_by_month(self, cursor, table: str, first_month: datetime, last_month: datetime):
+        """
+        Convert `table` to monthly RANGE COLUMNS partitions from `first_month` to `last_month` plus a catch-all.
+        MySQL requires the partition column in every unique key, so the primary key becomes (id, date).
+        """
+        if self._partitions(cursor, table):
+            return
+        partitions = []
+        month = first_month
+        while month <= last_month:
+            partitions.append(self._partition(month))
+            month = add_months(month, 1)
+        partitions.append("PARTITION pmax VALUES LESS THAN (MAXVALUE)")
+        cursor.execute(f"ALTER TABLE {table} DROP PRIMARY KEY, ADD PRIMARY KEY (id, date)")
+        cursor.execute(f"ALTER TABLE {table} PARTITION BY RANGE COLUMNS(date) ({', '.join(partitions)})")
+        logging.info(f"{table} partitioned by month ({len(partitions) - 1} partitions)")
+
+    def ensure_month_partitions(self, cursor, table: str, last_month: datetime):
+        """Split new monthly partitions off the catch-all partition up to and including `last_month`."""
+        existing = self._partitions(cursor, table)
+        months = sorted(name for name in existing if name != "pmax")
+        if not months:
+            return
+        newest = datetime.strptime(months[-1], "p%Y%m")
+        month = add_months(newest, 1)
+        while month <= last_month:
+            cursor.execute(
+                f"ALTER TABLE {table} REORGANIZE PARTITION pmax INTO "
+                f"({self._partition(month)}, PARTITION pmax VALUES LESS THAN (MAXVALUE))"
+            )
+            logging.info(f"Partition p{month:%Y%m} added to {table}")
+            month = add_months(month, 1)
+
+    def drop_month(self, cursor, table: str, month: datetime):
+        """Drop the partition holding `month`, or delete the month's rows if the table is not partitioned."""
+        if f"p{month:%Y%m}" in self._partitions(cursor, table):
+            cursor.execute(f"ALTER TABLE {table} DROP PARTITION p{month:%Y%m}")
+        else:
+            cursor.execute(f"DELETE FROM {table} WHERE date >= %s AND date < %s", (month, add_months(month, 1)))
+
+    def reconnect(self):
+        self.pool.drain()
+
+    def close(self):
+        self.pool.close()
+
+class SQLiteCursor:
+    """
+    Thin wrapper around a sqlite3 cursor that accepts the `%s` placeholders used throughout Database.
+    """
+
+    def __init__(self, cursor: sqlite3.Cursor):
+        self._cursor = cursor
+
+    def execute(self, sql: str, params=()):
+        return self._cursor.execute(sql.replace("%s", "?"), params)
+
+    def executemany(self, sql: str, rows):
+        return self._cursor.executemany(sql.replace("%s", "?"), rows)
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchmany(self, size: int):
+        return self._cursor.fetchmany(size)
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    def close(self):
+        self._cursor.close()
+
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(" "))
+sqlite3.register_converter("DATETIME", lambda value: datetime.fromisoformat(value.decode()))
+sqlite3.register_adapter(date, lambda value: value.isoformat())
+sqlite3.register_converter("DATE", lambda value: date.fromisoformat(value.decode()))
+
+class SQLiteBackend:
+    """
+    Embedded storage backend for single-node deployments, tests and benchmarks.
+    The database file runs in WAL mode, so readers never block the single writer and commits stay local.
+    """
+
+    name = "sqlite"
+    auto_id = "INTEGER PRIMARY KEY AUTOINCREMENT"
+
+    def __init__(self, path: str, size: int, timeout: float):
+        self.path = path
+        self.timeout = timeout
+        self.pool = ConnectionPool(self._connect, size=size, timeout=timeout)
+
+    def _connect(self):
+        conn = sqlite3.connect(
+            self.path,
+            timeout=self.timeout,
+            check_same_thread=False,
+            detect_types=sqlite3.PARSE_DECLTYPES
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def connection(self):
+        return self.pool.connection()
+
+    def cursor(self, conn):
+        return MeteredCursor(SQLiteCursor(conn.cursor()))
+
+    def ensure_index(self, cursor, table: str, index_name: str, columns: str):
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table} ({columns})")
+
+    def ensure_column(self, cursor, table: str, column: str, definition: str):
+        """Add a column unless it already exists (SQLite has no ADD COLUMN IF NOT EXISTS either)."""
+        cursor.execute(f"PRAGMA table_info({table})")
+        if column not in {row[1] for row in cursor.fetchall()}:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+    def upsert_clause(self, key: str, columns: Iterable[str], increment: bool = False) -> str:
+        """
+        Conflict clause that overwrites `columns` (or adds to them with `increment`)
+        when a row with the same unique `key` exists.
+        """
+        if increment:
+            return f"ON CONFLICT({key}) DO UPDATE SET " + ", ".join(f"{column} = {column} + excluded.{column}" for column in columns)
+        return f"ON CONFLICT({key}) DO UPDATE SET " + ", ".join(f"{column} = excluded.{column}" for column in columns)
+
+    def partition_by_month(self, cursor, table: str, first_month: datetime, last_month: datetime):
+        """SQLite has no table partitioning; retention deletes whole months through the date index instead."""
+
+    def ensure_month_partitions(self, cursor, table: str, last_month: datetime):
+        """No-op, see partition_by_month."""
+
+    def drop_month(self, cursor, table: str, month: datetime):
+        cursor.execute(f"DELETE FROM {table} WHERE date >= %s AND date < %s", (month, add_months(month, 1)))
+
+    def reconnect(self):
+        self.pool.drain()
+
+    def close(self):
+        self.pool.close()
+
+def create_backend():
+    """Create the storage backend selected by config.DB_BACKEND ("mysql" or "sqlite")."""
+    if config.DB_BACKEND == "sqlite":
+        return SQLiteBackend(config.DB_SQLITE_PATH, size=config.DB_POOL_SIZE, timeout=config.DB_POOL_TIMEOUT)
+    if config.DB_BACKEND != "mysql":
+        raise ValueError(f"Unknown database backend: {config.DB_BACKEND}")
+    return MySQLBackend(
+        size=config.DB_POOL_SIZE,
+        timeout=config.DB_POOL_TIMEOUT,
+        host=config.DB_HOST,
+        port=config.DB_PORT,
+        user=config.DB_USER,
+        password=config.DB_PASSWORD,
+        database=config.DB_NAME
+    )
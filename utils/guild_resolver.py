@@ -0,0 +1,119 @@
+import logging
+from typing import Dict, Iterable, Optional, Union
+import discord
+import config
+
+ROLE_SLOTS = ("admin_role",)
+CHANNEL_SLOTS = ("log_channel", "archive_channel")
+SLOTS = ROLE_SLOTS + CHANNEL_SLOTS
+
+def configured_name(slot: str) -> str:
+    """Name from config that a slot is resolved by when it is not pinned."""
+    return {
+        "admin_role": config.ADMIN_ROLE_NAME,
+        "log_channel": config.LOG_CHANNEL_NAME,
+        "archive_channel": config.ARCHIVE_CHANNEL_NAME
+    }[slot]
+
+class GuildResolver:
+    """
+    Per-guild cache of the admin role, log channel and archive channel, stored by id.
+    Each slot is searched by its configured name once and afterwards looked up by id in O(1), so renames
+    no longer break it. Channel and role events keep the cache current, and admins can pin a slot to a fixed id.
+    """
+
+    def __init__(self):
+        # guild id -> slot -> id, or None if the name search found nothing
+        self._ids: Dict[int, Dict[str, Optional[int]]] = {}
+        self._pinned: Dict[int, Dict[str, int]] = {}
+
+    def load_pins(self, rows: Iterable[dict]):
+        """Load pinned ids from rows with the keys guild_id, name and target_id."""
+        for row in rows:
+            if row["name"] in SLOTS:
+                self._pinned.setdefault(row["guild_id"], {})[row["name"]] = row["target_id"]
+                self._ids.get(row["guild_id"], {}).pop(row["name"], None)
+
+    def pin(self, guild_id: int, slot: str, target_id: int):
+        self._pinned.setdefault(guild_id, {})[slot] = target_id
+        self._ids.setdefault(guild_id, {})[slot] = target_id
+
+    def unpin(self, guild_id: int, slot: str):
+        """Remove a pin; the slot is resolved by its configured name again."""
+        self._pinned.get(guild_id, {}).pop(slot, None)
+        self._ids.get(guild_id, {}).pop(slot, None)
+
+    def pinned(self, guild_id: int) -> Dict[str, int]:
+        return dict(self._pinned.get(guild_id, {}))
+
+    def _get(self, guild: discord.Guild, slot: str, target_id: int) -> Optional[Union[discord.Role, discord.TextChannel]]:
+        if slot in ROLE_SLOTS:
+            return guild.get_role(target_id)
+        channel = guild.get_channel(target_id)
+        return channel if isinstance(channel, discord.TextChannel) else None
+
+    def _search(self, guild: discord.Guild, slot: str) -> Optional[Union[discord.Role, discord.TextChannel]]:
+        items = guild.roles if slot in ROLE_SLOTS else guild.text_channels
+        return discord.utils.get(items, name=configured_name(slot))
+
+    def resolve(self, guild: discord.Guild, slot: str) -> Optional[Union[discord.Role, discord.TextChannel]]:
+        """Return the role or channel for a slot, searching by name only if its id is not known yet."""
+        ids = self._ids.setdefault(guild.id, {})
+        if slot in ids:
+            if ids[slot] is None:
+                return None
+            found = self._get(guild, slot, ids[slot])
+            if found is not None:
+                return found
+        pinned = self._pinned.get(guild.id, {}).get(slot)
+        if pinned is not None:
+            found = self._get(guild, slot, pinned)
+            if found is not None:
+                ids[slot] = pinned
+                return found
+            logging.warning(f"Pinned {slot} {pinned} no longer exists in guild {guild.name}, falling back to the configured name")
+        found = self._search(guild, slot)
+        ids[slot] = found.id if found else None
+        return found
+
+    def _matched(self, guild_id: int, slots: tuple, item: Union[discord.Role, discord.abc.GuildChannel]):
+        """A role or channel now carries a configured name: fill slots whose name search found nothing."""
+        ids = self._ids.get(guild_id)
+        if not ids:
+            return
+        for slot in slots:
+            if slot in ids and ids[slot] is None and item.name == configured_name(slot):
+                ids[slot] = item.id
+
+    def _removed(self, guild_id: int, slots: tuple, item_id: int):
+        ids = self._ids.get(guild_id)
+        if not ids:
+            return
+        for slot in slots:
+            if ids.get(slot) == item_id:
+                del ids[slot]
+
+    def channel_created(self, channel: discord.abc.GuildChannel):
+        if isinstance(channel, discord.TextChannel):
+            self._matched(channel.guild.id, CHANNEL_SLOTS, channel)
+
+    def channel_updated(self, channel: discord.abc.GuildChannel):
+        # A renamed channel keeps its id, so only slots still waiting for a name match change.
+        self.channel_created(channel)
+
+    def channel_deleted(self, channel: discord.abc.GuildChannel):
+        self._removed(channel.guild.id, CHANNEL_SLOTS, channel.id)
+
+    def role_created(self, role: discord.Role):
+        self._matched(role.guild.id, ROLE_SLOTS, role)
+
+    def role_updated(self, role: discord.Role):
+        self.role_created(role)
+
+    def role_deleted(self, role: discord.Role):
+        self._removed(role.guild.id, ROLE_SLOTS, role.id)
+
+    def forget_guild(self, guild_id: int):
+        self._ids.pop(guild_id, None)
+
+resolver = GuildResolver()
@@ -6,6 +6,7 @@ import json
 from datetime import datetime
 from typing import Optional, List, Dict
 import logging
+from utils.guild_resolver import resolver
 
 APPLICATIONS_FILE = "applications.json"
 
@@ -38,10 +39,10 @@ def save_applications(applications: List[Dict]):
 
 def get_admin_role(guild: discord.Guild) -> Optional[discord.Role]:
     """
-    Retrieve the admin role from the guild based on config.
+    Retrieve the admin role from the guild based on config or a pinned id.
     """
     try:
-        role = discord.utils.get(guild.roles, name=config.ADMIN_ROLE_NAME)
+        role = resolver.resolve(guild, "admin_role")
         if not role:
             logging.warning(f"Admin role '{config.ADMIN_ROLE_NAME}' not found in guild {guild.name}")
         return role
@@ -51,10 +52,10 @@ def get_admin_role(guild: discord.Guild) -> Optional[discord.Role]:
 
 def get_log_channel(guild: discord.Guild) -> Optional[discord.TextChannel]:
     """
-    Retrieve the log channel from the guild based on config.
+    Retrieve the log channel from the guild based on config or a pinned id.
     """
     try:
-        channel = discord.utils.get(guild.text_channels, name=config.LOG_CHANNEL_NAME)
+        channel = resolver.resolve(guild, "log_channel")
         if not channel:
             logging.warning(f"Log channel '{config.LOG_CHANNEL_NAME}' not found in guild {guild.name}")
         return channel
@@ -64,10 +65,10 @@ def get_log_channel(guild: discord.Guild) -> Optional[discord.TextChannel]:
 
 def get_archive_channel(guild: discord.Guild) -> Optional[discord.TextChannel]:
     """
-    Retrieve the archive channel from the guild based on config.
+    Retrieve the archive channel from the guild based on config or a pinned id.
     """
     try:
-        channel = discord.utils.get(guild.text_channels, name=config.ARCHIVE_CHANNEL_NAME)
+        channel = resolver.resolve(guild, "archive_channel")
         if not channel:
             logging.warning(f"Archive channel '{config.ARCHIVE_CHANNEL_NAME}' not found in guild {guild.name}")
         return channel
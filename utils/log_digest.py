@@ -0,0 +1,88 @@
+import asyncio
+from collections import Counter
+from datetime import datetime
+import logging
+from typing import Dict, List
+import discord
+from utils.log_dispatcher import LogDispatcher
+
+logger = logging.getLogger("OperationOlujaBot")
+
+class _GuildDigest:
+    __slots__ = ("guild", "since", "counts", "notable", "notable_dropped")
+
+    def __init__(self, guild: discord.Guild):
+        self.guild = guild
+        self.since = datetime.utcnow()
+        self.counts: Dict[str, Counter] = {}
+        self.notable: List[str] = []
+        self.notable_dropped = 0
+
+class LogDigest:
+    """
+    Aggregates routine LogCollector processes per guild and posts one summary embed every `interval` seconds
+    with the number of runs per process and status plus the warnings and errors among them.
+    """
+
+    def __init__(self, dispatcher: LogDispatcher, interval: float = 900, max_notable: int = 15):
+        self.dispatcher = dispatcher
+        self.interval = interval
+        self.max_notable = max_notable
+        self._digests: Dict[int, _GuildDigest] = {}
+        self._tasks: Dict[int, asyncio.Task] = {}
+
+    def record(self, guild: discord.Guild, process_name: str, status: str, notable: List[str]):
+        """Count one finished process; `notable` holds its warning and error lines."""
+        digest = self._digests.get(guild.id)
+        if digest is None:
+            digest = self._digests[guild.id] = _GuildDigest(guild)
+            self._tasks[guild.id] = asyncio.create_task(self._post_later(guild.id), name=f"oluja-digest-{guild.id}")
+        digest.counts.setdefault(process_name, Counter())[status] += 1
+        for line in notable:
+            if len(digest.notable) < self.max_notable:
+                digest.notable.append(f"{process_name}: {line}")
+            else:
+                digest.notable_dropped += 1
+
+    async def _post_later(self, guild_id: int):
+        await asyncio.sleep(self.interval)
+        self._tasks.pop(guild_id, None)
+        self._post(guild_id)
+
+    def _post(self, guild_id: int):
+        digest = self._digests.pop(guild_id, None)
+        if digest is None:
+            return
+        total = sum(sum(statuses.values()) for statuses in digest.counts.values())
+        embed = discord.Embed(
+            title="📊 Log-Zusammenfassung",
+            description=f"{total} Routinevorgänge seit {digest.since.strftime('%H:%M')} UTC",
+            color=discord.Color.orange() if digest.notable else discord.Color.blurple(),
+            timestamp=datetime.utcnow()
+        )
+        lines = []
+        for process_name, statuses in sorted(digest.counts.items(), key=lambda item: -sum(item[1].values())):
+            detail = ", ".join(f"{status} {count}" for status, count in statuses.most_common())
+            lines.append(f"**{process_name}:** {sum(statuses.values())}× ({detail})")
+        embed.add_field(name="Vorgänge", value=self._truncate(lines), inline=False)
+        if digest.notable:
+            if digest.notable_dropped:
+                digest.notable.append(f"… und {digest.notable_dropped} weitere")
+            embed.add_field(name="⚠️ Auffälligkeiten", value=self._truncate(digest.notable), inline=False)
+        embed.set_footer(text=f"Operation-Oluja | {datetime.utcnow().strftime('%d.%m.%Y %H:%M UTC')}")
+        self.dispatcher.submit(digest.guild, embed)
+        logger.info(f"Log digest with {total} processes queued for guild {digest.guild.name}")
+
+    @staticmethod
+    def _truncate(lines: List[str]) -> str:
+        # Embed field values are limited to 1024 characters.
+        text = "\n".join(lines)
+        return text if len(text) <= 1024 else text[:1020] + "\n…"
+
+    def flush(self):
+        """Hand all pending digests to the dispatcher now, e.g. before the bot disconnects."""
+        for task in self._tasks.values():
+            task.cancel()
+        self._tasks.clear()
+        for guild_id in list(self._digests):
+            self._post(guild_id)
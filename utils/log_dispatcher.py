@@ -0,0 +1,109 @@
+import asyncio
+from collections import deque
+from datetime import datetime
+import logging
+from typing import Dict
+import discord
+from utils.helpers import get_log_channel
+
+logger = logging.getLogger("OperationOlujaBot")
+
+# Discord limits per message: at most 10 embeds with 6000 characters in total.
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_CHARS_PER_MESSAGE = 6000
+
+class LogDispatcher:
+    """
+    Per-guild queue for log-channel embeds.
+    `submit` never waits: embeds are queued and a background task per guild packs up to 10 of them
+    into one message every `flush_interval` seconds. When a guild's queue is full, the oldest embeds
+    are dropped and a summary of how many were lost is sent with the next message.
+    """
+
+    def __init__(self, flush_interval: float = 2, max_queue: int = 200):
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self._queues: Dict[int, deque] = {}
+        self._guilds: Dict[int, discord.Guild] = {}
+        self._dropped: Dict[int, int] = {}
+        self._tasks: Dict[int, asyncio.Task] = {}
+        # Sends of batches already taken from a queue, per guild
+        self._in_flight: Dict[int, asyncio.Task] = {}
+        self.messages_sent = 0
+        self.embeds_sent = 0
+        self.embeds_dropped = 0
+
+    def submit(self, guild: discord.Guild, embed: discord.Embed):
+        """Queue an embed for the guild's log channel without waiting for it to be sent."""
+        queue = self._queues.setdefault(guild.id, deque())
+        self._guilds[guild.id] = guild
+        if len(queue) >= self.max_queue:
+            queue.popleft()
+            self._dropped[guild.id] = self._dropped.get(guild.id, 0) + 1
+            self.embeds_dropped += 1
+        queue.append(embed)
+        task = self._tasks.get(guild.id)
+        if task is None or task.done():
+            self._tasks[guild.id] = asyncio.create_task(self._drain(guild), name=f"oluja-log-{guild.id}")
+
+    def pending(self, guild_id: int) -> int:
+        return len(self._queues.get(guild_id, ()))
+
+    def _next_batch(self, guild_id: int) -> list:
+        queue = self._queues[guild_id]
+        batch = []
+        dropped = self._dropped.pop(guild_id, 0)
+        if dropped:
+            batch.append(discord.Embed(
+                title="⚠️ Log-Überlast",
+                description=f"{dropped} Log-Einträge wurden wegen Überlast verworfen.",
+                color=discord.Color.orange(),
+                timestamp=datetime.utcnow()
+            ))
+        size = sum(len(embed) for embed in batch)
+        while queue and len(batch) < MAX_EMBEDS_PER_MESSAGE and (not batch or size + len(queue[0]) <= MAX_CHARS_PER_MESSAGE):
+            embed = queue.popleft()
+            batch.append(embed)
+            size += len(embed)
+        return batch
+
+    async def _drain(self, guild: discord.Guild):
+        queue = self._queues[guild.id]
+        while queue:
+            # Wait first so that logs produced in the same burst share one message.
+            await asyncio.sleep(self.flush_interval)
+            await self._send_batch(guild)
+
+    async def _send_batch(self, guild: discord.Guild):
+        batch = self._next_batch(guild.id)
+        if not batch:
+            return
+        log_channel = get_log_channel(guild)
+        if not log_channel:
+            logger.warning(f"No log channel, {len(batch)} log embeds discarded for guild {guild.name}")
+            return
+        send = asyncio.create_task(self._post(log_channel, batch), name=f"oluja-log-send-{guild.id}")
+        self._in_flight[guild.id] = send
+        send.add_done_callback(lambda _: self._in_flight.pop(guild.id, None) if self._in_flight.get(guild.id) is send else None)
+        # Shielded, so cancelling the drain task in flush() does not lose a batch that left the queue
+        await asyncio.shield(send)
+
+    async def _post(self, log_channel: discord.TextChannel, batch: list):
+        try:
+            await log_channel.send(embeds=batch)
+            self.messages_sent += 1
+            self.embeds_sent += len(batch)
+        except Exception as e:
+            logger.error(f"Error posting {len(batch)} log embeds to {log_channel.name}: {e}")
+
+    async def flush(self):
+        """Send everything that is still queued, e.g. before the bot disconnects."""
+        for task in self._tasks.values():
+            task.cancel()
+        self._tasks.clear()
+        # Batches that were being sent when their drain task was cancelled
+        await asyncio.gather(*self._in_flight.values())
+        # A copy, since a log submitted for another guild while sending adds a queue
+        for guild_id, queue in list(self._queues.items()):
+            while queue or self._dropped.get(guild_id):
+                await self._send_batch(self._guilds[guild_id])
@@ -1,27 +1,150 @@
 import logging
+import logging.handlers
 from datetime import datetime
+import atexit
+import functools
+import gzip
+import json
+import os
+import queue
+import random
+import shutil
+import time
 import discord
 from typing import Optional
 from utils.helpers import get_log_channel
+from utils.log_digest import LogDigest
+from utils.log_dispatcher import LogDispatcher
+from utils.metrics import metrics
+import config
+
+class JsonFormatter(logging.Formatter):
+    """
+    Format records as one JSON object per line for machine parsing.
+    """
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+def _gzip_namer(name: str) -> str:
+    return name + ".gz"
+
+def _gzip_rotator(source: str, dest: str):
+    """Compress a rotated log file and remove the uncompressed original."""
+    with open(source, "rb") as f_in, gzip.open(dest, "wb") as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
+
+def _rotating_handler(path: str) -> logging.Handler:
+    """File handler for `path` that rotates by size or time and gzip-compresses rotated files."""
+    if config.LOG_ROTATION == "time":
+        handler = logging.handlers.TimedRotatingFileHandler(
+            path, when=config.LOG_ROTATE_WHEN, backupCount=config.LOG_BACKUP_COUNT, encoding="utf-8"
+        )
+    else:
+        handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=config.LOG_MAX_BYTES, backupCount=config.LOG_BACKUP_COUNT, encoding="utf-8"
+        )
+    handler.namer = _gzip_namer
+    handler.rotator = _gzip_rotator
+    return handler
+
+def _queued(handler: logging.Handler) -> logging.Handler:
+    """Wrap `handler` so records are written by a background thread instead of the caller."""
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    return logging.handlers.QueueHandler(log_queue)
 
 def setup_logging() -> logging.Logger:
     """
-    Configure and return a logger for the Operation-Oluja bot.
-    Logs to a file with a standardized format.
+    Configure and return a logger for the Operation-Oluja bot. Called by the entry point in main.py,
+    so importing this module (e.g. in tests) does not create log files.
+    Records from all loggers are put on an in-memory queue and written by a background thread,
+    so logging never blocks the event loop. The file is rotated by size or time and old files are gzip-compressed.
+    """
+    file_handler = _rotating_handler(config.LOG_FILE)
+    if config.LOG_JSON:
+        file_handler.setFormatter(JsonFormatter())
+    else:
+        file_handler.setFormatter(logging.Formatter(
+            "%(asctime)s - %(levelname)s - %(message)s",
+            datefmt="%Y-%m-%d %H:%M:%S"
+        ))
+
+    # Attached to the root logger so that the cogs' logging.info calls take the same non-blocking path.
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    root.addHandler(_queued(file_handler))
+
+    return logging.getLogger("OperationOlujaBot")
+
+def setup_trace_logging() -> logging.Logger:
+    """
+    Configure the logger that writes one JSON line per finished LogCollector process to config.TRACE_FILE.
+    """
+    trace_handler = _rotating_handler(config.TRACE_FILE)
+    trace_handler.setFormatter(logging.Formatter("%(message)s"))
+    trace_logger.setLevel(logging.INFO)
+    trace_logger.addHandler(_queued(trace_handler))
+    return trace_logger
+
+logger = logging.getLogger("OperationOlujaBot")
+trace_logger = logging.getLogger("OperationOlujaBot.trace")
+# Traces only go to their own file, never into bot.log
+trace_logger.propagate = False
+log_dispatcher = LogDispatcher(flush_interval=config.LOG_FLUSH_INTERVAL, max_queue=config.LOG_QUEUE_SIZE)
+log_digest = LogDigest(log_dispatcher, interval=config.LOG_DIGEST_INTERVAL)
+metrics.gauge("oluja_log_embeds_dropped", "Log embeds dropped because a guild's log queue was full", lambda: log_dispatcher.embeds_dropped)
+
+class LogEvent:
+    """A single LogCollector event; `offset` is the monotonic time in seconds since the process started."""
+    __slots__ = ("event", "level", "offset")
+
+    def __init__(self, event: str, level: str, offset: float):
+        self.event = event
+        self.level = level
+        self.offset = offset
+
+class Span:
+    """
+    Times one step of a LogCollector process.
+    Use `with log_collector.span("Rolle zuweisen"):` around awaited calls, or `@log_collector.span("...")` on a coroutine function.
     """
-    logger = logging.getLogger("OperationOlujaBot")
-    logger.setLevel(logging.INFO)
+    __slots__ = ("collector", "name", "offset", "duration", "error")
+
+    def __init__(self, collector: "LogCollector", name: str):
+        self.collector = collector
+        self.name = name
+        self.offset = 0.0
+        self.duration = 0.0
+        self.error: Optional[str] = None
 
-    file_handler = logging.FileHandler("bot.log", encoding="utf-8")
-    file_handler.setFormatter(logging.Formatter(
-        "%(asctime)s - %(levelname)s - %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S"
-    ))
-    logger.addHandler(file_handler)
+    def __enter__(self) -> "Span":
+        self.offset = self.collector.elapsed
+        return self
 
-    return logger
+    def __exit__(self, exc_type, exc, tb):
+        self.duration = self.collector.elapsed - self.offset
+        if exc_type is not None:
+            self.error = exc_type.__name__
+        self.collector.spans.append(self)
+        return False
 
-logger = setup_logging()
+    def __call__(self, func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with Span(self.collector, self.name):
+                return await func(*args, **kwargs)
+        return wrapper
 
 class LogCollector:
     """
@@ -32,27 +155,88 @@ class LogCollector:
         self.process_name = process_name
         self.user = user
         self.channel = channel
-        self.events: list[dict[str, str]] = []
+        self.events: list[LogEvent] = []
+        self.spans: list[Span] = []
         self.start_time = datetime.utcnow()
+        self._started = time.monotonic()
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the process started, measured with the monotonic clock."""
+        return time.monotonic() - self._started
 
     def add_event(self, event: str, level: str = "INFO"):
         """
         Add an event to the log collector with a specified log level.
         """
-        self.events.append({"event": event, "level": level})
+        self.events.append(LogEvent(event, level, self.elapsed))
         logger.log(getattr(logging, level), f"{self.process_name} - {event}")
 
+    def span(self, name: str) -> Span:
+        """
+        Time a step of this process, as a context manager or a decorator for coroutine functions.
+        """
+        return Span(self, name)
+
     @property
     def has_errors(self) -> bool:
         """
         Check if any events have an ERROR or WARNING level.
         """
-        return any(event["level"] in ("ERROR", "WARNING") for event in self.events)
+        return any(event.level in ("ERROR", "WARNING") for event in self.events)
+
+    def _format_spans(self) -> str:
+        lines = [
+            f"{span.name}: {span.duration * 1000:.0f} ms" + (f" ({span.error})" if span.error else "")
+            for span in self.spans
+        ]
+        text = "\n".join(lines)
+        # Embed field values are limited to 1024 characters.
+        return text if len(text) <= 1024 else text[:1020] + "\n…"
+
+    def _write_trace(self, status: str, duration: float):
+        """Write the events and spans of this process as one JSON line to the trace file."""
+        trace_logger.info(json.dumps({
+            "process": self.process_name,
+            "status": status,
+            "guild_id": self.guild.id,
+            "user_id": self.user.id if self.user else None,
+            "channel_id": self.channel.id if self.channel else None,
+            "start": self.start_time.isoformat(),
+            "duration_ms": round(duration * 1000, 1),
+            "events": [
+                {"offset_ms": round(e.offset * 1000, 1), "level": e.level, "event": e.event}
+                for e in self.events
+            ],
+            "spans": [
+                {"name": s.name, "offset_ms": round(s.offset * 1000, 1), "duration_ms": round(s.duration * 1000, 1), "error": s.error}
+                for s in self.spans
+            ]
+        }, ensure_ascii=False))
+
+    def _route_immediately(self, status: str) -> bool:
+        """
+        Apply config.LOG_ROUTES: digest and sampled processes are counted in the periodic digest,
+        and only sampled ones or those with warnings or errors are also posted on their own.
+        """
+        route = config.LOG_ROUTES.get(self.process_name, "immediate")
+        if route == "immediate":
+            return True
+        notable = [f"[{e.level}] {e.event}" for e in self.events if e.level in ("ERROR", "WARNING")]
+        log_digest.record(self.guild, self.process_name, status, notable)
+        if self.has_errors:
+            return True
+        return route == "sampled" and random.random() < config.LOG_SAMPLE_RATE
 
     async def post_log(self, status: str = "Completed", color: discord.Color = discord.Color.green()):
         """
         Post a summary of collected events to the guild's log channel as a Discord embed.
+        The embed is handed to the log dispatcher, which batches it with other logs; this never waits for Discord.
         """
+        duration = self.elapsed
+        self._write_trace(status, duration)
+        if not self._route_immediately(status):
+            return
         log_channel = get_log_channel(self.guild)
         if not log_channel or not self.events:
             logger.warning(f"No log channel or events to log for {self.process_name}")
@@ -62,7 +246,7 @@ class LogCollector:
             embed = discord.Embed(
                 title=f"📋 {self.process_name} - {status}",
                 description="**Prozesszusammenfassung:**\n\n" + "\n".join(
-                    f"[{e['level']}] {e['event']}" for e in self.events
+                    f"[{e.level} +{e.offset:.2f}s] {e.event}" for e in self.events
                 ),
                 color=color,
                 timestamp=datetime.utcnow()
@@ -71,11 +255,13 @@ class LogCollector:
                 embed.set_author(name=f"{self.user.name} (ID: {self.user.id})", icon_url=self.user.display_avatar.url)
             if self.channel:
                 embed.add_field(name="Kanal", value=f"{self.channel.mention} (ID: {self.channel.id})", inline=True)
-            embed.add_field(name="Dauer", value=f"{(datetime.utcnow() - self.start_time).seconds} Sekunden", inline=True)
+            embed.add_field(name="Dauer", value=f"{duration:.2f} Sekunden", inline=True)
+            if self.spans:
+                embed.add_field(name="⏱️ Schritte", value=self._format_spans(), inline=False)
             embed.set_footer(text=f"Operation-Oluja | {datetime.utcnow().strftime('%d.%m.%Y %H:%M UTC')}")
             
-            await log_channel.send(embed=embed)
-            logger.info(f"Log posted to {log_channel.name} for {self.process_name}")
+            log_dispatcher.submit(self.guild, embed)
+            logger.info(f"Log queued for {log_channel.name} for {self.process_name}")
         except Exception as e:
-            logger.error(f"Error posting log to {log_channel.name}: {e}")
+            logger.error(f"Error queueing log for {log_channel.name}: {e}")
             raise
\ No newline at end of file
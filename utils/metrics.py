@@ -0,0 +1,240 @@
+import asyncio
+from bisect import bisect_left
+from datetime import datetime, timezone
+import logging
+import re
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+import aiohttp
+from aiohttp import web
+import discord
+
+logger = logging.getLogger("OperationOlujaBot")
+
+# Upper bounds in seconds; Discord and database calls of the bot are expected between a few ms and a few seconds.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_labels(names: Tuple[str, ...], values: Tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+class Counter:
+    """A monotonically increasing count per label combination."""
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...], lock: threading.Lock):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self._lock = lock
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, *label_values, amount: float = 1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for label_values, value in self._values.items():
+            lines.append(f"{self.name}{_format_labels(self.labels, label_values)} {value}")
+        return lines
+
+class Histogram:
+    """Bucketed distribution of observed durations per label combination."""
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...], lock: threading.Lock, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.buckets = buckets
+        self._lock = lock
+        # label values -> [per-bucket counts (last one is +Inf), sum, count]
+        self._values: Dict[Tuple, list] = {}
+
+    def observe(self, value: float, *label_values):
+        with self._lock:
+            entry = self._values.get(label_values)
+            if entry is None:
+                entry = self._values[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][bisect_left(self.buckets, value)] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for label_values, (counts, total, count) in self._values.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += bucket_count
+                le = f'le="{bound}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, label_values, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, label_values)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, label_values)} {count}")
+        return lines
+
+class Gauge:
+    """A value read from a callback at scrape time, e.g. the size of an in-memory structure."""
+
+    def __init__(self, name: str, help_text: str, func: Callable[[], float]):
+        self.name = name
+        self.help_text = help_text
+        self.func = func
+
+    def render(self) -> list:
+        try:
+            value = self.func()
+        except Exception as e:
+            logger.warning(f"Metric {self.name} could not be read: {e}")
+            return []
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} gauge", f"{self.name} {value}"]
+
+class MetricsRegistry:
+    """
+    Process-wide collection of counters, histograms and gauges, rendered in the Prometheus text format.
+    Recording is thread-safe, so database worker threads can observe timings directly.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, object] = {}
+
+    def counter(self, name: str, help_text: str, labels: Tuple[str, ...] = ()) -> Counter:
+        if name not in self._metrics:
+            self._metrics[name] = Counter(name, help_text, labels, self._lock)
+        return self._metrics[name]
+
+    def histogram(self, name: str, help_text: str, labels: Tuple[str, ...] = (), buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        if name not in self._metrics:
+            self._metrics[name] = Histogram(name, help_text, labels, self._lock, buckets)
+        return self._metrics[name]
+
+    def gauge(self, name: str, help_text: str, func: Callable[[], float]) -> Gauge:
+        """Register a gauge; registering the same name again (e.g. after a cog reload) replaces the callback."""
+        self._metrics[name] = Gauge(name, help_text, func)
+        return self._metrics[name]
+
+    def render(self) -> str:
+        with self._lock:
+            lines = []
+            for metric in list(self._metrics.values()):
+                if not isinstance(metric, Gauge):
+                    lines.extend(metric.render())
+        # Gauge callbacks run outside the lock, they may read structures that record metrics themselves.
+        for metric in list(self._metrics.values()):
+            if isinstance(metric, Gauge):
+                lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+metrics = MetricsRegistry()
+
+APP_COMMAND_SECONDS = metrics.histogram(
+    "oluja_app_command_seconds", "Time from interaction creation until an app command completed", ("command",)
+)
+INTERACTION_ACK_SECONDS = metrics.histogram(
+    "oluja_interaction_ack_seconds", "Time from interaction creation until the bot acknowledged it"
+)
+DISCORD_HTTP_REQUESTS = metrics.counter(
+    "oluja_discord_http_requests_total", "Discord HTTP API calls by route and response status", ("method", "route", "status")
+)
+DISCORD_HTTP_SECONDS = metrics.histogram(
+    "oluja_discord_http_seconds", "Duration of Discord HTTP API calls by route", ("method", "route")
+)
+DB_QUERY_SECONDS = metrics.histogram(
+    "oluja_db_query_seconds", "Duration of database statements by statement type", ("statement",)
+)
+EVENT_LOOP_LAG_SECONDS = metrics.histogram(
+    "oluja_event_loop_lag_seconds", "How much later than scheduled the event loop woke up a sleeping task"
+)
+
+STATEMENT_TYPES = {"SELECT", "INSERT", "UPDATE", "DELETE", "CREATE", "ALTER", "DROP", "SHOW"}
+
+def statement_type(sql: str) -> str:
+    """First keyword of a SQL statement, or OTHER for anything unexpected."""
+    keyword = sql.lstrip().split(None, 1)[0].upper() if sql.strip() else ""
+    return keyword if keyword in STATEMENT_TYPES else "OTHER"
+
+_API_PREFIX = re.compile(r"^/api/v\d+")
+_SNOWFLAKE = re.compile(r"/\d{15,21}(?=/|$)")
+_TOKEN = re.compile(r"(/(?:interactions|webhooks)/\{id\})/[^/]+")
+_REACTION = re.compile(r"(/reactions)/[^/]+")
+_INTERACTION_CALLBACK = re.compile(r"/interactions/(\d{15,21})/[^/]+/callback$")
+
+def discord_route(path: str) -> str:
+    """Collapse ids, tokens and emojis in a Discord API path so calls group by route template."""
+    path = _API_PREFIX.sub("", path)
+    path = _SNOWFLAKE.sub("/{id}", path)
+    path = _TOKEN.sub(r"\1/{token}", path)
+    return _REACTION.sub(r"\1/{emoji}", path)
+
+def http_trace_config() -> aiohttp.TraceConfig:
+    """
+    aiohttp trace hooks for the bot's HTTP session that count Discord API calls by route and status
+    (rate-limited retries show up as status 429) and measure how quickly interactions were acknowledged.
+    """
+    trace = aiohttp.TraceConfig()
+
+    async def on_request_start(session, context, params):
+        context.start = time.perf_counter()
+
+    async def on_request_end(session, context, params):
+        route = discord_route(params.url.path)
+        DISCORD_HTTP_REQUESTS.inc(params.method, route, params.response.status)
+        DISCORD_HTTP_SECONDS.observe(time.perf_counter() - context.start, params.method, route)
+        callback = _INTERACTION_CALLBACK.search(params.url.path)
+        if callback:
+            created = discord.utils.snowflake_time(int(callback.group(1)))
+            INTERACTION_ACK_SECONDS.observe((datetime.now(timezone.utc) - created).total_seconds())
+
+    trace.on_request_start.append(on_request_start)
+    trace.on_request_end.append(on_request_end)
+    return trace
+
+def observe_app_command(interaction: discord.Interaction, command) -> None:
+    """Record the end-to-end latency of a completed app command."""
+    APP_COMMAND_SECONDS.observe((discord.utils.utcnow() - interaction.created_at).total_seconds(), command.qualified_name)
+
+class MetricsServer:
+    """
+    Local HTTP endpoint serving the registry at /metrics, plus the event-loop lag probe.
+    Only started when config.METRICS_ENABLED is set.
+    """
+
+    def __init__(self, registry: MetricsRegistry, lag_interval: float = 0.5):
+        self.registry = registry
+        self.lag_interval = lag_interval
+        self._runner: Optional[web.AppRunner] = None
+        self._lag_task: Optional[asyncio.Task] = None
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        return web.Response(text=self.registry.render(), content_type="text/plain", charset="utf-8")
+
+    async def _measure_lag(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            scheduled = loop.time() + self.lag_interval
+            await asyncio.sleep(self.lag_interval)
+            EVENT_LOOP_LAG_SECONDS.observe(max(0.0, loop.time() - scheduled))
+
+    async def start(self, host: str, port: int):
+        app = web.Application()
+        app.router.add_get("/metrics", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+        self._lag_task = asyncio.create_task(self._measure_lag(), name="oluja-loop-lag")
+        logger.info(f"Metrics endpoint listening on http://{host}:{port}/metrics")
+
+    async def stop(self):
+        if self._lag_task is not None:
+            self._lag_task.cancel()
+            self._lag_task = None
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+metrics_server = MetricsServer(metrics)
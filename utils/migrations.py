@@ -0,0 +1,217 @@
+from datetime import datetime
+import logging
+from utils.db_backends import DatabaseError
+from utils.retention import EVENT_TABLES, add_months, month_start
+import config
+
+def _create_base_tables(backend, cursor):
+    """Create the original tables for applications, moderation logs, member events, and CWL polls."""
+    # Applications table
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS applications (
+            id {backend.auto_id},
+            applicant_name VARCHAR(255) NOT NULL,
+            applicant_id BIGINT NOT NULL,
+            apply_type VARCHAR(50) NOT NULL,
+            spieler_tag VARCHAR(15),
+            strategien TEXT,
+            th_level VARCHAR(10),
+            status VARCHAR(50) NOT NULL,
+            reason TEXT,
+            handled_by VARCHAR(255),
+            date DATETIME NOT NULL
+        )
+    ''')
+
+    # Moderation logs table
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS moderation_logs (
+            id {backend.auto_id},
+            user_id BIGINT NOT NULL,
+            user_name VARCHAR(255) NOT NULL,
+            action_type VARCHAR(50) NOT NULL,
+            reason TEXT,
+            duration INT,
+            handled_by VARCHAR(255),
+            date DATETIME NOT NULL
+        )
+    ''')
+
+    # Member events table
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS member_events (
+            id {backend.auto_id},
+            user_id BIGINT NOT NULL,
+            user_name VARCHAR(255) NOT NULL,
+            event_type VARCHAR(50) NOT NULL,
+            date DATETIME NOT NULL
+        )
+    ''')
+
+    # CWL polls table
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS cwl_polls (
+            id {backend.auto_id},
+            poll_id BIGINT UNIQUE NOT NULL,
+            channel_id BIGINT NOT NULL,
+            channel_name VARCHAR(255) NOT NULL,
+            duration INT NOT NULL,
+            yes_count INT DEFAULT 0,
+            no_count INT DEFAULT 0,
+            date DATETIME NOT NULL
+        )
+    ''')
+
+def _add_application_indexes(backend, cursor):
+    """Secondary indexes for application lookups by status, applicant, player tag and date."""
+    backend.ensure_index(cursor, "applications", "idx_applications_status", "status")
+    backend.ensure_index(cursor, "applications", "idx_applications_applicant", "applicant_id")
+    backend.ensure_index(cursor, "applications", "idx_applications_tag", "spieler_tag")
+    backend.ensure_index(cursor, "applications", "idx_applications_date", "date")
+
+def _partition_event_tables(backend, cursor):
+    """Split the append-only event tables into monthly ranges so retention can drop whole months."""
+    current = month_start(datetime.utcnow())
+    for table in EVENT_TABLES:
+        backend.ensure_index(cursor, table, f"idx_{table}_date", "date")
+        cursor.execute(f"SELECT MIN(date) FROM {table}")
+        oldest = cursor.fetchall()[0][0]
+        first = month_start(oldest) if oldest else current
+        backend.partition_by_month(cursor, table, first, add_months(current, config.DB_PARTITION_MONTHS_AHEAD))
+
+def _add_user_history_indexes(backend, cursor):
+    """Per-user indexes for the moderation and application history lookup."""
+    backend.ensure_index(cursor, "moderation_logs", "idx_moderation_logs_user", "user_id, date")
+    backend.ensure_index(cursor, "applications", "idx_applications_applicant_date", "applicant_id, date")
+
+def _add_member_rollups(backend, cursor):
+    """Store the guild of each member event and add the daily join/leave rollup per guild."""
+    backend.ensure_column(cursor, "member_events", "guild_id", "BIGINT")
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS member_event_daily (
+            guild_id BIGINT NOT NULL,
+            day DATE NOT NULL,
+            joins INT NOT NULL DEFAULT 0,
+            leaves INT NOT NULL DEFAULT 0,
+            PRIMARY KEY (guild_id, day)
+        )
+    ''')
+
+def _add_guild_settings(backend, cursor):
+    """Per-guild ids pinned by admins, e.g. the log channel."""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS guild_settings (
+            guild_id BIGINT NOT NULL,
+            name VARCHAR(50) NOT NULL,
+            target_id BIGINT NOT NULL,
+            updated_at DATETIME NOT NULL,
+            PRIMARY KEY (guild_id, name)
+        )
+    ''')
+
+def _add_application_sessions(backend, cursor):
+    """Applications in progress: current step, answers so far and the deadline for the next answer."""
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS application_sessions (
+            id {backend.auto_id},
+            channel_id BIGINT UNIQUE NOT NULL,
+            guild_id BIGINT NOT NULL,
+            applicant_id BIGINT NOT NULL,
+            applicant_name VARCHAR(255) NOT NULL,
+            apply_type VARCHAR(50) NOT NULL,
+            state VARCHAR(20) NOT NULL,
+            step INT NOT NULL DEFAULT 0,
+            attempts INT NOT NULL DEFAULT 0,
+            answers TEXT NOT NULL,
+            question_message_id BIGINT,
+            deadline DATETIME,
+            created_at DATETIME NOT NULL
+        )
+    ''')
+
+def _add_ticket_index(backend, cursor):
+    """Lookup of an applicant's ticket per guild for the open-ticket index."""
+    backend.ensure_index(cursor, "application_sessions", "idx_application_sessions_applicant", "guild_id, applicant_id")
+
+def _add_ticket_transcripts(backend, cursor):
+    """Archived ticket transcripts: where the uploaded file lives and whose application it belongs to."""
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS ticket_transcripts (
+            id {backend.auto_id},
+            guild_id BIGINT NOT NULL,
+            channel_id BIGINT NOT NULL,
+            application_id BIGINT,
+            applicant_id BIGINT,
+            applicant_name VARCHAR(255),
+            reason VARCHAR(100) NOT NULL,
+            archive_message_id BIGINT NOT NULL,
+            archive_url VARCHAR(255) NOT NULL,
+            message_count INT NOT NULL,
+            size_bytes INT NOT NULL,
+            created_at DATETIME NOT NULL
+        )
+    ''')
+    backend.ensure_index(cursor, "ticket_transcripts", "idx_ticket_transcripts_applicant", "guild_id, applicant_id")
+    backend.ensure_index(cursor, "ticket_transcripts", "idx_ticket_transcripts_application", "application_id")
+
+def _add_reminder_steps(backend, cursor):
+    """Last reminder step posted for an open ticket, so reminders are not repeated after a restart."""
+    backend.ensure_column(cursor, "application_sessions", "reminder_step", "INT NOT NULL DEFAULT 0")
+
+def _add_rate_limits(backend, cursor):
+    """Persisted cooldowns and token buckets, so they survive a restart."""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS rate_limits (
+            name VARCHAR(50) NOT NULL,
+            scope_id BIGINT NOT NULL,
+            tokens DOUBLE NOT NULL,
+            updated_at DATETIME NOT NULL,
+            PRIMARY KEY (name, scope_id)
+        )
+    ''')
+
+# Ordered list of (version, description, migration). Applied versions are recorded in schema_migrations,
+# so new schema changes are added here as a new version and never by editing an applied one.
+MIGRATIONS = [
+    (1, "Base tables", _create_base_tables),
+    (2, "Application indexes", _add_application_indexes),
+    (3, "Monthly partitions for moderation_logs and member_events", _partition_event_tables),
+    (4, "User history indexes", _add_user_history_indexes),
+    (5, "Guild id on member events and daily member rollup", _add_member_rollups),
+    (6, "Pinned guild settings", _add_guild_settings),
+    (7, "Application sessions", _add_application_sessions),
+    (8, "Ticket index by applicant", _add_ticket_index),
+    (9, "Ticket transcripts", _add_ticket_transcripts),
+    (10, "Reminder steps", _add_reminder_steps),
+    (11, "Rate limits", _add_rate_limits),
+]
+
+def run_migrations(backend, conn):
+    """Apply every migration that is not yet recorded in schema_migrations, in version order."""
+    cursor = backend.cursor(conn)
+    try:
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version INT PRIMARY KEY,
+                description VARCHAR(255) NOT NULL,
+                applied_at DATETIME NOT NULL
+            )
+        ''')
+        cursor.execute("SELECT version FROM schema_migrations")
+        applied = {row[0] for row in cursor.fetchall()}
+        for version, description, migrate in MIGRATIONS:
+            if version in applied:
+                continue
+            migrate(backend, cursor)
+            cursor.execute(
+                "INSERT INTO schema_migrations (version, description, applied_at) VALUES (%s, %s, %s)",
+                (version, description, datetime.utcnow())
+            )
+            conn.commit()
+            logging.info(f"Database migration {version} applied: {description}")
+    except DatabaseError as e:
+        logging.error(f"Error running database migrations: {e}")
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
@@ -0,0 +1,43 @@
+import asyncio
+import logging
+from typing import Awaitable, Dict, Optional
+from utils.logging import LogCollector
+from utils.metrics import metrics
+
+logger = logging.getLogger("OperationOlujaBot")
+
+PIPELINE_STEP_SECONDS = metrics.histogram(
+    "oluja_pipeline_step_seconds", "Duration of the steps of a fanned-out process by step", ("process", "step")
+)
+PIPELINE_STEP_FAILURES = metrics.counter(
+    "oluja_pipeline_step_failures_total", "Steps of a fanned-out process that raised", ("process", "step")
+)
+
+async def fan_out(log_collector: LogCollector, steps: Dict[str, Awaitable], limit: int = 3) -> Dict[str, Optional[Exception]]:
+    """
+    Run independent steps of a process concurrently, at most `limit` at a time.
+    Every step is timed as a span of the collector. A failing step is logged as an ERROR event and does
+    not stop the others; the result maps each step name to its exception, or None if it succeeded.
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(name: str, step: Awaitable) -> Optional[Exception]:
+        async with semaphore:
+            span = log_collector.span(name)
+            try:
+                with span:
+                    await step
+            except Exception as e:
+                PIPELINE_STEP_FAILURES.inc(log_collector.process_name, name)
+                log_collector.add_event(f"{name} fehlgeschlagen: {e}", "ERROR")
+                logger.warning(f"{log_collector.process_name}: step {name} failed: {e}")
+                return e
+            finally:
+                PIPELINE_STEP_SECONDS.observe(span.duration, log_collector.process_name, name)
+        return None
+
+    results = await asyncio.gather(*(run(name, step) for name, step in steps.items()))
+    return dict(zip(steps, results))
+
+def failed_steps(results: Dict[str, Optional[Exception]]) -> list:
+    return [name for name, error in results.items() if error is not None]
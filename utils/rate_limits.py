@@ -0,0 +1,152 @@
+import asyncio
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+import logging
+import time
+from typing import Dict, Iterable, Optional, Union
+import discord
+import config
+from utils.database import db
+from utils.db_backends import DatabaseError
+from utils.metrics import metrics
+
+logger = logging.getLogger("OperationOlujaBot")
+
+RATE_LIMIT_REJECTIONS = metrics.counter(
+    "oluja_rate_limit_rejections_total", "Attempts refused by a cooldown or token bucket", ("rule",)
+)
+
+class Rule:
+    """`capacity` uses per `period` seconds within one guild, channel or user; capacity 1 is a plain cooldown."""
+    __slots__ = ("name", "scope", "capacity", "period", "persist")
+
+    def __init__(self, name: str, scope: str, capacity: int, period: float, persist: bool = False):
+        if scope not in ("guild", "channel", "user"):
+            raise ValueError(f"Unknown rate limit scope {scope} for {name}")
+        self.name = name
+        self.scope = scope
+        self.capacity = capacity
+        self.period = period
+        self.persist = persist
+
+class RateLimiter:
+    """
+    Cooldowns and token buckets for buttons, commands and auto-replies, checked in O(1).
+    Each rule keeps its buckets in insertion order of their last use; a bucket that has refilled
+    completely is the same as no bucket, so those at the front are evicted on every check.
+    Buckets of persisted rules are written to the database in batches and loaded again at startup.
+    """
+
+    def __init__(self, rules: Iterable[Rule], flush_interval: float = 30):
+        self.rules: Dict[str, Rule] = {rule.name: rule for rule in rules}
+        self.flush_interval = flush_interval
+        # rule name -> scope id -> (tokens, wall-clock time of the last update)
+        self._buckets: Dict[str, OrderedDict] = {name: OrderedDict() for name in self.rules}
+        self._dirty: set = set()
+        self._flush_task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return sum(len(buckets) for buckets in self._buckets.values())
+
+    @staticmethod
+    def scope_id(rule: Rule, source: Union[discord.Interaction, discord.Message]) -> int:
+        if rule.scope == "guild":
+            return source.guild.id
+        if rule.scope == "channel":
+            return source.channel.id
+        return source.user.id if isinstance(source, discord.Interaction) else source.author.id
+
+    def _evict(self, rule: Rule, buckets: OrderedDict, now: float):
+        while buckets:
+            scope_id, (_, updated) = next(iter(buckets.items()))
+            if now - updated < rule.period:
+                return
+            del buckets[scope_id]
+
+    def hit(self, name: str, source: Union[discord.Interaction, discord.Message, None] = None, scope_id: Optional[int] = None) -> float:
+        """
+        Use one token of the rule for the scope of `source` (or an explicit `scope_id`).
+        Returns 0 if the attempt is allowed, otherwise the seconds until it would be.
+        """
+        rule = self.rules[name]
+        if scope_id is None:
+            scope_id = self.scope_id(rule, source)
+        # Wall-clock time, so persisted buckets stay valid across restarts.
+        now = time.time()
+        buckets = self._buckets[name]
+        self._evict(rule, buckets, now)
+        tokens, updated = buckets.get(scope_id, (rule.capacity, now))
+        tokens = min(rule.capacity, tokens + (now - updated) * rule.capacity / rule.period)
+        if tokens < 1:
+            RATE_LIMIT_REJECTIONS.inc(name)
+            return (1 - tokens) * rule.period / rule.capacity
+        buckets[scope_id] = (tokens - 1, now)
+        buckets.move_to_end(scope_id)
+        if rule.persist:
+            self._mark_dirty(name, scope_id)
+        return 0.0
+
+    def reset(self, name: str, scope_id: int):
+        self._buckets[name].pop(scope_id, None)
+
+    def _mark_dirty(self, name: str, scope_id: int):
+        self._dirty.add((name, scope_id))
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later(), name="oluja-rate-limits")
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.flush_interval)
+        await self.flush()
+
+    def _rows(self) -> list:
+        rows = []
+        for name, scope_id in self._dirty:
+            bucket = self._buckets[name].get(scope_id)
+            if bucket is not None:
+                tokens, updated = bucket
+                rows.append((name, scope_id, tokens, datetime.fromtimestamp(updated, timezone.utc).replace(tzinfo=None)))
+        self._dirty.clear()
+        return rows
+
+    async def flush(self):
+        """Write changed buckets of persisted rules to the database."""
+        rows = self._rows()
+        try:
+            await db.save_rate_limits(rows)
+        except DatabaseError as e:
+            logger.error(f"{len(rows)} rate limits could not be saved: {e}")
+
+    async def load(self):
+        """Restore the buckets of persisted rules that have not refilled yet."""
+        persisted = [rule for rule in self.rules.values() if rule.persist]
+        if not persisted:
+            return
+        since = datetime.utcnow() - timedelta(seconds=max(rule.period for rule in persisted))
+        rows = await db.load_rate_limits(since)
+        # Oldest first, so the eviction order of the buckets matches their last use.
+        rows.sort(key=lambda row: row["updated_at"])
+        for row in rows:
+            rule = self.rules.get(row["name"])
+            if rule is not None and rule.persist:
+                updated = row["updated_at"].replace(tzinfo=timezone.utc).timestamp()
+                self._buckets[rule.name][row["scope_id"]] = (row["tokens"], updated)
+        logger.info(f"{len(rows)} rate limits restored")
+
+def format_wait(seconds: float) -> str:
+    if seconds < 60:
+        return f"{int(seconds) + 1} Sekunde(n)"
+    return f"{int(seconds // 60) + 1} Minute(n)"
+
+def cooldown_embed(retry_after: float) -> discord.Embed:
+    return discord.Embed(
+        title="🚫 Cooldown",
+        description=f"Bitte warte noch {format_wait(retry_after)}, bevor du das erneut nutzt.",
+        color=discord.Color.red()
+    )
+
+rate_limits = RateLimiter(
+    (Rule(name, scope, capacity, period, persist=name in config.RATE_LIMIT_PERSIST)
+     for name, (scope, capacity, period) in config.RATE_LIMITS.items()),
+    flush_interval=config.RATE_LIMIT_FLUSH_INTERVAL
+)
+metrics.gauge("oluja_rate_limit_buckets", "Cooldown and token-bucket entries held in memory", lambda: len(rate_limits))
@@ -0,0 +1,69 @@
+from datetime import datetime
+import gzip
+import json
+import logging
+import os
+
+# Append-only tables that are partitioned by month and subject to retention.
+EVENT_TABLES = ("moderation_logs", "member_events")
+
+def month_start(value) -> datetime:
+    """First instant of the month containing `value` (a datetime or an ISO string, as SQLite returns for aggregates)."""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return datetime(value.year, value.month, 1)
+
+def add_months(value: datetime, months: int) -> datetime:
+    """First instant of the month `months` after the month containing `value`."""
+    index = value.year * 12 + value.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+def archive_month(cursor, table: str, month: datetime, archive_dir: str) -> int:
+    """
+    Stream all rows of `table` from the given month into a gzip-compressed JSON-lines file.
+    Returns the number of archived rows; rows are fetched in chunks and never held in memory at once.
+    """
+    os.makedirs(archive_dir, exist_ok=True)
+    path = os.path.join(archive_dir, f"{table}-{month:%Y-%m}.jsonl.gz")
+    cursor.execute(
+        f"SELECT * FROM {table} WHERE date >= %s AND date < %s ORDER BY id",
+        (month, add_months(month, 1))
+    )
+    columns = [col[0] for col in cursor.description]
+    count = 0
+    with gzip.open(path, "wt", encoding="utf-8") as archive:
+        while True:
+            rows = cursor.fetchmany(1000)
+            if not rows:
+                break
+            for row in rows:
+                archive.write(json.dumps(dict(zip(columns, row)), default=str) + "\n")
+            count += len(rows)
+    if not count:
+        os.remove(path)
+    return count
+
+def apply_retention(conn, cursor, backend, retention_months: int, months_ahead: int, archive_dir: str) -> dict:
+    """
+    Archive and drop every month of the event tables that is older than `retention_months`,
+    then make sure partitions exist for the next `months_ahead` months.
+    Returns the number of archived rows per table.
+    """
+    now = datetime.utcnow()
+    cutoff = add_months(month_start(now), -retention_months)
+    archived = {}
+    for table in EVENT_TABLES:
+        archived[table] = 0
+        cursor.execute(f"SELECT MIN(date) FROM {table}")
+        oldest = cursor.fetchall()[0][0]
+        month = month_start(oldest) if oldest else cutoff
+        while month < cutoff:
+            count = archive_month(cursor, table, month, archive_dir)
+            backend.drop_month(cursor, table, month)
+            conn.commit()
+            archived[table] += count
+            logging.info(f"Retention: {count} rows of {table} from {month:%Y-%m} archived and dropped")
+            month = add_months(month, 1)
+        backend.ensure_month_partitions(cursor, table, add_months(month_start(now), months_ahead))
+        conn.commit()
+    return archived
@@ -0,0 +1,75 @@
+import asyncio
+from datetime import datetime
+import heapq
+import itertools
+import logging
+from typing import Awaitable, Callable, Dict, Hashable, Optional
+
+logger = logging.getLogger("OperationOlujaBot")
+
+class DeadlineScheduler:
+    """
+    One background task for any number of deadlines.
+    Keys are kept in a min-heap ordered by their (naive UTC) deadline and `callback(key)` is started as a task
+    once a deadline passes. Rescheduling or cancelling a key is O(log n); superseded heap entries are skipped.
+    """
+
+    def __init__(self, callback: Callable[[Hashable], Awaitable[None]], name: str = "oluja-scheduler"):
+        self._callback = callback
+        self._name = name
+        self._heap = []
+        self._current: Dict[Hashable, int] = {}
+        self._counter = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._running = set()
+
+    def schedule(self, key: Hashable, when: datetime):
+        """Run the callback for `key` at `when`, replacing any earlier deadline for the same key."""
+        seq = next(self._counter)
+        self._current[key] = seq
+        heapq.heappush(self._heap, (when, seq, key))
+        self._wakeup.set()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name=self._name)
+
+    def cancel(self, key: Hashable):
+        self._current.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._current)
+
+    def _discard_stale(self):
+        while self._heap and self._current.get(self._heap[0][2]) != self._heap[0][1]:
+            heapq.heappop(self._heap)
+
+    async def _fire(self, key: Hashable):
+        try:
+            await self._callback(key)
+        except Exception as e:
+            logger.error(f"Scheduled callback for {key} failed: {e}")
+
+    async def _run(self):
+        while True:
+            self._discard_stale()
+            timeout = None
+            if self._heap:
+                when, _, key = self._heap[0]
+                timeout = (when - datetime.utcnow()).total_seconds()
+                if timeout <= 0:
+                    heapq.heappop(self._heap)
+                    del self._current[key]
+                    task = asyncio.create_task(self._fire(key))
+                    self._running.add(task)
+                    task.add_done_callback(self._running.discard)
+                    continue
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
@@ -0,0 +1,102 @@
+import re
+from datetime import datetime
+from typing import Dict, Iterator, Optional, Tuple
+import discord
+
+# Ticket channels carry "Bewerbung von <name> | ID: <applicant id>" as their topic.
+TOPIC_APPLICANT = re.compile(r"\|\s*ID:\s*(\d+)")
+TICKET_PREFIXES = ("bewerbung-", "angenommen-")
+OPEN_STATES = ("questions", "review")
+
+def applicant_from_topic(channel: discord.TextChannel) -> Optional[int]:
+    """Applicant id from a ticket channel's topic, or None if the channel is not a ticket."""
+    if not channel.name.startswith(TICKET_PREFIXES) or not channel.topic:
+        return None
+    match = TOPIC_APPLICANT.search(channel.topic)
+    return int(match.group(1)) if match else None
+
+def state_from_name(channel: discord.TextChannel) -> str:
+    return "accepted" if channel.name.startswith("angenommen-") else "review"
+
+class TicketIndex:
+    """
+    In-memory index of application tickets by channel and by (guild, applicant), mirroring application_sessions.
+    Duplicate checks are O(1) and reminder sweeps only visit open tickets instead of every channel.
+    """
+
+    def __init__(self):
+        self._tickets: Dict[int, dict] = {}
+        self._by_applicant: Dict[Tuple[int, int], int] = {}
+        # Applicants whose ticket channel is being created right now
+        self._pending: set = set()
+
+    def __contains__(self, channel_id: int) -> bool:
+        return channel_id in self._tickets
+
+    def __len__(self) -> int:
+        return len(self._tickets)
+
+    def get(self, channel_id: int) -> Optional[dict]:
+        return self._tickets.get(channel_id)
+
+    def update(self, channel_id: int, guild_id: int, applicant_id: int, state: str, created_at: datetime, reminder_step: int = 0):
+        """Add a ticket or update its state."""
+        self._tickets[channel_id] = {
+            "channel_id": channel_id,
+            "guild_id": guild_id,
+            "applicant_id": applicant_id,
+            "state": state,
+            "created_at": created_at,
+            "reminder_step": reminder_step
+        }
+        self._by_applicant[(guild_id, applicant_id)] = channel_id
+        self._pending.discard((guild_id, applicant_id))
+
+    def set_state(self, channel_id: int, state: str):
+        if channel_id in self._tickets:
+            self._tickets[channel_id]["state"] = state
+
+    def set_reminder_step(self, channel_id: int, step: int):
+        if channel_id in self._tickets:
+            self._tickets[channel_id]["reminder_step"] = step
+
+    def remove(self, channel_id: int) -> Optional[dict]:
+        ticket = self._tickets.pop(channel_id, None)
+        if ticket is not None:
+            key = (ticket["guild_id"], ticket["applicant_id"])
+            if self._by_applicant.get(key) == channel_id:
+                del self._by_applicant[key]
+        return ticket
+
+    def reserve(self, guild_id: int, applicant_id: int) -> bool:
+        """
+        Claim ticket creation for an applicant; False if they already have a ticket or one is being created.
+        A successful claim ends with `update` (channel created) or `release` (creation failed).
+        """
+        key = (guild_id, applicant_id)
+        if key in self._pending or self.find(guild_id, applicant_id) is not None:
+            return False
+        self._pending.add(key)
+        return True
+
+    def release(self, guild_id: int, applicant_id: int):
+        self._pending.discard((guild_id, applicant_id))
+
+    def find(self, guild_id: int, applicant_id: int) -> Optional[int]:
+        """Channel id of the applicant's ticket in the guild, if any."""
+        return self._by_applicant.get((guild_id, applicant_id))
+
+    def has_ticket(self, guild_id: int, applicant_id: int) -> bool:
+        return (guild_id, applicant_id) in self._pending or (guild_id, applicant_id) in self._by_applicant
+
+    def tickets(self, guild_id: int, states: Tuple[str, ...] = OPEN_STATES) -> Iterator[dict]:
+        for ticket in list(self._tickets.values()):
+            if ticket["guild_id"] == guild_id and ticket["state"] in states:
+                yield ticket
+
+    def clear(self):
+        self._tickets.clear()
+        self._by_applicant.clear()
+        self._pending.clear()
+
+ticket_index = TicketIndex()
@@ -0,0 +1,119 @@
+from datetime import datetime
+import gzip
+import json
+import logging
+import tempfile
+from typing import BinaryIO, Optional
+import discord
+from utils.database import db
+from utils.db_backends import DatabaseError
+from utils.helpers import get_archive_channel
+from utils.metrics import metrics
+from utils.ticket_index import applicant_from_topic
+
+logger = logging.getLogger("OperationOlujaBot")
+
+TRANSCRIPT_BYTES = metrics.histogram(
+    "oluja_transcript_bytes", "Compressed size of archived ticket transcripts",
+    buckets=(1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+)
+
+class TranscriptTooLarge(Exception):
+    """The compressed transcript exceeds the upload limit of the archive channel's guild."""
+
+def message_record(message: discord.Message) -> dict:
+    return {
+        "type": "message",
+        "id": message.id,
+        "created_at": message.created_at.isoformat(),
+        "author_id": message.author.id,
+        "author": message.author.name,
+        "bot": message.author.bot,
+        "content": message.content,
+        "embeds": [embed.to_dict() for embed in message.embeds],
+        "attachments": [{"filename": a.filename, "url": a.url} for a in message.attachments]
+    }
+
+async def write_transcript(channel: discord.TextChannel, fileobj: BinaryIO, header: dict) -> int:
+    """
+    Stream the channel history, oldest first, into `fileobj` as gzip-compressed JSON lines after a header line.
+    Messages are fetched page by page and compressed as they arrive, so only one page is held in memory.
+    Returns the number of messages written.
+    """
+    count = 0
+    with gzip.GzipFile(fileobj=fileobj, mode="wb") as archive:
+        archive.write((json.dumps(header, ensure_ascii=False, default=str) + "\n").encode("utf-8"))
+        async for message in channel.history(limit=None, oldest_first=True):
+            archive.write((json.dumps(message_record(message), ensure_ascii=False) + "\n").encode("utf-8"))
+            count += 1
+    return count
+
+async def archive_ticket(channel: discord.TextChannel, reason: str, session: Optional[dict] = None) -> Optional[discord.Message]:
+    """
+    Upload the transcript of a ticket channel to the archive channel and index it in ticket_transcripts.
+    `session` is the ticket's application_sessions row; it is looked up if not given. Returns the archive
+    message, or None if the guild has no archive channel. Must be called before the channel is deleted.
+    """
+    archive_channel = get_archive_channel(channel.guild)
+    if archive_channel is None:
+        return None
+    if session is None:
+        try:
+            session = await db.get_application_session(channel.id)
+        except DatabaseError as e:
+            logger.warning(f"Application for transcript of channel {channel.id} could not be loaded: {e}")
+    session = session or {}
+    applicant_id = session.get("applicant_id") or applicant_from_topic(channel)
+    header = {
+        "type": "ticket",
+        "guild_id": channel.guild.id,
+        "channel_id": channel.id,
+        "channel_name": channel.name,
+        "application_id": session.get("id"),
+        "applicant_id": applicant_id,
+        "applicant_name": session.get("applicant_name"),
+        "apply_type": session.get("apply_type"),
+        "answers": session.get("answers", []),
+        "reason": reason,
+        "closed_at": datetime.utcnow().isoformat()
+    }
+
+    # Spooled to disk, not memory; the file is only read back for the upload.
+    with tempfile.TemporaryFile() as fileobj:
+        count = await write_transcript(channel, fileobj, header)
+        size = fileobj.tell()
+        if size > archive_channel.guild.filesize_limit:
+            raise TranscriptTooLarge(f"{size} bytes, limit {archive_channel.guild.filesize_limit}")
+        fileobj.seek(0)
+        embed = discord.Embed(
+            title="🗄️ Ticket archiviert",
+            description=(
+                f"**Kanal:** #{channel.name}\n"
+                f"**Bewerber:** {f'<@{applicant_id}>' if applicant_id else 'Unbekannt'}\n"
+                f"**Grund:** {reason}\n"
+                f"**Nachrichten:** {count}"
+            ),
+            color=discord.Color.dark_grey(),
+            timestamp=datetime.utcnow()
+        )
+        embed.set_footer(text="Operation-Oluja | Transkript")
+        message = await archive_channel.send(
+            embed=embed,
+            file=discord.File(fileobj, filename=f"transcript-{channel.name}-{channel.id}.jsonl.gz")
+        )
+    TRANSCRIPT_BYTES.observe(size)
+
+    await db.add_transcript(
+        guild_id=channel.guild.id,
+        channel_id=channel.id,
+        application_id=session.get("id"),
+        applicant_id=applicant_id,
+        applicant_name=session.get("applicant_name"),
+        reason=reason,
+        archive_message_id=message.id,
+        archive_url=message.jump_url,
+        message_count=count,
+        size_bytes=size
+    )
+    logger.info(f"Transcript of #{channel.name} archived: {count} messages, {size} bytes")
+    return message